@@ -1,33 +1,154 @@
-import requests
+import argparse
+import asyncio
+import functools
 import sys
 import json
+import threading
+import time
+import uuid
 from datetime import datetime
 
+from cassette import Cassette, RecordingAdapter, ReplayAdapter
+from contention_bench import JoinContentionBenchmark
+from baseline_store import BaselineStore, compare, print_comparison
+from datagen import SCALE_PRESETS, BulkDataGenerator
+from deadlines import budget, current_deadline
+from encoding_bench import EncodingBenchmark
+from graph_runner import DependencyGraphRunner
+from hedging import HedgingPolicy
+from http_cache import CachingAdapter, HTTPCache
+from http_transport import HTTPTransport
+from json_stream import REQUIRED_KEYS, StreamedListing
+from latency_histogram import HistogramRecorder
+from load_runner import LoadRunner
+from lookup_scheduler import LookupScheduler, synthetic_usernames
+from multiprocess_runner import MultiProcessCoordinator
+from open_loop import ConstantArrivalRunner
+from refresh_bench import RefreshFanoutBenchmark
+from run_report import ResultLog
+from scaling_bench import ScalingBenchmark
+from soak import SoakRunner, detect_drift, load_series, print_drift_report
+from stand_in_server import start_in_process
+from token_pool import TokenPool, session_from_response
+from tracing import ChromeTraceRecorder, TestProfiler
+
+# Ordering constraints between tests; anything not listed here can run concurrently.
+# Only the auth chain carries session state from one test to the next.
+TEST_DEPENDENCIES = {
+    "test_seed_data": [],
+    "test_events_listing": ["test_seed_data"],
+    "test_event_filters": ["test_seed_data"],
+    "test_user_registration": [],
+    "test_user_login": ["test_user_registration"],
+    "test_auth_me": ["test_user_login"],
+    "test_event_detail_and_join": ["test_auth_me", "test_seed_data"],
+    "test_my_events": ["test_event_detail_and_join"],
+    "test_create_event": ["test_auth_me"],
+    "test_clubs_listing": ["test_seed_data"],
+    "test_club_detail": ["test_seed_data"],
+    "test_user_profile": ["test_auth_me"],
+    "test_chess_com_lookup": [],
+    "test_lichess_lookup": [],
+    "test_chess_account_linking": ["test_auth_me"],
+    "test_chess_refresh_ratings": ["test_chess_account_linking"],
+    "test_chess_unlink_accounts": ["test_chess_refresh_ratings"],
+    "test_existing_chess_user": [],
+}
+
 class SocialChessAPITester:
-    def __init__(self, base_url="https://chessmeetup.preview.emergentagent.com"):
+    def __init__(self, base_url="https://chessmeetup.preview.emergentagent.com", transport=None,
+                 pool_size=10, connect_timeout=5.0, read_timeout=30.0, run_budget=None, test_budget=None):
         self.base_url = base_url
+        # Seconds for the whole run and for each test; request timeouts shrink to fit what is left
+        self.run_budget = run_budget
+        self.test_budget = test_budget
         self.api_url = f"{base_url}/api"
+        self.latency = HistogramRecorder()
+        self.results = ResultLog()
+        if transport is None:
+            transport = HTTPTransport(
+                pool_size=pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout
+            )
+            # A shared transport is already observed by whoever owns it (e.g. the load runner)
+            transport.add_observer(self.latency.observe)
+            transport.add_record_observer(self.results.observe_request)
+        self.transport = transport
+        # Chess lookups are rate-limited and deduplicated before they reach the backend
+        self.lookups = LookupScheduler(self.transport, self.api_url)
         self.session_token = None
         self.user_data = None
         self.tests_run = 0
         self.tests_passed = 0
         self.failed_tests = []
+        self.user_tag = None
+        self.hooks = {"test_start": [], "test_end": []}
+        self._lock = threading.Lock()
+
+    def add_hook(self, event, hook):
+        """Register a hook for a test or request event
+
+        Events: before_request(method, url, kwargs), after_response(record),
+        test_start(name) and test_end(name, success, elapsed_s). Request
+        hooks attach to the transport, so on a shared transport they see
+        every tester's traffic.
+        """
+        if event == "before_request":
+            self.transport.add_before_observer(hook)
+        elif event == "after_response":
+            self.transport.add_record_observer(hook)
+        elif event in self.hooks:
+            self.hooks[event].append(hook)
+        else:
+            raise ValueError(f"Unknown hook event {event!r}")
+
+    def _fire(self, event, *args):
+        for hook in self.hooks[event]:
+            hook(*args)
+
+    def use_pooled_user(self, user):
+        """Take over a TokenPool user's session instead of registering and logging in"""
+        self.user_data = {"user_id": user.user_id, "email": user.email, "name": user.name}
+        self.session_token = user.token
 
     def log_test(self, name, success, details=""):
         """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}")
-        else:
-            print(f"❌ {name} - {details}")
-            self.failed_tests.append({"test": name, "error": details})
+        self.results.log(name, success, details)
+        with self._lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+                print(f"✅ {name}")
+            else:
+                print(f"❌ {name} - {details}")
+                self.failed_tests.append({"test": name, "error": details})
+
+    def _stream_listing(self, path, required_keys, headers=None):
+        """GET a list endpoint with stream=True; returns (status, StreamedListing or None)
+
+        The listing is consumed item by item, so large result sets are
+        counted and validated without holding the whole body in memory.
+        """
+        started = time.perf_counter()
+        response = self.transport.get(f"{self.api_url}{path}", headers=headers, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return response.status_code, None
+        return response.status_code, StreamedListing(response, required_keys, started=started)
+
+    def _stream_details(self, stats):
+        details = stats.describe()
+        if stats.invalid_items:
+            position, missing = stats.invalid[0]
+            details += f"; {stats.invalid_items} items missing keys (first: #{position} lacks {', '.join(missing)})"
+        return details
 
     def test_seed_data(self):
         """Test seed data creation"""
         print("\n🌱 Testing seed data creation...")
         try:
-            response = requests.post(f"{self.api_url}/seed")
+            response = self.transport.post(f"{self.api_url}/seed")
             if response.status_code == 200:
                 data = response.json()
                 self.log_test("Seed data creation", True, f"Created {data.get('event_count', 0)} events")
@@ -43,17 +164,21 @@ class SocialChessAPITester:
         """Test events listing endpoint"""
         print("\n📅 Testing events listing...")
         try:
-            response = requests.get(f"{self.api_url}/events")
-            if response.status_code == 200:
-                events = response.json()
-                if len(events) >= 12:
-                    self.log_test("Events listing", True, f"Found {len(events)} events")
-                    return True
-                else:
-                    self.log_test("Events listing", False, f"Expected 12+ events, got {len(events)}")
-                    return False
+            status, listing = self._stream_listing("/events", REQUIRED_KEYS["events"])
+            if listing is None:
+                self.log_test("Events listing", False, f"Status: {status}")
+                return False
+            for _ in listing:
+                pass
+            stats = listing.stats
+            if stats.invalid_items:
+                self.log_test("Events listing", False, self._stream_details(stats))
+                return False
+            if stats.items >= 12:
+                self.log_test("Events listing", True, f"Found {stats.items} events ({self._stream_details(stats)})")
+                return True
             else:
-                self.log_test("Events listing", False, f"Status: {response.status_code}")
+                self.log_test("Events listing", False, f"Expected 12+ events, got {stats.items}")
                 return False
         except Exception as e:
             self.log_test("Events listing", False, str(e))
@@ -72,7 +197,7 @@ class SocialChessAPITester:
         all_passed = True
         for filter_name, filter_value in filters:
             try:
-                response = requests.get(f"{self.api_url}/events?{filter_name}={filter_value}")
+                response = self.transport.get(f"{self.api_url}/events?{filter_name}={filter_value}")
                 if response.status_code == 200:
                     events = response.json()
                     self.log_test(f"Filter by {filter_name}", True, f"Found {len(events)} events")
@@ -88,7 +213,8 @@ class SocialChessAPITester:
     def test_user_registration(self):
         """Test user registration"""
         print("\n👤 Testing user registration...")
-        timestamp = datetime.now().strftime("%H%M%S")
+        # The random suffix keeps two runs started in the same second apart
+        timestamp = self.user_tag or f"{datetime.now():%H%M%S}_{uuid.uuid4().hex[:6]}"
         user_data = {
             "email": f"test_user_{timestamp}@example.com",
             "password": "testpass123",
@@ -99,7 +225,7 @@ class SocialChessAPITester:
         }
         
         try:
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.api_url}/auth/register",
                 json=user_data,
                 headers={"Content-Type": "application/json"}
@@ -108,10 +234,7 @@ class SocialChessAPITester:
             if response.status_code == 200:
                 self.user_data = response.json()
                 # Extract session token from cookies
-                if 'Set-Cookie' in response.headers:
-                    cookies = response.headers['Set-Cookie']
-                    if 'session_token=' in cookies:
-                        self.session_token = cookies.split('session_token=')[1].split(';')[0]
+                self.session_token, _ = session_from_response(response)
                 
                 self.log_test("User registration", True, f"User ID: {self.user_data.get('user_id')}")
                 return True
@@ -136,7 +259,7 @@ class SocialChessAPITester:
         }
         
         try:
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.api_url}/auth/login",
                 json=login_data,
                 headers={"Content-Type": "application/json"}
@@ -145,10 +268,7 @@ class SocialChessAPITester:
             if response.status_code == 200:
                 login_result = response.json()
                 # Update session token from login
-                if 'Set-Cookie' in response.headers:
-                    cookies = response.headers['Set-Cookie']
-                    if 'session_token=' in cookies:
-                        self.session_token = cookies.split('session_token=')[1].split(';')[0]
+                self.session_token, _ = session_from_response(response)
                 
                 self.log_test("User login", True, f"Logged in as: {login_result.get('name')}")
                 return True
@@ -168,7 +288,7 @@ class SocialChessAPITester:
         
         try:
             headers = {"Authorization": f"Bearer {self.session_token}"}
-            response = requests.get(f"{self.api_url}/auth/me", headers=headers)
+            response = self.transport.get(f"{self.api_url}/auth/me", headers=headers)
             
             if response.status_code == 200:
                 user_info = response.json()
@@ -187,7 +307,7 @@ class SocialChessAPITester:
         
         # First get an event ID
         try:
-            response = requests.get(f"{self.api_url}/events")
+            response = self.transport.get(f"{self.api_url}/events")
             if response.status_code != 200:
                 self.log_test("Event detail", False, "Could not fetch events list")
                 return False
@@ -200,7 +320,7 @@ class SocialChessAPITester:
             event_id = events[0]["event_id"]
             
             # Test event detail
-            response = requests.get(f"{self.api_url}/events/{event_id}")
+            response = self.transport.get(f"{self.api_url}/events/{event_id}")
             if response.status_code == 200:
                 event_detail = response.json()
                 self.log_test("Event detail", True, f"Event: {event_detail.get('title')}")
@@ -211,7 +331,7 @@ class SocialChessAPITester:
             # Test join event (requires authentication)
             if self.session_token:
                 headers = {"Authorization": f"Bearer {self.session_token}"}
-                response = requests.post(f"{self.api_url}/events/{event_id}/join", headers=headers)
+                response = self.transport.post(f"{self.api_url}/events/{event_id}/join", headers=headers)
                 if response.status_code == 200:
                     self.log_test("Join event", True, "Successfully joined event")
                     return True
@@ -235,17 +355,21 @@ class SocialChessAPITester:
         
         try:
             headers = {"Authorization": f"Bearer {self.session_token}"}
-            response = requests.get(f"{self.api_url}/me/events", headers=headers)
-            
-            if response.status_code == 200:
-                my_events = response.json()
-                joined_count = len(my_events.get("joined", []))
-                organized_count = len(my_events.get("organized", []))
-                self.log_test("My events", True, f"Joined: {joined_count}, Organized: {organized_count}")
-                return True
-            else:
-                self.log_test("My events", False, f"Status: {response.status_code}")
+            status, listing = self._stream_listing("/me/events", REQUIRED_KEYS["events"], headers=headers)
+            if listing is None:
+                self.log_test("My events", False, f"Status: {status}")
+                return False
+            counts = {"joined": 0, "organized": 0}
+            for key, _ in listing:
+                if key in counts:
+                    counts[key] += 1
+            stats = listing.stats
+            if stats.invalid_items:
+                self.log_test("My events", False, self._stream_details(stats))
                 return False
+            self.log_test("My events", True, f"Joined: {counts['joined']}, Organized: {counts['organized']} "
+                                             f"({self._stream_details(stats)})")
+            return True
         except Exception as e:
             self.log_test("My events", False, str(e))
             return False
@@ -274,7 +398,7 @@ class SocialChessAPITester:
                 "Authorization": f"Bearer {self.session_token}",
                 "Content-Type": "application/json"
             }
-            response = requests.post(f"{self.api_url}/events", json=event_data, headers=headers)
+            response = self.transport.post(f"{self.api_url}/events", json=event_data, headers=headers)
             
             if response.status_code == 200:
                 created_event = response.json()
@@ -291,14 +415,18 @@ class SocialChessAPITester:
         """Test clubs listing"""
         print("\n🏛️ Testing clubs listing...")
         try:
-            response = requests.get(f"{self.api_url}/clubs")
-            if response.status_code == 200:
-                clubs = response.json()
-                self.log_test("Clubs listing", True, f"Found {len(clubs)} clubs")
-                return True
-            else:
-                self.log_test("Clubs listing", False, f"Status: {response.status_code}")
+            status, listing = self._stream_listing("/clubs", REQUIRED_KEYS["clubs"])
+            if listing is None:
+                self.log_test("Clubs listing", False, f"Status: {status}")
+                return False
+            for _ in listing:
+                pass
+            stats = listing.stats
+            if stats.invalid_items:
+                self.log_test("Clubs listing", False, self._stream_details(stats))
                 return False
+            self.log_test("Clubs listing", True, f"Found {stats.items} clubs ({self._stream_details(stats)})")
+            return True
         except Exception as e:
             self.log_test("Clubs listing", False, str(e))
             return False
@@ -308,7 +436,7 @@ class SocialChessAPITester:
         print("\n🏛️ Testing club detail...")
         try:
             # First get clubs list
-            response = requests.get(f"{self.api_url}/clubs")
+            response = self.transport.get(f"{self.api_url}/clubs")
             if response.status_code != 200:
                 self.log_test("Club detail", False, "Could not fetch clubs list")
                 return False
@@ -321,7 +449,7 @@ class SocialChessAPITester:
             club_id = clubs[0]["user_id"]
             
             # Test club detail
-            response = requests.get(f"{self.api_url}/clubs/{club_id}")
+            response = self.transport.get(f"{self.api_url}/clubs/{club_id}")
             if response.status_code == 200:
                 club_detail = response.json()
                 self.log_test("Club detail", True, f"Club: {club_detail.get('name')}")
@@ -345,7 +473,7 @@ class SocialChessAPITester:
         
         try:
             # Test get user profile
-            response = requests.get(f"{self.api_url}/users/{user_id}")
+            response = self.transport.get(f"{self.api_url}/users/{user_id}")
             if response.status_code == 200:
                 profile = response.json()
                 self.log_test("Get user profile", True, f"User: {profile.get('name')}")
@@ -363,7 +491,7 @@ class SocialChessAPITester:
                     "Authorization": f"Bearer {self.session_token}",
                     "Content-Type": "application/json"
                 }
-                response = requests.put(f"{self.api_url}/users/me", json=update_data, headers=headers)
+                response = self.transport.put(f"{self.api_url}/users/me", json=update_data, headers=headers)
                 if response.status_code == 200:
                     self.log_test("Update user profile", True, "Profile updated successfully")
                     return True
@@ -384,17 +512,16 @@ class SocialChessAPITester:
         try:
             # Test with a known Chess.com username
             username = "gothamchess"
-            response = requests.get(f"{self.api_url}/chess/lookup/chess_com/{username}")
+            status, data = self.lookups.lookup("chess_com", username)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 self.log_test("Chess.com lookup", True, f"Found user {data.get('username')} with rating {data.get('best_rating')}")
                 return True
-            elif response.status_code == 404:
+            elif status == 404:
                 self.log_test("Chess.com lookup", False, f"User {username} not found")
                 return False
             else:
-                self.log_test("Chess.com lookup", False, f"Status: {response.status_code}, Response: {response.text}")
+                self.log_test("Chess.com lookup", False, f"Status: {status}, Response: {data}")
                 return False
         except Exception as e:
             self.log_test("Chess.com lookup", False, str(e))
@@ -406,17 +533,16 @@ class SocialChessAPITester:
         try:
             # Test with a known Lichess username
             username = "DrNykterstein"
-            response = requests.get(f"{self.api_url}/chess/lookup/lichess/{username}")
+            status, data = self.lookups.lookup("lichess", username)
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 self.log_test("Lichess lookup", True, f"Found user {data.get('username')} with rating {data.get('best_rating')}")
                 return True
-            elif response.status_code == 404:
+            elif status == 404:
                 self.log_test("Lichess lookup", False, f"User {username} not found")
                 return False
             else:
-                self.log_test("Lichess lookup", False, f"Status: {response.status_code}, Response: {response.text}")
+                self.log_test("Lichess lookup", False, f"Status: {status}, Response: {data}")
                 return False
         except Exception as e:
             self.log_test("Lichess lookup", False, str(e))
@@ -441,7 +567,8 @@ class SocialChessAPITester:
                 "username": "gothamchess"
             }
             
-            response = requests.post(f"{self.api_url}/chess/link", json=link_data, headers=headers)
+            self.lookups.throttle("chess_com")
+            response = self.transport.post(f"{self.api_url}/chess/link", json=link_data, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -453,7 +580,8 @@ class SocialChessAPITester:
                     "username": "DrNykterstein"
                 }
                 
-                response = requests.post(f"{self.api_url}/chess/link", json=link_data_lichess, headers=headers)
+                self.lookups.throttle("lichess")
+                response = self.transport.post(f"{self.api_url}/chess/link", json=link_data_lichess, headers=headers)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -479,7 +607,7 @@ class SocialChessAPITester:
         
         try:
             headers = {"Authorization": f"Bearer {self.session_token}"}
-            response = requests.post(f"{self.api_url}/chess/refresh", headers=headers)
+            response = self.transport.post(f"{self.api_url}/chess/refresh", headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -509,7 +637,7 @@ class SocialChessAPITester:
             headers = {"Authorization": f"Bearer {self.session_token}"}
             
             # Test unlinking Chess.com account
-            response = requests.delete(f"{self.api_url}/chess/unlink/chess_com", headers=headers)
+            response = self.transport.delete(f"{self.api_url}/chess/unlink/chess_com", headers=headers)
             
             if response.status_code == 200:
                 self.log_test("Unlink Chess.com account", True, "Successfully unlinked")
@@ -518,7 +646,7 @@ class SocialChessAPITester:
                 return False
             
             # Test unlinking Lichess account
-            response = requests.delete(f"{self.api_url}/chess/unlink/lichess", headers=headers)
+            response = self.transport.delete(f"{self.api_url}/chess/unlink/lichess", headers=headers)
             
             if response.status_code == 200:
                 self.log_test("Unlink Lichess account", True, "Successfully unlinked")
@@ -542,7 +670,7 @@ class SocialChessAPITester:
         }
         
         try:
-            response = requests.post(
+            response = self.transport.post(
                 f"{self.api_url}/auth/login",
                 json=login_data,
                 headers={"Content-Type": "application/json"}
@@ -551,16 +679,13 @@ class SocialChessAPITester:
             if response.status_code == 200:
                 user_data = response.json()
                 # Extract session token
-                if 'Set-Cookie' in response.headers:
-                    cookies = response.headers['Set-Cookie']
-                    if 'session_token=' in cookies:
-                        test_session_token = cookies.split('session_token=')[1].split(';')[0]
+                test_session_token, _ = session_from_response(response)
                 
                 self.log_test("Login existing chess user", True, f"Logged in as: {user_data.get('name')}")
                 
                 # Check if user has chess accounts linked
                 headers = {"Authorization": f"Bearer {test_session_token}"}
-                response = requests.get(f"{self.api_url}/auth/me", headers=headers)
+                response = self.transport.get(f"{self.api_url}/auth/me", headers=headers)
                 
                 if response.status_code == 200:
                     user_info = response.json()
@@ -589,14 +714,9 @@ class SocialChessAPITester:
             self.log_test("Existing chess user test", False, str(e))
             return False
 
-    def run_all_tests(self):
-        """Run all backend tests"""
-        print("🚀 Starting Social Chess Events Backend API Tests")
-        print(f"Testing against: {self.base_url}")
-        print("=" * 60)
-        
-        # Test sequence
-        tests = [
+    def all_tests(self):
+        """Test sequence for the sequential runner"""
+        return [
             self.test_seed_data,
             self.test_events_listing,
             self.test_event_filters,
@@ -617,15 +737,76 @@ class SocialChessAPITester:
             self.test_chess_unlink_accounts,
             self.test_existing_chess_user
         ]
+
+    def _run_with_budget(self, test):
+        """Run one test under its own budget, or fail it if the run budget is already spent"""
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() is not None and deadline.remaining() <= 0:
+            self.log_test(test.__name__, False, "Skipped: run budget exhausted")
+            return False
+        name = test.__name__
+        self._fire("test_start", name)
+        start = time.perf_counter()
+        success = False
+        try:
+            with budget(self.test_budget, name):
+                success = test()
+            return success
+        finally:
+            self._fire("test_end", name, bool(success), time.perf_counter() - start)
+
+    def _record_test_exception(self, name, e):
+        print(f"❌ Test {name} failed with exception: {e}")
+        with self._lock:
+            self.failed_tests.append({"test": name, "error": str(e)})
+
+    def run_all_tests(self):
+        """Run all backend tests"""
+        print("🚀 Starting Social Chess Events Backend API Tests")
+        print(f"Testing against: {self.base_url}")
+        print("=" * 60)
         
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                print(f"❌ Test {test.__name__} failed with exception: {e}")
-                self.failed_tests.append({"test": test.__name__, "error": str(e)})
+        start = time.perf_counter()
+        with budget(self.run_budget, "run"):
+            for test in self.all_tests():
+                try:
+                    self._run_with_budget(test)
+                except Exception as e:
+                    self._record_test_exception(test.__name__, e)
+        
+        print(f"\n⏱️ Wall time: {time.perf_counter() - start:.2f}s")
+        return self.print_summary()
+
+    async def run_all_tests_async(self, max_concurrency=4):
+        """Run all backend tests as a dependency graph, independent branches concurrently"""
+        print("🚀 Starting Social Chess Events Backend API Tests (concurrent)")
+        print(f"Testing against: {self.base_url}")
+        print(f"Max concurrency: {max_concurrency}")
+        print("=" * 60)
         
-        # Print summary
+        callables = {test.__name__: functools.partial(self._run_with_budget, test) for test in self.all_tests()}
+        runner = DependencyGraphRunner(TEST_DEPENDENCIES, max_concurrency=max_concurrency)
+        start = time.perf_counter()
+        # asyncio.to_thread copies the context, so every test thread sees the run budget
+        with budget(self.run_budget, "run"):
+            await runner.run(callables, on_error=self._record_test_exception)
+        wall_time = time.perf_counter() - start
+        
+        print(f"\n⏱️ Wall time: {wall_time:.2f}s "
+              f"(sum of tests: {sum(runner.durations.values()):.2f}s, "
+              f"critical path: {runner.critical_path():.2f}s)")
+        return self.print_summary()
+
+    def write_report(self, report_dir="test_reports"):
+        """Write per-test JSONL records and an iteration summary with latency"""
+        records_path, summary_path = self.results.write(
+            report_dir, self.base_url, self.latency, self.transport.stats.snapshot()
+        )
+        print(f"📝 Results: {records_path}")
+        print(f"📝 Summary: {summary_path}")
+
+    def print_summary(self):
+        """Print the results summary and return overall success"""
         print("\n" + "=" * 60)
         print(f"📊 Test Results: {self.tests_passed}/{self.tests_run} passed")
         
@@ -636,13 +817,422 @@ class SocialChessAPITester:
         
         success_rate = (self.tests_passed / self.tests_run * 100) if self.tests_run > 0 else 0
         print(f"\n✨ Success Rate: {success_rate:.1f}%")
+        self.latency.print_report()
+        self.transport.print_stats()
+        if self.transport.hedging is not None:
+            self.transport.hedging.report()
         
         return self.tests_passed == self.tests_run
 
-def main():
-    tester = SocialChessAPITester()
-    success = tester.run_all_tests()
-    return 0 if success else 1
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Social Chess Events backend API tests")
+    parser.add_argument("--base-url", default="https://chessmeetup.preview.emergentagent.com")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="run independent tests concurrently as a dependency graph")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--offline", action="store_true",
+                        help="start a local stand-in API server and test against it")
+    parser.add_argument("--server-latency-ms", type=float, default=0.0,
+                        help="latency injected by the offline stand-in server")
+    parser.add_argument("--server-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0,
+                        help="delay of each Chess.com/Lichess profile call in the offline stand-in")
+    parser.add_argument("--upstream-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--upstream-failure-rate", type=float, default=0.0,
+                        help="fraction of offline profile calls that fail with 502")
+    parser.add_argument("--report", action="store_true",
+                        help="write the JSONL records and the next iteration summary to --report-dir")
+    parser.add_argument("--report-dir", default="test_reports",
+                        help="where --report writes (test_reports holds the tracked iteration history)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes for load/open-loop modes (0 = one per core)")
+    deadlines = parser.add_argument_group("deadlines and hedging")
+    deadlines.add_argument("--run-budget", type=float, help="seconds for the whole functional run")
+    deadlines.add_argument("--test-budget", type=float, help="seconds for each test")
+    deadlines.add_argument("--hedge", action="store_true",
+                           help="re-send slow idempotent GETs after the observed latency percentile")
+    deadlines.add_argument("--hedge-percentile", type=float, default=95.0)
+    deadlines.add_argument("--hedge-baseline", nargs="?", const="latest", metavar="RUN_ID",
+                           help="start hedging from the latencies of a stored baseline run (default: latest)")
+    deadlines.add_argument("--hedge-warmup", type=int, default=20, metavar="N",
+                           help="without a usable --hedge-baseline, time N GETs per listing first (0: off)")
+    profiling = parser.add_argument_group("profiling and tracing")
+    profiling.add_argument("--trace", metavar="PATH", help="write tests and HTTP calls as a Chrome trace JSON")
+    profiling.add_argument("--profile", choices=TestProfiler.MODES, help="profile each test")
+    profiling.add_argument("--profile-dir", default="profiles")
+    caching = parser.add_argument_group("client HTTP cache")
+    caching.add_argument("--http-cache", action="store_true",
+                         help="serve GETs from a local cache, revalidating with ETag/Last-Modified, "
+                              "and audit endpoint cacheability")
+    caching.add_argument("--http-cache-mb", type=float, default=32.0, help="memory cap of the cache")
+    caching.add_argument("--http-cache-ttl", type=float, default=0.0,
+                         help="seconds a response without Cache-Control max-age stays fresh "
+                              "(default 0: always revalidate, so users see their own writes)")
+    tape = parser.add_argument_group("record and replay")
+    tape.add_argument("--record-cassette", metavar="PATH", help="record every exchange to a cassette")
+    tape.add_argument("--replay-cassette", metavar="PATH", help="serve responses from a recorded cassette")
+    tape.add_argument("--replay-timing", choices=["fast", "recorded"], default="fast",
+                      help="replay at full speed or with the recorded response times")
+    gate = parser.add_argument_group("performance regression gate")
+    gate.add_argument("--baseline-dir", default="baselines")
+    gate.add_argument("--save-baseline", nargs="?", const="", metavar="RUN_ID",
+                      help="append this run's latency histograms to the baseline store")
+    gate.add_argument("--compare-baseline", nargs="?", const="latest", metavar="RUN_ID",
+                      help="compare against a stored run (default: latest); exit 2 on regression. "
+                           "Needs --load or --arrival-rate")
+    gate.add_argument("--regression-threshold", type=float, default=0.2,
+                      help="relative p50/p95 slowdown that counts as a regression")
+    gate.add_argument("--baseline-min-samples", type=int, default=20,
+                      help="samples an endpoint needs on both sides to be judged; fewer exits 3. "
+                           "Load mode gates on its steady phase, --arrival-rate on the whole run")
+    gen = parser.add_argument_group("bulk data generation")
+    gen.add_argument("--generate", choices=sorted(SCALE_PRESETS), help="create a dataset of this scale")
+    gen.add_argument("--gen-clubs", type=int)
+    gen.add_argument("--gen-users", type=int)
+    gen.add_argument("--gen-events", type=int)
+    gen.add_argument("--gen-joins", type=int)
+    gen.add_argument("--gen-concurrency", type=int, default=16)
+    gen.add_argument("--gen-batch-size", type=int, default=50)
+    gen.add_argument("--gen-state", default="datagen_state.json",
+                     help="checkpoint file; rerun with the same file to resume")
+    scaling = parser.add_argument_group("scaling-curve benchmark")
+    scaling.add_argument("--scaling-bench", action="store_true",
+                         help="sweep listing/filter endpoints across growing dataset sizes")
+    scaling.add_argument("--scaling-sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    scaling.add_argument("--scaling-repeats", type=int, default=15)
+    scaling.add_argument("--scaling-output", help="write the fitted curves as JSON")
+    contention = parser.add_argument_group("join contention benchmark")
+    contention.add_argument("--join-contention", action="store_true",
+                            help="race many users for the seats of one small tournament")
+    contention.add_argument("--contention-users", type=int, default=50)
+    contention.add_argument("--contention-seats", type=int, default=8)
+    contention.add_argument("--contention-duplicates", type=float, default=0.2,
+                            help="fraction of users that send their join twice at once")
+    lookups = parser.add_argument_group("chess lookup batch")
+    lookups.add_argument("--lookup-bench", type=int, metavar="N",
+                         help="look up N skewed usernames through the rate-limited, deduplicating scheduler")
+    lookups.add_argument("--lookup-distinct", type=int, help="distinct usernames in the batch (default N/5)")
+    lookups.add_argument("--lookup-concurrency", type=int, default=32)
+    refresh = parser.add_argument_group("rating refresh fan-out benchmark")
+    refresh.add_argument("--refresh-bench", action="store_true",
+                         help="link chess accounts for a user pool and refresh them all concurrently")
+    refresh.add_argument("--refresh-users", type=int, default=200)
+    refresh.add_argument("--refresh-concurrency", type=int, default=16)
+    refresh.add_argument("--refresh-rounds", type=int, default=1)
+    refresh.add_argument("--refresh-max-failure-rate", type=float, default=0.0, metavar="RATE",
+                         help="fraction of failed refreshes tolerated before exiting 1 (default 0)")
+    encoding = parser.add_argument_group("payload encoding and JSON decode benchmark")
+    encoding.add_argument("--encoding-bench", action="store_true",
+                          help="fetch the list endpoints with each Accept-Encoding and time every JSON parser "
+                               "(after --generate, if given)")
+    encoding.add_argument("--encoding-repeats", type=int, default=20)
+    encoding.add_argument("--encoding-me-events", type=int, default=50,
+                          help="events the bench user joins so /me/events has a body to measure")
+    encoding.add_argument("--encoding-output", help="write the matrix as JSON")
+    soak = parser.add_argument_group("soak mode")
+    soak.add_argument("--soak", type=float, metavar="SECONDS",
+                      help="repeat the functional suite (or --soak-mode load) for this long")
+    soak.add_argument("--soak-mode", choices=["functional", "load"], default="functional")
+    soak.add_argument("--soak-bucket", type=float, default=60.0, help="seconds per time-series bucket")
+    soak.add_argument("--soak-output", default="soak_timeseries.jsonl")
+    soak.add_argument("--soak-analyze", metavar="PATH", help="only run drift detection on an existing time series")
+    soak.add_argument("--drift-threshold", type=float, default=0.25,
+                      help="relative latency rise over the run that counts as drift")
+    load = parser.add_argument_group("load mode")
+    load.add_argument("--load", action="store_true", help="run virtual users instead of the functional tests")
+    load.add_argument("--users", type=int, default=50)
+    load.add_argument("--ramp-up", type=float, default=30.0)
+    load.add_argument("--steady", type=float, default=60.0)
+    load.add_argument("--ramp-down", type=float, default=15.0)
+    load.add_argument("--think-time", type=float, nargs=2, default=(0.5, 2.0), metavar=("MIN", "MAX"))
+    load.add_argument("--token-pool", metavar="PATH",
+                      help="reuse pre-provisioned users cached in PATH instead of registering each virtual user")
+    load.add_argument("--token-pool-size", type=int, help="users to keep in the pool (default: --users)")
+    arrival = parser.add_argument_group("open-loop mode (public read endpoints)")
+    arrival.add_argument("--arrival-rate", type=float, help="fire GETs at this fixed rate (req/s)")
+    arrival.add_argument("--find-max-rps", action="store_true",
+                         help="search for the highest rate that meets --p99-target-ms")
+    arrival.add_argument("--duration", type=float, default=30.0, help="seconds per open-loop run")
+    arrival.add_argument("--p99-target-ms", type=float, default=500.0)
+    args = parser.parse_args(argv)
+    if args.profile == "cprofile" and args.concurrent:
+        parser.error("--profile cprofile profiles one test at a time: drop --concurrent (or use tracemalloc)")
+    if args.compare_baseline and not (args.load or args.arrival_rate):
+        # One or two requests per endpoint never reach --baseline-min-samples: the gate could only exit 3
+        parser.error("--compare-baseline needs repeated samples: use it with --load or --arrival-rate")
+    return args
+
+def mount_http_cache(transport, args):
+    cache = HTTPCache(max_bytes=int(args.http_cache_mb * 1024 * 1024), default_ttl=args.http_cache_ttl)
+    transport.mount_adapter(CachingAdapter(transport.session.get_adapter(args.base_url), cache))
+    return cache
+
+def check_baseline(recorder, args, mode):
+    """Gate this run's latency on a stored baseline: 0 ok, 2 regressed, 3 too few samples to judge"""
+    store = BaselineStore(args.baseline_dir)
+    try:
+        baseline = store.load(args.compare_baseline)
+        saved_mode = store.entry(args.compare_baseline).get("mode", "functional")
+    except (KeyError, ValueError, OSError) as e:
+        print(f"⚠️ No usable baseline: {e}")
+        return 3
+    if saved_mode != mode:
+        print(f"⚠️ Baseline {args.compare_baseline!r} was recorded in {saved_mode} mode, this is a {mode} run")
+    rows = compare(baseline, recorder, threshold=args.regression_threshold, min_count=args.baseline_min_samples)
+    print_comparison(rows, args.regression_threshold)
+    regressed = [row["endpoint"] for row in rows if row["regressed"]]
+    insufficient = [row["endpoint"] for row in rows if row["insufficient"]]
+    if regressed:
+        print(f"\n❌ Latency regression in: {', '.join(regressed)}")
+        return 2
+    if insufficient:
+        print(f"\n⚠️ Cannot judge {len(insufficient)} endpoints with under {args.baseline_min_samples} samples; "
+              f"record and compare baselines with --load or --arrival-rate for repeated samples")
+        return 3
+    return 0
+
+def save_baseline(recorder, args, mode):
+    run_id = BaselineStore(args.baseline_dir).append(recorder, args.save_baseline or None,
+                                                     {"base_url": args.base_url, "mode": mode})
+    print(f"💾 Saved {mode} baseline run {run_id} to {args.baseline_dir}")
+
+def baseline_gate(recorder, args, mode):
+    """Compare with and/or save to the baseline store as requested; returns the gate's exit code"""
+    status = check_baseline(recorder, args, mode) if args.compare_baseline else 0
+    if args.save_baseline is not None:
+        save_baseline(recorder, args, mode)
+    return status
+
+def attach_hedging(transport, args, concurrency):
+    """Install a HedgingPolicy that can fire from the first request: primed from a baseline or a warm-up"""
+    policy = HedgingPolicy(transport, percentile=args.hedge_percentile, concurrency=concurrency)
+    primed = 0
+    if args.hedge_baseline:
+        try:
+            primed = policy.prime(BaselineStore(args.baseline_dir).load(args.hedge_baseline))
+        except (KeyError, ValueError, OSError) as e:
+            print(f"⚠️ No usable hedging baseline: {e}")
+    if not primed and args.hedge_warmup:
+        policy.warm_up([f"{args.base_url}/api/events", f"{args.base_url}/api/clubs"], args.hedge_warmup)
+    transport.hedging = policy
+    return policy
+
+def seed_stand_in(base_url):
+    """Load the offline stand-in's sample clubs and events; a fresh one has nothing to browse or join"""
+    seeder = SocialChessAPITester(base_url)
+    try:
+        if not seeder.test_seed_data():
+            raise SystemExit(f"Seeding the stand-in failed: {seeder.failed_tests}")
+    finally:
+        seeder.transport.close()
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.offline:
+        return run(args)
+
+    server, args.base_url = start_in_process(latency=args.server_latency_ms / 1000,
+                                             jitter=args.server_jitter_ms / 1000,
+                                             upstream_delay=args.upstream_delay_ms / 1000,
+                                             upstream_jitter=args.upstream_jitter_ms / 1000,
+                                             upstream_failure_rate=args.upstream_failure_rate)
+    print(f"♟️ Offline mode: stand-in API at {args.base_url}")
+    try:
+        return run(args)
+    finally:
+        server.terminate()
+        server.join()
+
+def run(args):
+    if args.scaling_bench:
+        bench = ScalingBenchmark(args.base_url, sizes=args.scaling_sizes, repeats=args.scaling_repeats)
+        try:
+            summary, flagged = bench.run()
+            if args.scaling_output:
+                bench.write(args.scaling_output, summary)
+        finally:
+            bench.transport.close()
+        return 2 if flagged else 0
+
+    if args.join_contention:
+        bench = JoinContentionBenchmark(args.base_url, users=args.contention_users, seats=args.contention_seats,
+                                        duplicate_fraction=args.contention_duplicates)
+        try:
+            return 0 if bench.run() else 1
+        finally:
+            bench.transport.close()
+
+    if args.lookup_bench:
+        tester = SocialChessAPITester(args.base_url, pool_size=args.lookup_concurrency)
+        start = time.perf_counter()
+        try:
+            statuses = tester.lookups.lookup_batch(synthetic_usernames(args.lookup_bench, args.lookup_distinct),
+                                                   concurrency=args.lookup_concurrency)
+        finally:
+            tester.transport.close()
+        print(f"🔎 {args.lookup_bench} lookups in {time.perf_counter() - start:.1f}s: "
+              + ", ".join(f"{status or 'error'}: {count}" for status, count in sorted(
+                  statuses.items(), key=lambda item: (item[0] is None, item[0] or 0))))
+        tester.lookups.report()
+        return 0 if set(statuses) <= {200, 404} else 1
+
+    if args.refresh_bench:
+        bench = RefreshFanoutBenchmark(args.base_url, users=args.refresh_users, concurrency=args.refresh_concurrency,
+                                       rounds=args.refresh_rounds, token_pool_path=args.token_pool)
+        try:
+            failure_rate = bench.run()
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            bench.transport.close()
+        return 1 if failure_rate > args.refresh_max_failure_rate else 0
+
+    if args.soak or args.soak_analyze:
+        if args.soak:
+            SoakRunner(args.base_url, SocialChessAPITester, args.soak, bucket_seconds=args.soak_bucket,
+                       output=args.soak_output, mode=args.soak_mode,
+                       load_options={"users": args.users, "think_time": tuple(args.think_time)}).run()
+        buckets = load_series(args.soak_analyze or args.soak_output)
+        findings = detect_drift(buckets, latency_threshold=args.drift_threshold)
+        print_drift_report(buckets, findings)
+        return 2 if findings else 0
+
+    custom_counts = [args.gen_clubs, args.gen_users, args.gen_events, args.gen_joins]
+    generated = False
+    if args.generate or any(count is not None for count in custom_counts):
+        counts = dict(SCALE_PRESETS[args.generate]) if args.generate else dict.fromkeys(SCALE_PRESETS["10k"], 0)
+        for name, count in zip(("clubs", "users", "events", "joins"), custom_counts):
+            if count is not None:
+                counts[name] = count
+        generator = BulkDataGenerator(args.base_url, concurrency=args.gen_concurrency,
+                                      batch_size=args.gen_batch_size, state_path=args.gen_state, **counts)
+        try:
+            generator.run()
+        finally:
+            generator.transport.close()
+        generated = True
+        if generator.failures or not args.encoding_bench:
+            return 0 if not generator.failures else 1
+
+    if args.encoding_bench:
+        if args.offline and not generated:
+            seed_stand_in(args.base_url)
+        bench = EncodingBenchmark(args.base_url, repeats=args.encoding_repeats, me_events=args.encoding_me_events)
+        try:
+            bench.run()
+            if args.encoding_output:
+                bench.write(args.encoding_output)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            bench.transport.close()
+        return 0
+
+    if args.offline and (args.load or args.arrival_rate or args.find_max_rps):
+        seed_stand_in(args.base_url)
+
+    token_pool = None
+    if args.load and args.token_pool:
+        token_pool = TokenPool(args.base_url, args.token_pool, size=args.token_pool_size or args.users).provision()
+
+    if args.processes != 1 and (args.load or args.arrival_rate):
+        if token_pool:
+            # Workers load the freshly provisioned cache from disk
+            token_pool.close()
+        if args.load:
+            options = {"base_url": args.base_url, "users": args.users, "ramp_up": args.ramp_up,
+                       "steady": args.steady, "ramp_down": args.ramp_down, "think_time": tuple(args.think_time),
+                       "token_pool": args.token_pool, "token_pool_size": args.token_pool_size or args.users}
+        else:
+            options = {"base_url": args.base_url, "rps": args.arrival_rate, "duration": args.duration}
+        coordinator = MultiProcessCoordinator("load" if args.load else "arrival", options,
+                                              tester_factory=SocialChessAPITester,
+                                              processes=args.processes or None)
+        if not coordinator.run():
+            return 1
+        phase = "steady" if args.load else "open-loop"
+        merged = coordinator.merged()
+        if phase not in merged:
+            return 0
+        return baseline_gate(merged[phase][0], args, "load" if args.load else "open-loop")
+
+    if args.load:
+        runner = LoadRunner(args.base_url, SocialChessAPITester, users=args.users, ramp_up=args.ramp_up,
+                            steady=args.steady, ramp_down=args.ramp_down, think_time=tuple(args.think_time),
+                            token_pool=token_pool)
+        if args.hedge:
+            attach_hedging(runner.transport, args, args.users)
+        cache = mount_http_cache(runner.transport, args) if args.http_cache else None
+        try:
+            runner.run()
+        finally:
+            if token_pool:
+                token_pool.close()
+        if runner.transport.hedging is not None:
+            runner.transport.hedging.report()
+        if cache:
+            cache.report()
+        steady = next((phase for phase in runner.phases if phase.name == "steady"), None)
+        return baseline_gate(steady.recorder, args, "load") if steady else 0
+
+    if args.arrival_rate or args.find_max_rps:
+        runner = ConstantArrivalRunner(args.base_url)
+        try:
+            runner.discover_targets()
+            if args.find_max_rps:
+                runner.find_max_rps(args.p99_target_ms / 1000.0, start_rps=args.arrival_rate or 10.0,
+                                    duration=args.duration)
+            else:
+                result = runner.run(args.arrival_rate, args.duration)
+                result.report()
+                return baseline_gate(result.latencies, args, "open-loop")
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            runner.transport.close()
+        return 0
+
+    tester = SocialChessAPITester(args.base_url, pool_size=args.pool_size, run_budget=args.run_budget,
+                                  test_budget=args.test_budget)
+    if args.hedge:
+        attach_hedging(tester.transport, args, args.max_concurrency if args.concurrent else 1)
+    tracer = ChromeTraceRecorder().attach(tester) if args.trace else None
+    profiler = TestProfiler(args.profile, args.profile_dir).attach(tester) if args.profile else None
+    if args.record_cassette:
+        tester.transport.mount_adapter(RecordingAdapter(tester.transport.adapter,
+                                                        Cassette(args.record_cassette).open_for_recording()))
+    elif args.replay_cassette:
+        replay = ReplayAdapter(Cassette(args.replay_cassette).open_for_replay(), args.replay_timing)
+        tester.transport.mount_adapter(replay)
+        print(f"📼 Replaying {len(replay.cassette.entries)} exchanges from {args.replay_cassette} "
+              f"({args.replay_timing} timing)")
+    # On top of the cassette adapters: hits never reach the tape, revalidations do
+    cache = mount_http_cache(tester.transport, args) if args.http_cache else None
+    try:
+        if args.concurrent:
+            success = asyncio.run(tester.run_all_tests_async(args.max_concurrency))
+        else:
+            success = tester.run_all_tests()
+        if args.replay_cassette and replay.misses:
+            print(f"⚠️ {replay.misses} requests had no recorded exchange in the cassette")
+        if tracer:
+            print(f"🧵 Trace: {tracer.write(args.trace)} ({len(tracer.events)} events)")
+        if profiler:
+            print(f"🔬 {len(profiler.written)} {args.profile} reports in {args.profile_dir}")
+        if cache:
+            cache.report()
+        if args.report:
+            tester.write_report(args.report_dir)
+        gate = baseline_gate(tester.latency, args, "functional")
+    finally:
+        tester.transport.close()
+    if not success:
+        return 1
+    return gate
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,184 @@
+import json
+import os
+import random
+import struct
+import time
+import zlib
+
+from latency_histogram import HistogramRecorder
+
+_RECORD_HEADER = struct.Struct("<4sHdI")
+_MAGIC = b"BLR1"
+
+
+class BaselineStore:
+    """Append-only on-disk store of per-endpoint latency histograms, indexed by run
+
+    `latency.bin` holds one record per run (header, run id, encoded
+    HistogramRecorder, CRC32); `latency.idx` is a JSON-lines index of record
+    offsets that can be rebuilt from the data file if it is lost.
+    """
+
+    def __init__(self, directory="baselines"):
+        self.directory = directory
+        self.data_path = os.path.join(directory, "latency.bin")
+        self.index_path = os.path.join(directory, "latency.idx")
+
+    def append(self, recorder, run_id=None, metadata=None):
+        os.makedirs(self.directory, exist_ok=True)
+        run_id = run_id or time.strftime("%Y%m%d_%H%M%S")
+        payload = recorder.encode()
+        key = run_id.encode()
+        record = _RECORD_HEADER.pack(_MAGIC, len(key), time.time(), len(payload)) + key + payload
+        record += struct.pack("<I", zlib.crc32(record))
+        with open(self.data_path, "ab") as f:
+            offset = f.tell()
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        entry = {"run_id": run_id, "offset": offset, "length": len(record), "timestamp": time.time()}
+        entry.update(metadata or {})
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return run_id
+
+    def index(self):
+        if not os.path.exists(self.index_path):
+            return self.rebuild_index()
+        with open(self.index_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def rebuild_index(self):
+        """Scan the data file and rewrite the index, stopping at the first torn record"""
+        entries = []
+        if not os.path.exists(self.data_path):
+            return entries
+        with open(self.data_path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            magic, key_length, timestamp, payload_length = _RECORD_HEADER.unpack_from(data, offset)
+            length = _RECORD_HEADER.size + key_length + payload_length + 4
+            if magic != _MAGIC or offset + length > len(data):
+                break
+            key_start = offset + _RECORD_HEADER.size
+            run_id = data[key_start:key_start + key_length].decode()
+            entries.append({"run_id": run_id, "offset": offset, "length": length, "timestamp": timestamp})
+            offset += length
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.index_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        return entries
+
+    def entry(self, run_id="latest"):
+        """Index entry (offsets plus the metadata it was saved with) of one stored run"""
+        entries = self.index()
+        if not entries:
+            raise KeyError("Baseline store is empty")
+        if run_id == "latest":
+            return entries[-1]
+        matches = [e for e in entries if e["run_id"] == run_id]
+        if not matches:
+            raise KeyError(f"No baseline run {run_id!r}")
+        return matches[-1]
+
+    def load(self, run_id="latest"):
+        """HistogramRecorder of one stored run ('latest' for the most recent)"""
+        entry = self.entry(run_id)
+        with open(self.data_path, "rb") as f:
+            f.seek(entry["offset"])
+            record = f.read(entry["length"])
+        (crc,) = struct.unpack_from("<I", record, len(record) - 4)
+        if zlib.crc32(record[:-4]) != crc:
+            raise ValueError(f"Baseline run {entry['run_id']!r} is corrupt")
+        _, key_length, _, payload_length = _RECORD_HEADER.unpack_from(record)
+        start = _RECORD_HEADER.size + key_length
+        return HistogramRecorder.decode(record[start:start + payload_length])
+
+
+def _resample_percentiles(values, cum_weights, size, pcts, rng):
+    sample = sorted(rng.choices(values, cum_weights=cum_weights, k=size))
+    return [sample[max(0, -(-pct * size // 100) - 1)] for pct in pcts]
+
+
+def bootstrap_ratios(baseline, current, pcts=(50, 95), iterations=400, max_sample=2000, confidence=0.95,
+                     seed=0):
+    """Bootstrap confidence intervals of current/baseline for each percentile
+
+    Resamples are drawn from each histogram's bucket distribution, which is
+    exact up to the histogram's precision. Large histograms are resampled at
+    `max_sample` points, which only widens the intervals.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for histogram in (baseline, current):
+        values, cum_weights, running = [], [], 0
+        for value, count in histogram.iter_values():
+            running += count
+            values.append(value)
+            cum_weights.append(running)
+        samples.append((values, cum_weights, min(histogram.total_count, max_sample)))
+
+    ratios = {pct: [] for pct in pcts}
+    for _ in range(iterations):
+        base = _resample_percentiles(*samples[0], pcts, rng)
+        cur = _resample_percentiles(*samples[1], pcts, rng)
+        for pct, b, c in zip(pcts, base, cur):
+            ratios[pct].append(c / b if b else float("inf"))
+    tail = (1 - confidence) / 2
+    intervals = {}
+    for pct, values in ratios.items():
+        values.sort()
+        intervals[pct] = (values[int(tail * (iterations - 1))], values[int((1 - tail) * (iterations - 1))])
+    return intervals
+
+
+def compare(baseline, current, threshold=0.2, min_count=20, iterations=400):
+    """Per-endpoint p50/p95 deltas; an endpoint regresses when the whole CI is above 1 + threshold
+
+    Endpoints with fewer than `min_count` samples on either side cannot be
+    judged and are marked `insufficient`; callers must not read that as a pass.
+    """
+    rows = []
+    baseline_endpoints = baseline.by_endpoint()
+    for endpoint, cur in sorted(current.by_endpoint().items()):
+        base = baseline_endpoints.get(endpoint)
+        row = {"endpoint": endpoint, "count": cur.total_count, "regressed": False, "insufficient": False}
+        if base is None:
+            row["verdict"] = "new"
+            rows.append(row)
+            continue
+        enough = min(base.total_count, cur.total_count) >= min_count
+        intervals = bootstrap_ratios(base, cur, (50, 95), iterations=iterations) if enough else {}
+        for pct in (50, 95):
+            row[f"p{pct}"] = (base.value_at_percentile(pct) / 1000, cur.value_at_percentile(pct) / 1000)
+            if pct in intervals:
+                row[f"p{pct}_ci"] = intervals[pct]
+                if intervals[pct][0] > 1 + threshold:
+                    row["regressed"] = True
+        if "p50_ci" not in row:
+            row["insufficient"] = True
+            row["verdict"] = f"too few samples ({min(base.total_count, cur.total_count)} < {min_count})"
+        else:
+            row["verdict"] = "REGRESSED" if row["regressed"] else "ok"
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows, threshold):
+    print(f"\n📉 Latency vs baseline (regression = 95% CI of ratio above +{threshold * 100:.0f}%)")
+    print(f"  {'endpoint':<44} {'n':>5} {'p50 base→cur ms':>18} {'Δp50':>7} "
+          f"{'p95 base→cur ms':>18} {'Δp95':>7}  verdict")
+    for row in rows:
+        cells = []
+        for pct in (50, 95):
+            if f"p{pct}" not in row:
+                cells.extend(["-", "-"])
+                continue
+            base_value, cur_value = row[f"p{pct}"]
+            delta = (cur_value / base_value - 1) * 100 if base_value else 0.0
+            cells.extend([f"{base_value:.1f}→{cur_value:.1f}", f"{delta:+.0f}%"])
+        icon = "❌" if row["regressed"] else "⚠️" if row["insufficient"] else "✅"
+        print(f"  {row['endpoint']:<44} {row['count']:>5} {cells[0]:>18} {cells[1]:>7} "
+              f"{cells[2]:>18} {cells[3]:>7}  {icon} {row['verdict']}")
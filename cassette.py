@@ -0,0 +1,264 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from http_transport import endpoint_key
+
+REDACTED_HEADERS = {"authorization", "cookie"}
+# JSON fields blanked in stored request and response bodies, at any depth
+REDACTED_FIELDS = {"password", "session_token", "token", "access_token", "refresh_token"}
+# Stands in for a secret; a plain token so cookie parsers on replay accept it
+REDACTED = "REDACTED"
+# Bodies are stored decoded, so transfer framing headers no longer apply
+DROPPED_RESPONSE_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+def _canonical_url(url):
+    """Path and sorted query only, so a cassette replays against any host"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(("", "", parts.path, query, ""))
+
+
+def _canonical_body(body):
+    if not body:
+        return b""
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        return body
+
+
+def _redact_json(value):
+    if isinstance(value, dict):
+        return {key: REDACTED if key.lower() in REDACTED_FIELDS and item is not None else _redact_json(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    return value
+
+
+def redact_body(body):
+    """A JSON body with password and token fields blanked; other bodies unchanged"""
+    if not body:
+        return body or b""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    redacted = _redact_json(payload)
+    if redacted == payload:
+        return body
+    return json.dumps(redacted, separators=(",", ":")).encode()
+
+
+def redact_set_cookie(value):
+    """Keep a Set-Cookie's name and attributes, drop its value"""
+    return re.sub(r"^(\s*[^=;\s]+)=[^;]*", rf"\1={REDACTED}", value)
+
+
+def fingerprint(method, url, body):
+    """Stable identity of a request: method, path with sorted query and canonical JSON body"""
+    digest = hashlib.sha1()
+    digest.update(method.upper().encode())
+    digest.update(b" " + _canonical_url(url).encode() + b"\n")
+    digest.update(_canonical_body(body))
+    return digest.hexdigest()
+
+
+def build_response(adapter, request, status, reason, header_pairs, body, ttfb):
+    """A requests Response for a stored exchange, as if `adapter` had just received it"""
+    headers = CaseInsensitiveDict()
+    for name, value in header_pairs:
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    headers["Content-Length"] = str(len(body))
+
+    response = Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = headers
+    response._content = body
+    # Lets iter_content() serve the body to stream=True callers
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(headers)
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    response.elapsed = timedelta(seconds=ttfb)
+    for name, value in header_pairs:
+        if name.lower() == "set-cookie":
+            for morsel in SimpleCookie(value).values():
+                response.cookies.set(morsel.key, morsel.value, path=morsel["path"] or "/")
+    return response
+
+
+class Cassette:
+    """On-disk recording of HTTP exchanges
+
+    `<path>.bodies` holds request and response bodies back to back and is
+    memory-mapped on replay; `<path>.index.json` holds one entry per
+    exchange (metadata plus body offsets) grouped by request fingerprint.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.bodies_path = f"{path}.bodies"
+        self.index_path = f"{path}.index.json"
+        self.entries = []
+        self._lock = threading.Lock()
+        self._bodies = None
+        self._offset = 0
+        self._mmap = None
+        self._by_fingerprint = {}
+        self._by_endpoint = {}
+        self._cursors = {}
+
+    # Recording
+
+    def open_for_recording(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._bodies = open(self.bodies_path, "wb")
+        self._offset = 0
+        self.entries = []
+        return self
+
+    def _write_body(self, data):
+        offset = self._offset
+        self._bodies.write(data)
+        self._offset += len(data)
+        return offset, len(data)
+
+    def add(self, request, response, elapsed, raw_headers):
+        """Store one exchange with credentials, passwords and session tokens redacted"""
+        body = redact_body(request.body.encode() if isinstance(request.body, str) else (request.body or b""))
+        with self._lock:
+            request_body = self._write_body(body)
+            response_body = self._write_body(redact_body(response.content or b""))
+            self.entries.append({
+                "fingerprint": fingerprint(request.method, request.url, body),
+                "endpoint": endpoint_key(request.method, request.url),
+                "method": request.method,
+                "url": request.url,
+                "request_headers": {k: ("<redacted>" if k.lower() in REDACTED_HEADERS else v)
+                                    for k, v in request.headers.items()},
+                "request_body": request_body,
+                "status": response.status_code,
+                "reason": response.reason,
+                "response_headers": [[k, redact_set_cookie(v) if k.lower() == "set-cookie" else v]
+                                     for k, v in raw_headers if k.lower() not in DROPPED_RESPONSE_HEADERS],
+                "response_body": response_body,
+                "ttfb": response.elapsed.total_seconds(),
+                "elapsed": elapsed,
+                "recorded_at": time.time(),
+            })
+
+    def close(self):
+        if self._bodies is not None:
+            self._bodies.close()
+            self._bodies = None
+            with open(self.index_path, "w") as f:
+                json.dump({"version": 1, "entries": self.entries}, f)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    # Replay
+
+    def open_for_replay(self):
+        with open(self.index_path) as f:
+            self.entries = json.load(f)["entries"]
+        with open(self.bodies_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for position, entry in enumerate(self.entries):
+            self._by_fingerprint.setdefault(entry["fingerprint"], []).append(position)
+            self._by_endpoint.setdefault(entry["endpoint"], []).append(position)
+        return self
+
+    def body(self, span):
+        offset, length = span
+        if not length:
+            return b""
+        return self._mmap[offset:offset + length]
+
+    def _next(self, key, positions):
+        """Serve recorded entries for a key in order, repeating the last one"""
+        with self._lock:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+        return self.entries[positions[min(cursor, len(positions) - 1)]]
+
+    def match(self, request):
+        """Exact fingerprint match, else the next exchange recorded for the same endpoint
+
+        The fallback covers requests whose bodies embed per-run values, such as
+        the timestamped e-mail used for registration.
+        """
+        # Recorded fingerprints were taken over redacted bodies
+        body = redact_body(request.body.encode() if isinstance(request.body, str) else request.body)
+        key = fingerprint(request.method, request.url, body)
+        if key in self._by_fingerprint:
+            return self._next(key, self._by_fingerprint[key])
+        endpoint = endpoint_key(request.method, request.url)
+        if endpoint in self._by_endpoint:
+            return self._next(endpoint, self._by_endpoint[endpoint])
+        return None
+
+
+class RecordingAdapter(BaseAdapter):
+    """Adapter that forwards to a real adapter and writes every exchange to a cassette"""
+
+    def __init__(self, inner, cassette):
+        super().__init__()
+        self.inner = inner
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        response.content
+        elapsed = time.perf_counter() - start
+        raw_headers = list(response.raw.headers.items()) if response.raw is not None else []
+        self.cassette.add(request, response, elapsed, raw_headers)
+        return response
+
+    def close(self):
+        self.inner.close()
+        self.cassette.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter that answers from a cassette, at full speed or with the recorded timing"""
+
+    def __init__(self, cassette, timing="fast"):
+        super().__init__()
+        self.cassette = cassette
+        self.timing = timing
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.match(request)
+        if entry is None:
+            self.misses += 1
+            return build_response(self, request, 599, "Not In Cassette", [], b"", 0.0)
+        if self.timing == "recorded":
+            time.sleep(entry["elapsed"])
+        return build_response(self, request, entry["status"], entry["reason"], entry["response_headers"],
+                              self.cassette.body(entry["response_body"]), entry["ttfb"])
+
+    def close(self):
+        self.cassette.close()
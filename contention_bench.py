@@ -0,0 +1,157 @@
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+
+
+class JoinContentionBenchmark:
+    """Many pre-authenticated users join one small tournament at the same instant
+
+    Every user is registered before the clock starts, then all join requests
+    are released together from a barrier. Afterwards the event detail and
+    each user's /me/events are checked against the join responses: the event
+    must never hold more attendees than seats, and exactly the users that got
+    a 200 must be listed. A fraction of users fire their join twice at once
+    to exercise the "already joined" check under the same race.
+    """
+
+    def __init__(self, base_url, users=50, seats=8, duplicate_fraction=0.2, seed=0, transport=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.users = users
+        self.seats = seats
+        self.duplicate_fraction = duplicate_fraction
+        self.rng = random.Random(seed)
+        self.transport = transport or HTTPTransport(pool_size=users * 2, retries=0)
+        self.run_tag = uuid.uuid4().hex[:10]
+        self.latency = LatencyHistogram()
+        self.statuses = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _register(self, index, user_type="user"):
+        response = self.transport.post(f"{self.api_url}/auth/register", json={
+            "email": f"contention_{self.run_tag}_{user_type}{index}@example.com",
+            "password": "contention123",
+            "name": f"Contention {user_type} {index}",
+            "user_type": user_type,
+            "skill_level": "avanzado",
+            "city": "Madrid",
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"Registration failed with status {response.status_code}")
+        return response.json()["user_id"], response.cookies.get("session_token")
+
+    def _headers(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def _create_event(self, token):
+        response = self.transport.post(f"{self.api_url}/events", headers=self._headers(token), json={
+            "title": f"Torneo relámpago {self.run_tag}",
+            "description": "Contention benchmark: more players than seats",
+            "city": "Madrid",
+            "address": "Calle Mayor 1",
+            "date": (date.today() + timedelta(days=7)).isoformat(),
+            "time": "18:00",
+            "event_type": "torneo",
+            "skill_level": "avanzado",
+            "max_seats": self.seats,
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f"Event creation failed with status {response.status_code}")
+        return response.json()["event_id"]
+
+    def _join(self, barrier, event_id, user_id, token, outcomes):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            response = self.transport.post(f"{self.api_url}/events/{event_id}/join", headers=self._headers(token))
+            status = response.status_code
+        except Exception:
+            status = None
+        finished = time.perf_counter()
+        with self._lock:
+            self.latency.record_seconds(finished - start)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status is None:
+                self.errors += 1
+            outcomes.append((user_id, status, start, finished))
+
+    def run(self):
+        print(f"🏁 Join contention: {self.users} users racing for {self.seats} seats at {self.base_url}")
+        _, organizer_token = self._register(0, "club")
+        event_id = self._create_event(organizer_token)
+
+        setup_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(32, self.users)) as pool:
+            accounts = list(pool.map(self._register, range(self.users)))
+        print(f"🔑 Pre-authenticated {len(accounts)} users in {time.perf_counter() - setup_start:.1f}s")
+
+        attempts = []
+        for user_id, token in accounts:
+            attempts.append((user_id, token))
+            if self.rng.random() < self.duplicate_fraction:
+                attempts.append((user_id, token))
+        barrier = threading.Barrier(len(attempts))
+        outcomes = []
+        threads = [threading.Thread(target=self._join, args=(barrier, event_id, user_id, token, outcomes))
+                   for user_id, token in attempts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self.verify(event_id, accounts, outcomes)
+
+    def verify(self, event_id, accounts, outcomes):
+        winners = [user_id for user_id, status, _, _ in outcomes if status == 200]
+        succeeded = [(start, finished) for _, status, start, finished in outcomes if status == 200]
+        window = (max(f for _, f in succeeded) - min(s for s, _ in succeeded)) if succeeded else 0.0
+
+        problems = []
+        if len(winners) != len(set(winners)):
+            problems.append("a user was granted the same seat twice")
+        if len(winners) > self.seats:
+            problems.append(f"{len(winners)} joins succeeded for {self.seats} seats")
+
+        event = self.transport.get(f"{self.api_url}/events/{event_id}").json()
+        attendees = event.get("attendees", [])
+        if len(attendees) > event.get("max_seats", self.seats):
+            problems.append(f"event lists {len(attendees)} attendees for {event.get('max_seats')} seats")
+        if sorted(attendees) != sorted(set(winners)):
+            problems.append("event attendees differ from the users whose join returned 200")
+
+        winner_set = set(winners)
+        mismatched = 0
+        for user_id, token in accounts:
+            joined = self.transport.get(f"{self.api_url}/me/events", headers=self._headers(token)).json()
+            listed = any(e.get("event_id") == event_id for e in joined.get("joined", []))
+            if listed != (user_id in winner_set):
+                mismatched += 1
+        if mismatched:
+            problems.append(f"{mismatched} users' /me/events disagree with their join response")
+
+        self.report(len(outcomes), len(winners), window, len(attendees), problems)
+        return not problems
+
+    def report(self, attempts, winners, window, attendees, problems):
+        pcts = self.latency.percentiles((50, 95, 99))
+        p50, p95, p99 = (pcts[p] / 1000 for p in (50, 95, 99))
+        statuses = ", ".join(f"{status or 'error'}: {count}" for status, count in sorted(
+            self.statuses.items(), key=lambda item: (item[0] is None, item[0] or 0)))
+        print(f"\n📊 {attempts} join attempts ({statuses})")
+        print(f"⏱️ Join latency under contention: p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms, "
+              f"max {self.latency.max_value / 1000:.1f} ms")
+        rate = winners / window if window else 0.0
+        print(f"🎟️ {winners}/{self.seats} seats taken in {window * 1000:.1f} ms ({rate:.0f} successful joins/s), "
+              f"event lists {attendees} attendees")
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+        else:
+            print("✅ No overselling: event detail and /me/events match the join responses")
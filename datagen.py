@@ -0,0 +1,297 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+from http_transport import HTTPTransport
+
+CITY_WEIGHTS = {
+    "Madrid": 30, "Barcelona": 28, "Valencia": 12, "Sevilla": 9, "Bilbao": 6,
+    "Zaragoza": 5, "Málaga": 5, "Granada": 3, "Salamanca": 2,
+}
+SKILL_WEIGHTS = {"principiante": 45, "medio": 40, "avanzado": 15}
+EVENT_TYPE_WEIGHTS = {"casual": 75, "torneo": 25}
+SEAT_WEIGHTS = {4: 10, 6: 12, 8: 22, 10: 20, 12: 12, 16: 10, 24: 7, 32: 5, 64: 2}
+# Weekends draw most of the in-person events
+WEEKDAY_WEIGHTS = [8, 8, 9, 10, 16, 27, 22]
+
+SCALE_PRESETS = {
+    "10k": {"clubs": 200, "users": 10_000, "events": 10_000, "joins": 30_000},
+    "100k": {"clubs": 2_000, "users": 100_000, "events": 100_000, "joins": 300_000},
+    "1m": {"clubs": 20_000, "users": 1_000_000, "events": 1_000_000, "joins": 3_000_000},
+}
+PHASES = ("clubs", "users", "events", "joins")
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _ranges(indices):
+    """Sorted ints as [start, end) pairs, so a long run of done items stores as one pair"""
+    ranges = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index:
+            ranges[-1][1] = index + 1
+        else:
+            ranges.append([index, index + 1])
+    return ranges
+
+
+class GeneratorState:
+    """Resumable progress: a per-phase high-water mark of created items plus the ids later phases need
+
+    `created[phase]` counts the items from index 0 up that all succeeded;
+    items that succeeded beyond a gap (a failure, or an item still in
+    flight) wait in `ahead` until the gap closes. Workers record each item
+    as it completes and the state is saved on every checkpoint and when a
+    phase ends or is interrupted, so a resumed or topped-up run retries
+    failed items and skips created ones. Only items whose POST was in
+    flight at the interruption (or, if the process was killed outright,
+    that completed since the last checkpoint) are sent again: accounts and
+    joins absorb that, but such an event is created a second time.
+    """
+
+    def __init__(self, path, run_tag, seed, start_date):
+        self.path = path
+        self.run_tag = run_tag
+        self.seed = seed
+        self.start_date = start_date
+        self.created = dict.fromkeys(PHASES, 0)
+        self.ahead = {phase: set() for phase in PHASES}
+        self.organizer_tokens = []
+        self.member_tokens = []
+        self.event_ids = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_or_create(cls, path, seed):
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            state = cls(path, data["run_tag"], data["seed"], date.fromisoformat(data["start_date"]))
+            state.created.update(data.get("created", {}))
+            for phase, ranges in data.get("ahead", {}).items():
+                state.ahead[phase] = {index for start, end in ranges for index in range(start, end)}
+            state.organizer_tokens = data["organizer_tokens"]
+            state.member_tokens = data["member_tokens"]
+            state.event_ids = data["event_ids"]
+            return state
+        return cls(path, time.strftime("%Y%m%d%H%M%S"), seed, date.today())
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "run_tag": self.run_tag,
+                "seed": self.seed,
+                "start_date": self.start_date.isoformat(),
+                "created": dict(self.created),
+                "ahead": {phase: _ranges(indices) for phase, indices in self.ahead.items() if indices},
+                "organizer_tokens": self.organizer_tokens,
+                "member_tokens": self.member_tokens,
+                "event_ids": self.event_ids,
+            }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def pending(self, phase, total):
+        """Indices below `total` not created yet, in order"""
+        with self._lock:
+            created, ahead = self.created[phase], set(self.ahead[phase])
+        return [index for index in range(created, total) if index not in ahead]
+
+    def complete_items(self, phase, succeeded, organizers=(), members=(), events=()):
+        with self._lock:
+            ahead = self.ahead[phase]
+            ahead.update(succeeded)
+            while self.created[phase] in ahead:
+                ahead.remove(self.created[phase])
+                self.created[phase] += 1
+            self.organizer_tokens.extend(organizers)
+            self.member_tokens.extend(members)
+            self.event_ids.extend(events)
+
+
+class BulkDataGenerator:
+    """Stream synthetic clubs, users, events and joins through the public API
+
+    Items are a pure function of (seed, phase, index), so an interrupted run
+    resumes from its state file by skipping created items. A bounded
+    queue between the producer and the worker threads provides backpressure.
+    """
+
+    def __init__(self, base_url, clubs, users, events, joins, concurrency=16, batch_size=50,
+                 state_path=None, seed=0, token_pool_size=5000, transport=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.counts = {"clubs": clubs, "users": users, "events": events, "joins": joins}
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.token_pool_size = token_pool_size
+        self.transport = transport or HTTPTransport(pool_size=concurrency)
+        self.state = GeneratorState.load_or_create(state_path, seed)
+        self.failures = 0
+        self._progress_lock = threading.Lock()
+        self._inserted = 0
+
+    # Item generation
+
+    def _rng(self, phase, index):
+        return random.Random(f"{self.state.seed}:{phase}:{index}")
+
+    def _account(self, phase, index):
+        rng = self._rng(phase, index)
+        kind = "club" if phase == "clubs" else "user"
+        city = _weighted(rng, CITY_WEIGHTS)
+        return {
+            "email": f"gen_{self.state.run_tag}_{kind}{index}@example.com",
+            "password": "genpass123",
+            "name": f"{'Club de Ajedrez' if kind == 'club' else 'Jugador'} {city} {index}",
+            "user_type": kind,
+            "skill_level": _weighted(rng, SKILL_WEIGHTS),
+            "city": city,
+        }
+
+    def _event(self, index):
+        rng = self._rng("events", index)
+        city = _weighted(rng, CITY_WEIGHTS)
+        week = rng.randrange(13)
+        day = self.state.start_date + timedelta(days=week * 7)
+        day += timedelta(days=(rng.choices(range(7), weights=WEEKDAY_WEIGHTS)[0] - day.weekday()) % 7)
+        event_type = _weighted(rng, EVENT_TYPE_WEIGHTS)
+        return {
+            "title": f"{'Torneo' if event_type == 'torneo' else 'Partidas'} en {city} #{index}",
+            "description": "Evento generado para pruebas de escala",
+            "city": city,
+            "address": f"Calle {rng.randint(1, 300)}",
+            "date": day.isoformat(),
+            "time": f"{rng.choice([10, 11, 12, 17, 18, 19, 20])}:{rng.choice(['00', '30'])}",
+            "event_type": event_type,
+            "skill_level": _weighted(rng, SKILL_WEIGHTS),
+            "max_seats": _weighted(rng, SEAT_WEIGHTS),
+        }
+
+    # API calls
+
+    def _headers(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def _register(self, account):
+        response = self.transport.post(f"{self.api_url}/auth/register", json=account)
+        if response.status_code == 400:
+            # Created before an interruption: log in to get a session instead
+            response = self.transport.post(f"{self.api_url}/auth/login",
+                                           json={"email": account["email"], "password": account["password"]})
+        if response.status_code != 200:
+            return None
+        return response.cookies.get("session_token")
+
+    def _run_batch(self, phase, indices):
+        for index in indices:
+            organizers, members, events = [], [], []
+            inserted = 1
+            try:
+                if phase in ("clubs", "users"):
+                    token = self._register(self._account(phase, index))
+                    if token is None:
+                        raise RuntimeError("registration failed")
+                    if phase == "clubs" or index < self.token_pool_size // 10:
+                        organizers.append(token)
+                    if phase == "users" and index < self.token_pool_size:
+                        members.append(token)
+                elif phase == "events":
+                    token = self._rng("organizer", index).choice(self.state.organizer_tokens)
+                    response = self.transport.post(f"{self.api_url}/events", json=self._event(index),
+                                                   headers=self._headers(token))
+                    if response.status_code != 200:
+                        raise RuntimeError(f"status {response.status_code}")
+                    events.append(response.json()["event_id"])
+                else:
+                    rng = self._rng("joins", index)
+                    response = self.transport.post(
+                        f"{self.api_url}/events/{rng.choice(self.state.event_ids)}/join",
+                        headers=self._headers(rng.choice(self.state.member_tokens)),
+                    )
+                    # 400 means full or already joined: expected with realistic seat counts
+                    if response.status_code not in (200, 400):
+                        raise RuntimeError(f"status {response.status_code}")
+                    inserted = int(response.status_code == 200)
+            except Exception:
+                with self._progress_lock:
+                    self.failures += 1
+                continue
+            # Per item, so an interruption mid-batch never forgets what this batch already created
+            self.state.complete_items(phase, [index], organizers, members, events)
+            with self._progress_lock:
+                self._inserted += inserted
+
+    # Orchestration
+
+    def _worker(self, work):
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            self._run_batch(*item)
+
+    def run_phase(self, phase, checkpoint_every=5.0):
+        total = self.counts[phase]
+        if not total:
+            return 0.0
+        if phase == "events" and not self.state.organizer_tokens:
+            print("⚠️ No organizers available, skipping events")
+            return 0.0
+        if phase == "joins" and not (self.state.event_ids and self.state.member_tokens):
+            print("⚠️ No events or members available, skipping joins")
+            return 0.0
+
+        indices = self.state.pending(phase, total)
+        pending = [(phase, indices[i:i + self.batch_size]) for i in range(0, len(indices), self.batch_size)]
+        skipped = total - len(indices)
+        print(f"\n🏗️ {phase}: {total} items, {len(indices)} to create in {len(pending)} batches"
+              + (f" ({skipped} already done, resuming)" if skipped else ""))
+
+        work = queue.Queue(maxsize=self.concurrency * 2)
+        workers = [threading.Thread(target=self._worker, args=(work,), daemon=True) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+
+        self._inserted = 0
+        start = last_report = time.perf_counter()
+        try:
+            for batch in pending:
+                # put() blocks while the workers are behind: backpressure on the producer
+                work.put(batch)
+                now = time.perf_counter()
+                if now - last_report >= checkpoint_every:
+                    self.state.save()
+                    print(f"  … {self._inserted} inserted, {self._inserted / (now - start):.0f}/s")
+                    last_report = now
+            for _ in workers:
+                work.put(None)
+            for worker in workers:
+                worker.join()
+        finally:
+            # Also on Ctrl-C: everything the workers finished so far is skipped on resume
+            self.state.save()
+
+        elapsed = time.perf_counter() - start
+        rate = self._inserted / elapsed if elapsed else 0.0
+        print(f"✅ {phase}: {self._inserted} inserted in {elapsed:.1f}s ({rate:.0f} inserts/s)")
+        return rate
+
+    def run(self):
+        print(f"🌱 Bulk data generation against {self.base_url} (run tag {self.state.run_tag})")
+        # Start from the same baseline data test_seed_data creates
+        self.transport.post(f"{self.api_url}/seed")
+        rates = {phase: self.run_phase(phase) for phase in PHASES}
+        if self.failures:
+            print(f"⚠️ {self.failures} items failed")
+        return rates
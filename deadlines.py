@@ -0,0 +1,72 @@
+import contextlib
+import contextvars
+import time
+
+# Innermost active deadline; a ContextVar so asyncio.to_thread test runs inherit the run budget
+_current = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """A point in time a piece of work must finish by, nested inside an optional parent
+
+    The effective remaining time is the smaller of this budget and every
+    enclosing one, so a per-test budget never outlives the run budget.
+    """
+
+    def __init__(self, seconds, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self):
+        own = self.expires_at - time.monotonic() if self.expires_at is not None else None
+        inherited = self.parent.remaining() if self.parent else None
+        if own is None:
+            return inherited
+        return own if inherited is None else min(own, inherited)
+
+    def limiting(self):
+        """Name of the budget in this chain with the least time left"""
+        best, best_left = self.name, None
+        deadline = self
+        while deadline:
+            if deadline.expires_at is not None:
+                left = deadline.expires_at - time.monotonic()
+                if best_left is None or left < best_left:
+                    best, best_left = deadline.name, left
+            deadline = deadline.parent
+        return best
+
+
+def current_deadline():
+    return _current.get()
+
+
+@contextlib.contextmanager
+def budget(seconds, name):
+    """Run the body under a deadline of `seconds` (None: only the enclosing budgets apply)"""
+    deadline = Deadline(seconds, name, _current.get())
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def request_timeout(default, minimum=0.05):
+    """(connect, read) timeout for the next request, capped by the remaining budget
+
+    Raises DeadlineExceeded instead of starting a request that has no time left.
+    """
+    deadline = _current.get()
+    remaining = deadline.remaining() if deadline else None
+    if remaining is None:
+        return default
+    if remaining <= minimum:
+        raise DeadlineExceeded(f"{deadline.limiting()} budget exhausted")
+    connect, read = default if isinstance(default, tuple) else (default, default)
+    return (min(connect, remaining), min(read, remaining))
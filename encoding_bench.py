@@ -0,0 +1,199 @@
+import gzip
+import json
+import statistics
+import time
+import uuid
+
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+ENCODINGS = ("identity", "gzip", "br", "zstd")
+# Content-Encoding -> decompressor the client has installed
+DECOMPRESSORS = {"identity": bytes, "gzip": gzip.decompress}
+if brotli is not None:
+    DECOMPRESSORS["br"] = brotli.decompress
+if zstandard is not None:
+    # decompressobj copes with frames that do not declare their content size
+    DECOMPRESSORS["zstd"] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+CLIENT_PACKAGES = {"br": "brotli", "zstd": "zstandard"}
+# Parser name -> loads(bytes); the stdlib one always comes first as the reference
+JSON_DECODERS = {"json": json.loads}
+if orjson is not None:
+    JSON_DECODERS["orjson"] = orjson.loads
+if ujson is not None:
+    JSON_DECODERS["ujson"] = ujson.loads
+
+
+class EncodingBenchmark:
+    """Split list-endpoint latency into wire transfer, decompression and JSON decoding
+
+    Each endpoint is fetched `repeats` times per Accept-Encoding; the raw
+    bytes on the wire are read undecoded so compressed size, transfer time
+    and client decompression are measured apart. The identity body is then
+    decoded with every JSON parser installed. A server that ignores an
+    encoding shows up as a different "served" value in the matrix.
+    """
+
+    def __init__(self, base_url, repeats=20, me_events=50, transport=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.repeats = repeats
+        self.me_events = me_events
+        self.transport = transport or HTTPTransport(retries=0)
+        self.token = None
+        # Endpoint -> {"items", "bytes", "encodings": {...}, "decoders": {...}}
+        self.results = {}
+
+    def cases(self):
+        yield "GET /api/events", "/events", False
+        yield "GET /api/clubs", "/clubs", False
+        yield "GET /api/me/events", "/me/events", True
+
+    def _login_bench_user(self):
+        response = self.transport.post(f"{self.api_url}/auth/register", json={
+            "email": f"encoding_{uuid.uuid4().hex[:10]}@example.com", "password": "benchpass",
+            "name": "Encoding Bench", "user_type": "user", "skill_level": "medio", "city": "Madrid"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Registering the bench user failed with status {response.status_code}")
+        self.token = response.cookies.get("session_token")
+
+    def _check_listings(self):
+        """Raise RuntimeError when the listings are empty (e.g. an unseeded stand-in): `[]` has nothing to compress"""
+        counts = {path: len(self.transport.get(f"{self.api_url}{path}").json()) for path in ("/events", "/clubs")}
+        if not any(counts.values()):
+            raise RuntimeError(f"{self.api_url} lists {counts['/events']} events and {counts['/clubs']} clubs "
+                               f"(seed it first)")
+
+    def _join_events(self):
+        """Give the bench user a /me/events list worth measuring"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        events = self.transport.get(f"{self.api_url}/events").json()
+        joined = 0
+        for event in events:
+            if joined >= self.me_events:
+                break
+            response = self.transport.post(f"{self.api_url}/events/{event['event_id']}/join", headers=headers)
+            joined += response.status_code == 200
+        return joined
+
+    def _fetch(self, path, encoding, headers):
+        """(served encoding, wire bytes, seconds until the last byte arrived)"""
+        start = time.perf_counter()
+        response = self.transport.get(f"{self.api_url}{path}", headers={**headers, "Accept-Encoding": encoding},
+                                      stream=True)
+        try:
+            wire = response.raw.read(decode_content=False)
+            elapsed = time.perf_counter() - start
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} answered {response.status_code}")
+            return response.headers.get("Content-Encoding", "identity").lower(), wire, elapsed
+        finally:
+            response.close()
+
+    def _time(self, fn, data):
+        samples = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            fn(data)
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
+
+    def _measure_encoding(self, path, encoding, headers):
+        if encoding not in DECOMPRESSORS:
+            return {"skipped": f"client lacks {CLIENT_PACKAGES[encoding]}"}
+        transfer = LatencyHistogram()
+        for _ in range(self.repeats):
+            served, wire, elapsed = self._fetch(path, encoding, headers)
+            transfer.record_seconds(elapsed)
+        if served not in DECOMPRESSORS:
+            return {"skipped": f"served {served}, client cannot decode it"}
+        body = DECOMPRESSORS[served](wire)
+        pcts = transfer.percentiles((50, 95))
+        return {"served": served, "wire_bytes": len(wire), "body_bytes": len(body), "body": body,
+                "transfer_p50_ms": pcts[50] / 1000, "transfer_p95_ms": pcts[95] / 1000,
+                "inflate_ms": self._time(DECOMPRESSORS[served], wire) * 1000 if served != "identity" else 0.0}
+
+    def _measure_decoders(self, body):
+        reference = json.loads(body)
+        decoders = {}
+        for name, loads in JSON_DECODERS.items():
+            if loads(body) != reference:
+                decoders[name] = {"skipped": "result differs from the stdlib parser"}
+                continue
+            seconds = self._time(loads, body)
+            decoders[name] = {"decode_ms": seconds * 1000, "mb_per_s": len(body) / seconds / 1e6 if seconds else 0.0}
+        return reference, decoders
+
+    def run(self):
+        print(f"🗜️ Encoding benchmark against {self.base_url}: {self.repeats} repeats per encoding, "
+              f"decoders {', '.join(JSON_DECODERS)}")
+        self._check_listings()
+        self._login_bench_user()
+        print(f"  bench user joined {self._join_events()} events for /me/events")
+        for endpoint, path, authenticated in self.cases():
+            headers = {"Authorization": f"Bearer {self.token}"} if authenticated else {}
+            encodings = {encoding: self._measure_encoding(path, encoding, headers) for encoding in ENCODINGS}
+            identity = encodings["identity"]
+            payload, decoders = self._measure_decoders(identity["body"])
+            for result in encodings.values():
+                result.pop("body", None)
+            # /me/events is an object of arrays ("joined", "organized")
+            items = (len(payload) if isinstance(payload, list)
+                     else sum(len(value) for value in payload.values() if isinstance(value, list)))
+            self.results[endpoint] = {"items": items, "bytes": identity["body_bytes"],
+                                      "encodings": encodings, "decoders": decoders}
+        return self.report()
+
+    def report(self):
+        """Print the per-endpoint matrix; returns {endpoint: (best encoding, best decoder)}"""
+        choices = {}
+        for endpoint, result in self.results.items():
+            decoders = {name: d for name, d in result["decoders"].items() if "skipped" not in d}
+            stdlib_ms = decoders["json"]["decode_ms"]
+            print(f"\n  {endpoint}: {result['items']} items, {result['bytes'] / 1024:.1f} KiB of JSON")
+            print(f"    {'encoding':<9} {'served':<9} {'wire KiB':>9} {'ratio':>6} {'xfer p50':>9} {'p95':>7} "
+                  f"{'inflate':>8} {'+json ms':>9}")
+            totals = {}
+            for encoding, row in result["encodings"].items():
+                if "skipped" in row:
+                    print(f"    {encoding:<9} ({row['skipped']})")
+                    continue
+                total = row["transfer_p50_ms"] + row["inflate_ms"] + stdlib_ms
+                if row["served"] == encoding:
+                    totals[encoding] = total
+                print(f"    {encoding:<9} {row['served']:<9} {row['wire_bytes'] / 1024:>9.1f} "
+                      f"{row['body_bytes'] / max(row['wire_bytes'], 1):>5.1f}x {row['transfer_p50_ms']:>9.2f} "
+                      f"{row['transfer_p95_ms']:>7.2f} {row['inflate_ms']:>8.2f} {total:>9.2f}")
+            print("    decode: " + ", ".join(
+                f"{name} {d['decode_ms']:.2f} ms ({d['mb_per_s']:.0f} MB/s)" if "skipped" not in d
+                else f"{name} ({d['skipped']})" for name, d in result["decoders"].items()))
+            best_encoding = min(totals, key=totals.get)
+            best_decoder = min(decoders, key=lambda name: decoders[name]["decode_ms"])
+            choices[endpoint] = (best_encoding, best_decoder)
+            saved = stdlib_ms - decoders[best_decoder]["decode_ms"]
+            # Identity is only missing from totals when the server answered it compressed anyway
+            versus = f" vs {totals['identity']:.2f} identity" if "identity" in totals else ""
+            print(f"    ➜ fastest end to end: {best_encoding} ({totals[best_encoding]:.2f} ms{versus}); "
+                  f"decoder {best_decoder}" + (f" saves {saved:.2f} ms over json" if best_decoder != "json" else ""))
+        return choices
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump({"base_url": self.base_url, "repeats": self.repeats, "endpoints": self.results}, f, indent=2)
@@ -0,0 +1,10 @@
+// Runs ../image_pipeline.py before `next dev` / `next build`. Without python3 the
+// page still builds: tsconfig's @image-manifest falls back to an empty manifest.
+import { spawnSync } from "node:child_process";
+
+const result = spawnSync("python3", ["../image_pipeline.py", "--if-available"], { stdio: "inherit" });
+if (result.error && result.error.code === "ENOENT") {
+  console.warn("⚠️ python3 not found: images are served unoptimized");
+  process.exit(0);
+}
+process.exit(result.status ?? 1);
@@ -9,10 +9,67 @@ import {
   ExternalLink, Mail, User, MapPinned, Lightbulb
 } from "lucide-react";
 import { config } from "@/config";
+// Written by image_pipeline.py before `next dev` / `next build` (see package.json);
+// resolves to an empty manifest until then (see tsconfig.json paths)
+import imageManifest from "@image-manifest";
 
 // Use config values
 const SURVEY_URL = config.surveyUrl;
 
+// ============ RESPONSIVE IMAGES ============
+type OptimizedImageEntry = {
+  type: string;
+  blurDataURL?: string;
+  srcSet: Record<string, string>;
+};
+
+const optimizedImages = imageManifest as Record<string, OptimizedImageEntry>;
+
+type ResponsiveImageProps = {
+  src: string;
+  alt: string;
+  sizes: string;
+  className?: string;
+  loading?: "eager" | "lazy";
+};
+
+// <picture> with the AVIF/WebP variants from the manifest; the plain <img> is the fallback.
+// The blurred thumbnail shows until the image loads, then goes (it would show through transparent icons);
+// the ref catches cached images that finished loading before hydration, when onLoad has already fired
+function ResponsiveImage({ src, alt, sizes, className, loading }: ResponsiveImageProps) {
+  const [loaded, setLoaded] = useState(false);
+  const entry = optimizedImages[src.replace(/^\.\//, "")];
+  if (!entry) {
+    return <img src={src} alt={alt} className={className} loading={loading} />;
+  }
+  const placeholder = !loaded && entry.blurDataURL
+    ? { backgroundImage: `url(${entry.blurDataURL})`, backgroundSize: "cover", backgroundPosition: "center" }
+    : undefined;
+  return (
+    <picture>
+      {Object.entries(entry.srcSet)
+        .filter(([type]) => type !== entry.type)
+        .map(([type, srcSet]) => (
+          <source key={type} type={type} srcSet={srcSet} sizes={sizes} />
+        ))}
+      <img
+        src={src}
+        srcSet={entry.srcSet[entry.type]}
+        sizes={sizes}
+        alt={alt}
+        className={className}
+        loading={loading}
+        decoding="async"
+        style={placeholder}
+        ref={(img) => {
+          if (img?.complete) setLoaded(true);
+        }}
+        onLoad={() => setLoaded(true)}
+      />
+    </picture>
+  );
+}
+
 export default function Home() {
   return (
     <main className="min-h-screen">
@@ -35,9 +92,10 @@ function Navbar() {
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
         <div className="flex items-center justify-between h-16">
           <a href="#" className="flex items-center">
-            <img 
+            <ResponsiveImage 
               src="./icon_brown.png"
               alt="Chess Events" 
+              sizes="40px"
               className="h-10 object-contain"
             />
           </a>
@@ -150,9 +208,10 @@ function HeroSection() {
             <div className="relative">
               {/* Main Image */}
               <div className="relative rounded-3xl overflow-hidden shadow-2xl">
-                <img 
+                <ResponsiveImage 
                   src="https://images.unsplash.com/photo-1529699211952-734e80c4d42b?w=800&q=80"
                   alt="Jugadores de ajedrez"
+                  sizes="(min-width: 1280px) 584px, 50vw"
                   className="w-full h-[500px] object-cover"
                 />
                 <div className="absolute inset-0 bg-gradient-to-t from-[#5c330a]/60 via-transparent to-transparent" />
@@ -440,10 +499,12 @@ function SCEPointsSection() {
             className="relative"
           >
             <div className="relative rounded-3xl overflow-hidden">
-              <img 
+              <ResponsiveImage 
                 src="https://images.unsplash.com/photo-1559925393-8be0ec4767c8?w=800&q=80"
                 alt="Café con ajedrez"
+                sizes="(min-width: 1280px) 584px, (min-width: 1024px) 50vw, 100vw"
                 className="w-full h-[400px] object-cover"
+                loading="lazy"
               />
               <div className="absolute inset-0 bg-gradient-to-t from-[#5c330a] via-transparent to-transparent" />
             </div>
@@ -549,6 +610,23 @@ function BetaSignupSection() {
     setErrorMsg("");
 
     try {
+      if (config.signupRelayUrl) {
+        // The relay answers with a real status, unlike the no-cors Google Forms post
+        const response = await fetch(`${config.signupRelayUrl}/signup`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify(formData),
+        });
+        if (!response.ok) {
+          throw new Error(`Signup relay answered ${response.status}`);
+        }
+        setStatus("success");
+        setFormData({ name: "", city: "", email: "" });
+        return;
+      }
+
       // Submit to Google Forms
       const googleFormUrl = config.googleFormUrl;
       const entries = config.googleFormEntries;
@@ -711,10 +789,12 @@ function Footer() {
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
         <div className="flex flex-col md:flex-row items-center justify-between gap-6">
           <div className="flex items-center gap-3">
-            <img 
+            <ResponsiveImage 
               src="./icon_white.png" 
               alt="Chess Events" 
+              sizes="40px"
               className="h-10 brightness-0 invert"
+              loading="lazy"
             />
           </div>
 
@@ -18,6 +18,11 @@ export const config = {
     city: "entry.1065046570",      // Ciudad (optional)
   },
 
+  // Signup relay (signup_relay.py). When set, the beta form posts here instead of
+  // straight to Google Forms: the relay queues signups durably and delivers them
+  // with retries, and it returns a real status the page can show
+  signupRelayUrl: process.env.NEXT_PUBLIC_SIGNUP_RELAY_URL || "",
+
   // Google Forms Survey URL (original survey)
   surveyUrl: "https://docs.google.com/forms/d/e/1FAIpQLSeQFsCSq0LHRU47WYyAxKZjKn6UHFWJ8_cXQNDjMMa7bYhRKw/viewform?usp=dialog",
 
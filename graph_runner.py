@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+
+class DependencyGraphRunner:
+    """Run blocking test callables as a dependency graph on one event loop
+
+    `graph` maps each test name to the names it must wait for. Independent
+    branches run concurrently (each blocking call is moved to a worker
+    thread), bounded by `max_concurrency`.
+    """
+
+    def __init__(self, graph, max_concurrency=4):
+        self.graph = graph
+        self.max_concurrency = max(1, max_concurrency)
+        self.durations = {}
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.graph.get(name, ()):
+                if dep not in self.graph:
+                    raise ValueError(f"{name} depends on unknown test {dep}")
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.graph:
+            visit(name, [])
+
+    def critical_path(self):
+        """Longest chain of measured durations through the graph, in seconds"""
+        memo = {}
+
+        def finish(name):
+            if name not in memo:
+                deps = self.graph.get(name, ())
+                memo[name] = self.durations.get(name, 0.0) + max((finish(d) for d in deps), default=0.0)
+            return memo[name]
+
+        return max((finish(name) for name in self.graph), default=0.0)
+
+    async def run(self, callables, on_error=None):
+        """Run every callable once all of its dependencies have finished
+
+        Dependents still run when a dependency fails, like the sequential
+        runner; the tests themselves check for missing session state.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = {}
+        results = {}
+
+        async def run_one(name):
+            for dep in self.graph.get(name, ()):
+                await tasks[dep]
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    results[name] = await asyncio.to_thread(callables[name])
+                except Exception as e:
+                    results[name] = False
+                    if on_error:
+                        on_error(name, e)
+                finally:
+                    self.durations[name] = time.perf_counter() - start
+
+        for name in self.graph:
+            tasks[name] = asyncio.ensure_future(run_one(name))
+        await asyncio.gather(*tasks.values())
+        return results
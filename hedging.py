@@ -0,0 +1,157 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from http_transport import HTTPTransport, endpoint_key, on_behalf_of, origin_thread
+from latency_histogram import LatencyHistogram
+
+# Read-only endpoints where a duplicate request is harmless
+HEDGEABLE_ENDPOINTS = frozenset([
+    "GET /api/events",
+    "GET /api/clubs",
+    "GET /api/users/{id}",
+    "GET /api/chess/lookup/chess_com/{username}",
+    "GET /api/chess/lookup/lichess/{username}",
+])
+
+
+class HedgingPolicy:
+    """Send a second copy of a slow idempotent GET and keep whichever answers first
+
+    The hedge fires once the first attempt has taken longer than the
+    endpoint's observed `percentile` latency (needs `min_samples` first).
+    When the hedge wins, the first attempt is still timed to completion so
+    the report can show the tail latency it would have cost. Only the first
+    attempt reaches the transport's observers, so recorders count each
+    caller request once. Size `concurrency` to the callers sharing the
+    transport: both attempts of every caller need a pool thread, and
+    waiting for one would inflate the latencies the hedge delay is set from.
+    """
+
+    def __init__(self, transport, percentile=95, min_samples=20, concurrency=8, endpoints=HEDGEABLE_ENDPOINTS):
+        self.transport = transport
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.endpoints = endpoints
+        self.observed = {}
+        # What callers saw vs. what the first attempt alone took
+        self.effective = LatencyHistogram()
+        self.unhedged = LatencyHistogram()
+        self.counters = {"requests": 0, "fired": 0, "won": 0}
+        self.saved = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=2 * concurrency, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+
+    def applies(self, method, url):
+        return method.upper() == "GET" and endpoint_key(method, url, query=False) in self.endpoints
+
+    def _delay(self, endpoint):
+        histogram = self.observed.get(endpoint)
+        if histogram is None or histogram.total_count < self.min_samples:
+            return None
+        return histogram.value_at_percentile(self.percentile) / 1_000_000
+
+    def _attempt(self, url, kwargs):
+        start = time.perf_counter()
+        response = self.transport.request("GET", url, **kwargs)
+        return response, time.perf_counter() - start
+
+    def _submit(self, url, kwargs, origin, observed=True):
+        # Attempts run on pool threads; carry the caller's deadline budget along, and its thread
+        # identity so result logs and traces attribute the attempt to the calling test
+        return self._executor.submit(on_behalf_of(origin, observed).run, self._attempt, url, kwargs)
+
+    def prime(self, recorder):
+        """Seed the per-endpoint latencies from a saved run (e.g. a baseline); returns endpoints primed"""
+        primed = set()
+        with self._lock:
+            for endpoint, histogram in recorder.by_endpoint().items():
+                endpoint = endpoint.split("?")[0]
+                if endpoint in self.endpoints:
+                    self.observed.setdefault(endpoint, LatencyHistogram()).merge(histogram)
+                    primed.add(endpoint)
+        return len(primed)
+
+    def warm_up(self, urls, rounds=None):
+        """Time `rounds` GETs of each URL on a private transport, so hedging can fire from the first test"""
+        rounds = rounds or self.min_samples
+        transport = HTTPTransport(pool_size=1, retries=0)
+        try:
+            for url in urls:
+                endpoint = endpoint_key("GET", url, query=False)
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    transport.get(url).content
+                    with self._lock:
+                        self.observed.setdefault(endpoint, LatencyHistogram()).record_seconds(
+                            time.perf_counter() - start)
+        finally:
+            transport.close()
+
+    def get(self, url, **kwargs):
+        endpoint = endpoint_key("GET", url, query=False)
+        with self._lock:
+            delay = self._delay(endpoint)
+        start = time.perf_counter()
+        if delay is None:
+            response, elapsed = self._attempt(url, kwargs)
+            self._observe(endpoint, elapsed, elapsed)
+            return response
+
+        origin = origin_thread()
+        primary = self._submit(url, kwargs, origin)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            response, elapsed = primary.result()
+            self._observe(endpoint, elapsed, elapsed)
+            return response
+
+        hedge = self._submit(url, kwargs, origin, observed=False)
+        with self._lock:
+            self.counters["fired"] += 1
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done and not primary.exception() else hedge
+        if winner is hedge and hedge.exception():
+            # Both attempts failed: surface the first attempt's error
+            winner = primary
+        response, _ = winner.result()
+        effective = time.perf_counter() - start
+        loser = hedge if winner is primary else primary
+
+        def settle(future):
+            if not future.exception():
+                future.result()[0].close()
+            if winner is hedge:
+                # The first attempt finished eventually: that is the latency hedging avoided
+                unhedged = future.result()[1] if not future.exception() else effective
+                with self._lock:
+                    self.counters["won"] += 1
+                    self.saved += max(0.0, unhedged - effective)
+                self._observe(endpoint, unhedged, effective)
+            else:
+                self._observe(endpoint, effective, effective)
+
+        loser.add_done_callback(settle)
+        return response
+
+    def _observe(self, endpoint, unhedged, effective):
+        with self._lock:
+            self.counters["requests"] += 1
+            self.observed.setdefault(endpoint, LatencyHistogram()).record_seconds(unhedged)
+            self.unhedged.record_seconds(unhedged)
+            self.effective.record_seconds(effective)
+
+    def report(self):
+        counters = self.counters
+        if not counters["requests"]:
+            return
+        print(f"\n🪝 Hedging (after p{self.percentile:g}): fired on {counters['fired']}/{counters['requests']} "
+              f"GETs, hedge answered first {counters['won']} times, {self.saved * 1000:.1f} ms saved in total")
+        unhedged = self.unhedged.percentiles((95, 99))
+        effective = self.effective.percentiles((95, 99))
+        print(f"  p95 {unhedged[95] / 1000:.1f} -> {effective[95] / 1000:.1f} ms, "
+              f"p99 {unhedged[99] / 1000:.1f} -> {effective[99] / 1000:.1f} ms, "
+              f"max {self.unhedged.max_value / 1000:.1f} -> {self.effective.max_value / 1000:.1f} ms")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
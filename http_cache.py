@@ -0,0 +1,205 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from requests.adapters import BaseAdapter
+
+from cassette import DROPPED_RESPONSE_HEADERS, build_response
+from http_transport import endpoint_key
+
+# Read endpoints the cacheability audit reports on, even when never cacheable
+AUDITED_ENDPOINTS = (
+    "GET /api/events",
+    "GET /api/events/{id}",
+    "GET /api/clubs",
+    "GET /api/clubs/{id}",
+    "GET /api/users/{id}",
+    "GET /api/chess/lookup/chess_com/{username}",
+    "GET /api/chess/lookup/lichess/{username}",
+)
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-)?max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+class CacheEntry:
+    def __init__(self, status, reason, headers, body, expires_at, etag, last_modified):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class EndpointAudit:
+    """What one endpoint's responses allow a client cache to do, and what caching saved"""
+
+    def __init__(self):
+        self.requests = 0
+        self.fetched = 0
+        self.with_etag = 0
+        self.with_last_modified = 0
+        self.cache_control = set()
+        self.hits = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.fetch_time = 0.0
+        self.revalidation_time = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, cache_control=None, **counts):
+        with self._lock:
+            for name, amount in counts.items():
+                setattr(self, name, getattr(self, name) + amount)
+            if cache_control:
+                self.cache_control.add(cache_control)
+
+    def mean_fetch(self):
+        return self.fetch_time / self.fetched if self.fetched else 0.0
+
+    def latency_saved(self):
+        """Estimate: a hit saves a full fetch; a 304 saves a full fetch minus the revalidation round trip"""
+        return self.mean_fetch() * (self.hits + self.not_modified) - self.revalidation_time
+
+
+class HTTPCache:
+    """LRU cache of GET responses keyed by URL and credentials, with TTL and a memory cap
+
+    Freshness comes from Cache-Control max-age, else `default_ttl` (0 by
+    default: a virtual user must see its own joins and new events, so a
+    response that claims no freshness is revalidated every time);
+    `no-store` responses are never kept and `no-cache` ones are always
+    revalidated. Stale entries with an ETag or Last-Modified are
+    revalidated with If-None-Match/If-Modified-Since instead of refetched.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entries=10_000, default_ttl=0.0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+        self.audit = {endpoint: EndpointAudit() for endpoint in AUDITED_ENDPOINTS}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request):
+        # Responses can depend on who asks: keep one user's /me/events away from another
+        credentials = request.headers.get("Authorization") or request.headers.get("Cookie") or ""
+        return request.url, hashlib.sha1(credentials.encode()).hexdigest() if credentials else ""
+
+    def lookup(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def store(self, key, entry):
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.body)
+            if len(entry.body) > self.max_bytes:
+                return
+            self.entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes or len(self.entries) > self.max_entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted.body)
+                self.evictions += 1
+
+    def ttl_for(self, headers):
+        """Seconds a response stays fresh, or None if it must not be stored"""
+        cache_control = headers.get("Cache-Control", "")
+        directives = cache_control.lower()
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0.0
+        match = _MAX_AGE.search(cache_control)
+        return float(match.group(1)) if match else self.default_ttl
+
+    def endpoint_audit(self, endpoint):
+        with self._lock:
+            return self.audit.setdefault(endpoint, EndpointAudit())
+
+    def report(self):
+        print(f"\n🗃️ HTTP cache: {len(self.entries)} entries, {self.size / 1024:.1f} KiB "
+              f"(cap {self.max_bytes / 1024 / 1024:.0f} MiB), {self.evictions} evicted")
+        print(f"  {'endpoint':<44} {'reqs':>5} {'ETag':>5} {'LastMod':>7} {'hit%':>6} {'304%':>6} "
+              f"{'KiB saved':>9} {'ms saved':>9}  Cache-Control")
+        for endpoint, audit in sorted(self.audit.items()):
+            if not audit.requests:
+                print(f"  {endpoint:<44} {'-':>5}  (not exercised)")
+                continue
+            etag = f"{audit.with_etag / audit.fetched * 100:.0f}%" if audit.fetched else "-"
+            last_modified = f"{audit.with_last_modified / audit.fetched * 100:.0f}%" if audit.fetched else "-"
+            not_modified = (f"{audit.not_modified / audit.revalidations * 100:.0f}"
+                            if audit.revalidations else "-")
+            print(f"  {endpoint:<44} {audit.requests:>5} {etag:>5} {last_modified:>7} "
+                  f"{audit.hits / audit.requests * 100:>6.1f} {not_modified:>6} "
+                  f"{audit.bytes_saved / 1024:>9.1f} {audit.latency_saved() * 1000:>9.1f}  "
+                  f"{', '.join(sorted(audit.cache_control)) or 'none'}")
+
+
+class CachingAdapter(BaseAdapter):
+    """Adapter that answers GETs from an HTTPCache and revalidates stale entries through `inner`"""
+
+    def __init__(self, inner, cache):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return self.inner.send(request, **kwargs)
+        audit = self.cache.endpoint_audit(endpoint_key(request.method, request.url))
+        key = self.cache.key(request)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            audit.add(requests=1, hits=1, bytes_saved=len(entry.body))
+            response = build_response(self, request, entry.status, entry.reason, entry.headers, entry.body, 0.0)
+            # Never left the process: the transport keeps it out of its latency observers
+            response.from_cache = True
+            return response
+
+        revalidating = entry is not None and (entry.etag or entry.last_modified)
+        if revalidating:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        if revalidating and response.status_code == 304:
+            audit.add(requests=1, revalidations=1, not_modified=1, bytes_saved=len(entry.body),
+                      revalidation_time=time.perf_counter() - start)
+            ttl = self.cache.ttl_for(response.headers)
+            entry.expires_at = time.monotonic() + (ttl or 0.0)
+            return build_response(self, request, entry.status, entry.reason, entry.headers, entry.body,
+                                  response.elapsed.total_seconds())
+        body = response.content
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200:
+            audit.add(requests=1, revalidations=int(bool(revalidating)))
+            return response
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        audit.add(response.headers.get("Cache-Control"), requests=1, revalidations=int(bool(revalidating)),
+                  fetched=1, fetch_time=elapsed, with_etag=int(bool(etag)),
+                  with_last_modified=int(bool(last_modified)))
+        ttl = self.cache.ttl_for(response.headers)
+        if ttl is not None:
+            headers = [(k, v) for k, v in response.headers.items()
+                       if k.lower() not in DROPPED_RESPONSE_HEADERS and k.lower() != "set-cookie"]
+            self.cache.store(key, CacheEntry(200, response.reason, headers, body, time.monotonic() + ttl,
+                                             etag, last_modified))
+        return response
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,375 @@
+import contextvars
+import re
+import socket
+import sys
+from http.cookiejar import DefaultCookiePolicy
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import _set_socket_options, allowed_gai_family
+from urllib3.util.retry import Retry
+from urllib3.util.timeout import _DEFAULT_TIMEOUT
+
+from deadlines import current_deadline, request_timeout
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+# Path templates used to group requests per endpoint, most specific first
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/api/events/(?!\{)[^/]+/join$"), "/api/events/{id}/join"),
+    (re.compile(r"^/api/events/(?!\{)[^/]+$"), "/api/events/{id}"),
+    (re.compile(r"^/api/clubs/(?!\{)[^/]+$"), "/api/clubs/{id}"),
+    (re.compile(r"^/api/users/(?!me$)[^/]+$"), "/api/users/{id}"),
+    (re.compile(r"^/api/chess/lookup/([^/]+)/[^/]+$"), r"/api/chess/lookup/\1/{username}"),
+]
+
+
+# (ident, name) of the thread a request is made for; hedged attempts run on pool threads on behalf of their caller
+_origin_thread = contextvars.ContextVar("origin_thread", default=None)
+# False for duplicate attempts (hedges) that observers must not count as a caller request of their own
+_observed = contextvars.ContextVar("observed", default=True)
+
+
+def origin_thread():
+    """(ident, name) of the thread the current request belongs to: the caller's, even on a hedge thread"""
+    return _origin_thread.get() or (threading.get_ident(), threading.current_thread().name)
+
+
+def on_behalf_of(origin, observed=True):
+    """A copy of the current context whose requests are attributed to `origin` (see origin_thread)
+
+    With observed=False its requests still go out and count in the
+    connection stats, but latency and record observers never see them.
+    """
+    context = contextvars.copy_context()
+    context.run(_origin_thread.set, origin)
+    context.run(_observed.set, observed)
+    return context
+
+
+def endpoint_key(method, url, query=True):
+    """Group a concrete request URL under its endpoint template, e.g. GET /api/events/{id}
+
+    Query parameter names (not values) stay in the key, so each filter gets
+    its own group: GET /api/events?city. Pass query=False to pool them.
+    """
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            path = pattern.sub(template, path)
+            break
+    key = f"{method.upper()} {path}"
+    names = sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)}) if query else ()
+    return f"{key}?{'&'.join(names)}" if names else key
+
+
+class DeadlineRetry(Retry):
+    """Retry whose backoff and Retry-After sleeps never outlast the innermost deadline budget"""
+
+    def _capped(self, seconds):
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline else None
+        return seconds if remaining is None else max(0.0, min(seconds, remaining))
+
+    def get_backoff_time(self):
+        return self._capped(super().get_backoff_time())
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else self._capped(retry_after)
+
+
+class ConnectionStats:
+    """Thread-safe counters for connection setup vs reuse"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.handshake_time = 0.0
+
+    def record_request(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def record_connect(self, seconds):
+        with self._lock:
+            self.new_connections += 1
+            self.handshake_time += seconds
+
+    def record_reuse(self):
+        with self._lock:
+            self.reused_connections += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests_sent,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "handshake_time_s": round(self.handshake_time, 6),
+                "avg_handshake_ms": round(self.handshake_time / self.new_connections * 1000, 3)
+                if self.new_connections else 0.0,
+            }
+
+
+# Connection setup phases of the request currently being sent on this thread
+_phase_timings = threading.local()
+
+
+def _timed_new_conn(conn):
+    """Open the socket like urllib3's _new_conn, timing DNS resolution apart from the TCP connect
+
+    One getaddrinfo() call resolves the host; the connect then walks the
+    returned addresses in order, as urllib3's create_connection does, so
+    the fallback across addresses is kept and no second lookup is made.
+    """
+    host = conn._dns_host[1:-1] if conn._dns_host.startswith("[") else conn._dns_host
+    start = time.perf_counter()
+    try:
+        addresses = socket.getaddrinfo(host, conn.port, allowed_gai_family(), socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise NameResolutionError(conn.host, conn, e) from e
+    resolved = time.perf_counter()
+    error = OSError("getaddrinfo returns an empty list")
+    for family, socktype, proto, _, address in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            _set_socket_options(sock, conn.socket_options)
+            if conn.timeout is not _DEFAULT_TIMEOUT:
+                sock.settimeout(conn.timeout)
+            if conn.source_address:
+                sock.bind(conn.source_address)
+            sock.connect(address)
+            break
+        except OSError as e:
+            error = e
+            sock.close()
+    else:
+        if isinstance(error, socket.timeout):
+            raise ConnectTimeoutError(
+                conn, f"Connection to {conn.host} timed out. (connect timeout={conn.timeout})") from error
+        raise NewConnectionError(conn, f"Failed to establish a new connection: {error}") from error
+    timings = getattr(_phase_timings, "current", None)
+    if timings is not None:
+        timings["dns"] = resolved - start
+        timings["connect"] = time.perf_counter() - resolved
+    sys.audit("http.client.connect", conn, conn.host, conn.port)
+    return sock
+
+
+def _timed_connect(connect, stats, tls):
+    start = time.perf_counter()
+    connect()
+    elapsed = time.perf_counter() - start
+    stats.record_connect(elapsed)
+    timings = getattr(_phase_timings, "current", None)
+    if timings is not None and tls:
+        # Whatever connect() spent beyond DNS + TCP is the TLS handshake
+        timings["tls"] = max(0.0, elapsed - timings.get("dns", 0.0) - timings.get("connect", 0.0))
+
+
+def _checked_out(conn, stats):
+    """Count a pool checkout as reuse when it hands back a still-open socket (dropped ones come back closed)"""
+    if getattr(conn, "sock", None) is not None:
+        stats.record_reuse()
+    return conn
+
+
+def _counting_pool_classes(stats):
+    """Build connection pool classes whose connections report setup time to stats"""
+
+    class CountingHTTPConnection(HTTPConnection):
+        def _new_conn(self):
+            return _timed_new_conn(self)
+
+        def connect(self):
+            _timed_connect(super().connect, stats, tls=False)
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def _new_conn(self):
+            return _timed_new_conn(self)
+
+        def connect(self):
+            _timed_connect(super().connect, stats, tls=True)
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+        def _get_conn(self, timeout=None):
+            return _checked_out(super()._get_conn(timeout), stats)
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+        def _get_conn(self, timeout=None):
+            return _checked_out(super()._get_conn(timeout), stats)
+
+    return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools count new connections and handshake time"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.stats)
+
+
+class HTTPTransport:
+    """Pooled, keep-alive HTTP transport shared by every tester call"""
+
+    def __init__(self, pool_size=10, connect_timeout=5.0, read_timeout=30.0, retries=2, backoff_factor=0.2):
+        self.timeout = (connect_timeout, read_timeout)
+        self.stats = ConnectionStats()
+        self.before_observers = []
+        self.observers = []
+        self.record_observers = []
+        # Optional HedgingPolicy; get() routes the GETs it applies to through it
+        self.hedging = None
+        self.session = requests.Session()
+        # Callers authenticate explicitly; a shared jar would leak one virtual user's session into the next
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        # Only idempotent methods are retried; POST /join or /register must never be replayed
+        retry = DeadlineRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        self.adapter = CountingHTTPAdapter(
+            self.stats,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.mount_adapter(self.adapter)
+
+    def mount_adapter(self, adapter):
+        """Route both schemes through `adapter` (e.g. a cassette recorder wrapping self.adapter)"""
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def add_before_observer(self, observer):
+        """Register observer(method, url, kwargs) called just before every request is sent"""
+        self.before_observers.append(observer)
+
+    def add_observer(self, observer):
+        """Register observer(method, url, status, elapsed_s, error) called after every request"""
+        self.observers.append(observer)
+
+    def add_record_observer(self, observer):
+        """Register observer(record) called with the timing breakdown of every request"""
+        self.record_observers.append(observer)
+
+    def request(self, method, url, **kwargs):
+        # Never wait longer than the innermost deadline budget allows
+        kwargs["timeout"] = request_timeout(kwargs.get("timeout", self.timeout))
+        for observer in self.before_observers:
+            observer(method, url, kwargs)
+        # Observers see the URL as sent, so params= filters group like inline query strings
+        observed_url = requests.Request(method, url, params=kwargs["params"]).prepare().url \
+            if kwargs.get("params") else url
+        self.stats.record_request()
+        timings = _phase_timings.current = {}
+        started_at = time.time()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            self._notify(method, observed_url, None, time.perf_counter() - start, e)
+            self._notify_record(method, observed_url, started_at, time.perf_counter() - start, timings, None, e,
+                                False)
+            raise
+        finally:
+            _phase_timings.current = None
+        elapsed = time.perf_counter() - start
+        if getattr(response, "from_cache", False):
+            # A local cache hit (see http_cache) says nothing about the API's latency
+            return response
+        self._notify(method, observed_url, response.status_code, elapsed, None)
+        self._notify_record(method, observed_url, started_at, elapsed, timings, response, None,
+                            kwargs.get("stream", False))
+        return response
+
+    def _notify(self, method, url, status, elapsed, error):
+        if not _observed.get():
+            return
+        for observer in self.observers:
+            observer(method, url, status, elapsed, error)
+
+    def _notify_record(self, method, url, started_at, elapsed, timings, response, error, streamed):
+        if not self.record_observers or not _observed.get():
+            return
+        record = {
+            "method": method.upper(),
+            "url": url,
+            "endpoint": endpoint_key(method, url),
+            "started_at": started_at,
+            "status": None,
+            "reused_connection": "connect" not in timings,
+            "dns_ms": round(timings.get("dns", 0.0) * 1000, 3),
+            "connect_ms": round(timings.get("connect", 0.0) * 1000, 3),
+            "tls_ms": round(timings.get("tls", 0.0) * 1000, 3),
+            "ttfb_ms": None,
+            "total_ms": round(elapsed * 1000, 3),
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "error": repr(error) if error else None,
+        }
+        if response is not None:
+            body = response.request.body
+            record["status"] = response.status_code
+            # requests stops its clock once the response headers are parsed
+            record["ttfb_ms"] = round(response.elapsed.total_seconds() * 1000, 3)
+            record["request_bytes"] = len(body) if body else 0
+            if streamed:
+                record["response_bytes"] = int(response.headers.get("Content-Length", 0) or 0)
+            else:
+                record["response_bytes"] = len(response.content or b"")
+        for observer in self.record_observers:
+            observer(record)
+
+    def get(self, url, **kwargs):
+        if self.hedging is not None and self.hedging.applies("GET", url):
+            return self.hedging.get(url, **kwargs)
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        if self.hedging is not None:
+            self.hedging.close()
+        self.session.close()
+
+    def print_stats(self):
+        stats = self.stats.snapshot()
+        print(f"🔌 Connections: {stats['new_connections']} new, {stats['reused_connections']} reused "
+              f"over {stats['requests']} requests")
+        print(f"🤝 Handshake time: {stats['handshake_time_s'] * 1000:.1f} ms total, "
+              f"{stats['avg_handshake_ms']:.1f} ms avg per new connection")
@@ -0,0 +1,335 @@
+"""Build-time image optimization for frontend/public
+
+    python image_pipeline.py [--remote URL ...] [--display icon_brown.png=80] [--if-available]
+
+Every PNG/JPEG under frontend/public, every remote image URL a component
+under frontend/src sets as a `src`, and any --remote image is resized to
+the responsive widths below its own width and encoded as AVIF (when the
+installed Pillow can write it), WebP and an optimized copy of the original
+format. A tiny WebP blur placeholder, shown until the image loads, is
+inlined as a data URL. Results go to frontend/public/_optimized with a
+manifest.json that page.tsx imports for its <picture> srcSets;
+`npm run dev` and `npm run build` run this first. Unchanged sources are skipped on rebuild through a
+content-hash cache. Needs Pillow (`pip install Pillow`; AVIF needs
+Pillow >= 11.3 or the pillow-avif-plugin package); with --if-available a
+missing Pillow only writes an empty manifest, so the page serves the
+original images.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+try:
+    # Registers the AVIF encoder on Pillow releases without built-in support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+PUBLIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "public")
+SOURCE_DIR = os.path.join(os.path.dirname(PUBLIC_DIR), "src")
+# A literal remote image URL given as a JSX src attribute
+REMOTE_SRC_PATTERN = re.compile(r"""\bsrc=["'](https?://[^"']+)["']""")
+OUTPUT_SUBDIR = "_optimized"
+SOURCE_EXTENSIONS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+# next/image's default imageSizes + deviceSizes, up to full-HD
+DEFAULT_WIDTHS = (16, 32, 48, 64, 96, 128, 256, 384, 640, 750, 828, 1080, 1200, 1920)
+# 414 CSS px at 2x: what a typical phone fetches for a full-width image
+DEFAULT_MOBILE_WIDTH = 828
+BLUR_SIZE = 16
+MIME_TYPES = {"AVIF": "image/avif", "WEBP": "image/webp", "PNG": "image/png", "JPEG": "image/jpeg"}
+EXTENSIONS = {"AVIF": "avif", "WEBP": "webp", "PNG": "png", "JPEG": "jpg"}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def modern_formats():
+    """AVIF and WebP, as far as the installed Pillow can write them"""
+    Image.init()
+    return [name for name in ("AVIF", "WEBP") if name in Image.SAVE]
+
+
+def output_formats(source_format):
+    """Encodings to produce, smallest-expected first; the source format stays as the <img> fallback"""
+    return modern_formats() + [source_format]
+
+
+def referenced_remote_urls(source_dir=SOURCE_DIR):
+    """Remote image URLs the frontend sources use as a literal src, in first-seen order"""
+    urls = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if d != "node_modules")
+        for name in sorted(files):
+            if name.endswith((".tsx", ".jsx")):
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    urls.extend(url for url in REMOTE_SRC_PATTERN.findall(f.read()) if url not in urls)
+    return urls
+
+
+def encode(image, image_format, quality):
+    buffer = io.BytesIO()
+    if image_format == "AVIF":
+        image.save(buffer, "AVIF", quality=max(quality - 20, 30), speed=6)
+    elif image_format == "WEBP":
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    elif image_format == "JPEG":
+        image.convert("RGB").save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def blur_data_url(image):
+    thumb = image.copy()
+    thumb.thumbnail((BLUR_SIZE, BLUR_SIZE))
+    return f"data:image/webp;base64,{base64.b64encode(encode(thumb, 'WEBP', 40)).decode()}"
+
+
+class ImagePipeline:
+    """Turn source images into responsive variants plus a manifest, skipping unchanged sources
+
+    The cache (`.cache.json` next to the manifest) maps each source to the
+    hash of its bytes and of the settings it was built with; variant file
+    names carry the content hash, so they can be served as immutable.
+    """
+
+    def __init__(self, public_dir=PUBLIC_DIR, widths=DEFAULT_WIDTHS, quality=75, mobile_width=DEFAULT_MOBILE_WIDTH,
+                 display_widths=None, remote_urls=(), jobs=4, source_dir=SOURCE_DIR):
+        self.public_dir = public_dir
+        self.output_dir = os.path.join(public_dir, OUTPUT_SUBDIR)
+        self.widths = sorted(set(widths))
+        self.quality = quality
+        self.mobile_width = mobile_width
+        # Source name -> rendered width in device pixels, where known
+        self.display_widths = display_widths or {}
+        referenced = referenced_remote_urls(source_dir) if source_dir and os.path.isdir(source_dir) else []
+        self.remote_urls = referenced + [url for url in remote_urls if url not in referenced]
+        self.jobs = jobs
+        self.cache_path = os.path.join(self.output_dir, ".cache.json")
+        self.manifest_path = os.path.join(self.output_dir, "manifest.json")
+        # Set in run(): covers the encoders Pillow offers, so AVIF support appearing later rebuilds everything
+        self.settings = None
+        self.cache = {}
+        self.counters = {"built": 0, "cached": 0, "failed": 0}
+
+    def sources(self):
+        """(manifest key, bytes, format) for every local and remote image
+
+        A remote image already built with the current settings is not
+        fetched again (bytes None); one that cannot be fetched is skipped
+        with a warning, and the page keeps loading it from its origin.
+        """
+        for root, dirs, files in os.walk(self.public_dir):
+            dirs[:] = sorted(d for d in dirs if d != OUTPUT_SUBDIR)
+            for name in sorted(files):
+                image_format = SOURCE_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+                if image_format:
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, self.public_dir).replace(os.sep, "/"), f.read(), image_format
+        for url in self.remote_urls:
+            if self._cached(url, self.cache.get(url, {}).get("hash")) is not None:
+                yield url, None, None
+                continue
+            try:
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                print(f"⚠️ {url}: {e}")
+                self.counters["failed"] += 1
+                continue
+            extension = mimetypes.guess_extension(response.headers.get("Content-Type", "").split(";")[0]) or ""
+            yield url, response.content, SOURCE_EXTENSIONS.get(extension, "JPEG")
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cached(self, key, digest):
+        entry = self.cache.get(key)
+        if not entry or entry["hash"] != digest or entry["settings"] != self.settings:
+            return None
+        files = [variant["src"] for variants in entry["manifest"]["sources"].values() for variant in variants]
+        if not all(os.path.exists(os.path.join(self.public_dir, src.lstrip("/"))) for src in files):
+            return None
+        return entry["manifest"]
+
+    def _stem(self, key, digest):
+        base = os.path.splitext(os.path.basename(key.split("?")[0]))[0] or "image"
+        return f"{base}.{digest[:8]}"
+
+    def build(self, key, data, source_format):
+        """Write every variant of one source; returns its manifest entry"""
+        digest = content_hash(data)
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        width, height = image.size
+        widths = [w for w in self.widths if w < width] + [width]
+        stem = self._stem(key, digest)
+        sources = {}
+        for target in widths:
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS)
+            for image_format in output_formats(source_format):
+                encoded = encode(resized, image_format, self.quality)
+                name = f"{stem}.{target}.{EXTENSIONS[image_format]}"
+                with open(os.path.join(self.output_dir, name), "wb") as f:
+                    f.write(encoded)
+                sources.setdefault(MIME_TYPES[image_format], []).append(
+                    {"src": f"/{OUTPUT_SUBDIR}/{name}", "width": target, "bytes": len(encoded)})
+        return {
+            "width": width,
+            "height": height,
+            "bytes": len(data),
+            "type": MIME_TYPES[source_format],
+            "blurDataURL": blur_data_url(image),
+            "sources": sources,
+            "srcSet": {mime: ", ".join(f"{v['src']} {v['width']}w" for v in variants)
+                       for mime, variants in sources.items()},
+        }
+
+    def _process(self, source):
+        key, data, source_format = source
+        if data is None:
+            return key, self.cache[key]["hash"], self.cache[key]["manifest"], True
+        digest = content_hash(data)
+        entry = self._cached(key, digest)
+        if entry is not None:
+            return key, digest, entry, True
+        try:
+            return key, digest, self.build(key, data, source_format), False
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {key}: {e}")
+            return key, digest, None, False
+
+    def _prune(self, manifest):
+        """Delete variant files no manifest entry refers to any more"""
+        keep = {os.path.basename(variant["src"]) for entry in manifest.values()
+                for variants in entry["sources"].values() for variant in variants}
+        removed = 0
+        for name in os.listdir(self.output_dir):
+            if name not in keep and not name.startswith(".") and name != "manifest.json":
+                os.remove(os.path.join(self.output_dir, name))
+                removed += 1
+        return removed
+
+    def write_empty_manifest(self):
+        """Make sure a manifest exists; an empty one makes the page fall back to the original images"""
+        if os.path.exists(self.manifest_path):
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.manifest_path, "w") as f:
+            json.dump({}, f)
+
+    def run(self):
+        if Image is None:
+            raise SystemExit("image_pipeline needs Pillow: pip install Pillow")
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.settings = content_hash(json.dumps([self.widths, self.quality, modern_formats()]).encode())[:12]
+        self.cache = self._load_cache()
+        start = time.perf_counter()
+        manifest, cache = {}, {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for key, digest, entry, cached in pool.map(self._process, self.sources()):
+                if entry is None:
+                    self.counters["failed"] += 1
+                    continue
+                self.counters["cached" if cached else "built"] += 1
+                manifest[key] = entry
+                cache[key] = {"hash": digest, "settings": self.settings, "manifest": entry}
+        removed = self._prune(manifest)
+        for path, payload in ((self.manifest_path, manifest), (self.cache_path, cache)):
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(payload, f, indent=1, sort_keys=True)
+            os.replace(tmp, path)
+        print(f"🖼️ {len(manifest)} images in {time.perf_counter() - start:.1f}s: {self.counters['built']} built, "
+              f"{self.counters['cached']} unchanged, {self.counters['failed']} failed, {removed} stale files removed")
+        self.report(manifest)
+        return manifest
+
+    def mobile_pick(self, key, entry):
+        """Smallest variant a phone would fetch: the first width covering the display width, best format"""
+        needed = min(self.display_widths.get(key, self.mobile_width), entry["width"])
+        best = None
+        for mime, variants in entry["sources"].items():
+            variant = next(v for v in sorted(variants, key=lambda v: v["width"]) if v["width"] >= needed)
+            if best is None or variant["bytes"] < best[1]["bytes"]:
+                best = mime, variant
+        return best
+
+    def report(self, manifest):
+        print(f"  {'image':<48} {'source KiB':>10} {'variants':>8} {'mobile pick':>22} {'KiB':>8} {'saved':>7}")
+        before = after = written = 0
+        for key, entry in sorted(manifest.items()):
+            mime, variant = self.mobile_pick(key, entry)
+            files = [v for variants in entry["sources"].values() for v in variants]
+            written += sum(v["bytes"] for v in files)
+            before += entry["bytes"]
+            after += variant["bytes"]
+            pick = f"{mime.split('/')[1]} @{variant['width']}w"
+            print(f"  {key[-48:]:<48} {entry['bytes'] / 1024:>10.1f} {len(files):>8} {pick:>22} "
+                  f"{variant['bytes'] / 1024:>8.1f} {1 - variant['bytes'] / entry['bytes']:>7.0%}")
+        if before:
+            print(f"📉 Mobile first-load image bytes: {before / 1024:.1f} -> {after / 1024:.1f} KiB "
+                  f"({(before - after) / 1024:.1f} KiB saved, {1 - after / before:.0%}); "
+                  f"{written / 1024:.1f} KiB of variants on disk")
+
+
+def _display_width(value):
+    name, _, width = value.partition("=")
+    if not width.isdigit():
+        raise argparse.ArgumentTypeError(f"expected NAME=PIXELS, got {value!r}")
+    return name, int(width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimize frontend/public images into responsive variants")
+    parser.add_argument("--public-dir", default=PUBLIC_DIR)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--quality", type=int, default=75, help="WebP/JPEG quality (AVIF uses 20 less)")
+    parser.add_argument("--mobile-width", type=int, default=DEFAULT_MOBILE_WIDTH,
+                        help="device pixels a phone renders an image at, for the bytes-saved report")
+    parser.add_argument("--display", type=_display_width, action="append", default=[], metavar="NAME=PIXELS",
+                        help="known rendered width of one image in device pixels (e.g. icon_brown.png=80)")
+    parser.add_argument("--remote", action="append", default=[], metavar="URL",
+                        help="also fetch and optimize a remote image the sources do not reference directly")
+    parser.add_argument("--source-dir", default=SOURCE_DIR,
+                        help="frontend sources scanned for remote image URLs (empty to skip)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--if-available", action="store_true",
+                        help="without Pillow, write an empty manifest and succeed instead of failing")
+    args = parser.parse_args(argv)
+
+    pipeline = ImagePipeline(args.public_dir, widths=args.widths, quality=args.quality,
+                             mobile_width=args.mobile_width, display_widths=dict(args.display),
+                             remote_urls=args.remote, jobs=args.jobs, source_dir=args.source_dir)
+    if Image is None and args.if_available:
+        print("⚠️ Pillow is not installed: images are served unoptimized (pip install Pillow)")
+        pipeline.write_empty_manifest()
+        return 0
+    pipeline.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import codecs
+import json
+import resource
+import sys
+import time
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+# Keys every streamed item must carry, per list endpoint
+REQUIRED_KEYS = {
+    "events": ("event_id", "title", "city", "date", "event_type", "skill_level", "max_seats"),
+    "clubs": ("user_id", "name"),
+}
+
+
+class IncompleteJSON(Exception):
+    pass
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class JSONItemStream:
+    """Incrementally yield the items of a JSON list response without buffering the body
+
+    Accepts a top-level array (yields (None, item)) or an object whose
+    values are arrays, like /me/events (yields ("joined", item), ...).
+    Non-array values of such an object are yielded as (key, value) once.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+        self.bytes_read = 0
+
+    def _fill(self):
+        """Read the next chunk; False once the input is exhausted"""
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            text = self._decoder.decode(chunk)
+            if self._pos > 65536:
+                self._buffer = self._buffer[self._pos:]
+                self._pos = 0
+            self._buffer += text
+            return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def _peek(self):
+        """Next non-whitespace character, reading more input as needed"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise IncompleteJSON("Unexpected end of JSON input")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}, got {self._buffer[self._pos]!r}")
+        self._pos += 1
+
+    def _value(self):
+        """Decode one complete value starting at the current position"""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A number cut at a chunk boundary ("12" of "12.5") parses cleanly; trust only
+                # values followed by a delimiter
+                if self._exhausted or (end < len(self._buffer) and self._buffer[end] in _DELIMITERS):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._exhausted:
+                    raise
+            if not self._fill() and self._exhausted and self._pos >= len(self._buffer):
+                raise IncompleteJSON("Unexpected end of JSON input")
+
+    def _array_items(self, key):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield key, self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self._pos - 1}")
+
+    def __iter__(self):
+        first = self._peek()
+        if first == "[":
+            yield from self._array_items(None)
+            return
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if self._peek() == "[":
+                yield from self._array_items(key)
+            else:
+                yield key, self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self._pos - 1}")
+
+
+class StreamStats:
+    """Time to first item, item rate and validation results of one streamed listing"""
+
+    def __init__(self, started):
+        self.started = started
+        self.first_item_at = None
+        self.finished_at = None
+        self.items = 0
+        self.invalid_items = 0
+        # (position, missing keys) of the first few invalid items
+        self.invalid = []
+        self.bytes_read = 0
+        self.peak_rss_mb = 0.0
+
+    @property
+    def ttfi_ms(self):
+        return (self.first_item_at - self.started) * 1000 if self.first_item_at else None
+
+    @property
+    def total_ms(self):
+        return ((self.finished_at or time.perf_counter()) - self.started) * 1000
+
+    @property
+    def items_per_second(self):
+        if not self.first_item_at or self.items < 2:
+            return 0.0
+        return self.items / max(self.finished_at - self.first_item_at, 1e-9)
+
+    def describe(self):
+        ttfi = f"{self.ttfi_ms:.1f} ms" if self.ttfi_ms is not None else "n/a"
+        return (f"TTFI {ttfi}, {self.items_per_second:.0f} items/s, total {self.total_ms:.1f} ms, "
+                f"{self.bytes_read / 1024:.1f} KiB, peak RSS {self.peak_rss_mb:.1f} MB")
+
+
+class StreamedListing:
+    """Iterate (key, item) pairs of a `stream=True` response, validating required keys as items arrive
+
+    Timing starts at `started` (the moment the request was sent) so time to
+    first item includes the wait for headers; the response is closed once
+    iteration ends, and `stats` is complete from then on.
+    """
+
+    def __init__(self, response, required_keys=(), started=None, chunk_size=65536):
+        self.response = response
+        self.required_keys = required_keys
+        self.stats = StreamStats(started if started is not None else time.perf_counter())
+        self._stream = JSONItemStream(response.iter_content(chunk_size=chunk_size))
+
+    def __iter__(self):
+        stats = self.stats
+        try:
+            for key, item in self._stream:
+                if stats.first_item_at is None:
+                    stats.first_item_at = time.perf_counter()
+                stats.items += 1
+                if self.required_keys and isinstance(item, dict):
+                    missing = [k for k in self.required_keys if k not in item]
+                    if missing:
+                        stats.invalid_items += 1
+                        if len(stats.invalid) < 10:
+                            stats.invalid.append((stats.items - 1, missing))
+                yield key, item
+        finally:
+            stats.finished_at = time.perf_counter()
+            stats.bytes_read = self._stream.bytes_read
+            stats.peak_rss_mb = peak_rss_mb()
+            self.response.close()
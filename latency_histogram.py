@@ -0,0 +1,299 @@
+import math
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+from http_transport import endpoint_key
+
+_HEADER = struct.Struct("<4sBBqqqq")
+_MAGIC = b"HLH1"
+
+
+class LatencyHistogram:
+    """HDR-style log-bucketed histogram of integer values (microseconds by convention)
+
+    Memory is fixed by `highest_value` and `significant_figures`: values are
+    kept to that many significant decimal digits, recording is O(1), and two
+    histograms with the same layout merge exactly by adding their counts.
+    """
+
+    def __init__(self, highest_value=60_000_000, significant_figures=3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        if highest_value < 2:
+            raise ValueError("highest_value must be at least 2")
+        self.highest_value = highest_value
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._sub_bucket_magnitude = max(1, math.ceil(math.log2(largest_single_unit)))
+        self._sub_bucket_count = 1 << self._sub_bucket_magnitude
+        self._sub_bucket_half_magnitude = self._sub_bucket_magnitude - 1
+        self._sub_bucket_half_count = self._sub_bucket_count >> 1
+        self._sub_bucket_mask = self._sub_bucket_count - 1
+
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count
+        while smallest_untrackable <= highest_value:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self._counts_length = (bucket_count + 1) * self._sub_bucket_half_count
+
+        self.counts = array("q", bytes(8 * self._counts_length))
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self.overflow_count = 0
+
+    # Index arithmetic
+
+    def _index_for(self, value):
+        bucket_index = (value | self._sub_bucket_mask).bit_length() - self._sub_bucket_magnitude
+        sub_bucket_index = value >> bucket_index
+        return ((bucket_index + 1) << self._sub_bucket_half_magnitude) + sub_bucket_index - self._sub_bucket_half_count
+
+    def _value_range_for(self, index):
+        """Lowest and highest value counted at `index`"""
+        bucket_index = (index >> self._sub_bucket_half_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        lowest = sub_bucket_index << bucket_index
+        return lowest, lowest + (1 << bucket_index) - 1
+
+    # Recording
+
+    def record(self, value, count=1):
+        value = int(value)
+        if value < 0:
+            value = 0
+        if value > self.highest_value:
+            self.overflow_count += count
+            value = self.highest_value
+        self.counts[self._index_for(value)] += count
+        if self.total_count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        self.total_count += count
+
+    def record_seconds(self, seconds, count=1):
+        self.record(round(seconds * 1_000_000), count)
+
+    def _check_compatible(self, other):
+        if (other.highest_value, other.significant_figures) != (self.highest_value, self.significant_figures):
+            raise ValueError("Cannot merge histograms with different layouts")
+
+    def merge(self, other):
+        """Add every count of `other` into this histogram"""
+        self._check_compatible(other)
+        if other.total_count == 0:
+            return self
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        if self.total_count == 0 or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+        self.overflow_count += other.overflow_count
+        return self
+
+    def copy(self):
+        clone = LatencyHistogram(self.highest_value, self.significant_figures)
+        return clone.merge(self)
+
+    def reset(self):
+        self.counts = array("q", bytes(8 * self._counts_length))
+        self.total_count = self.min_value = self.max_value = self.overflow_count = 0
+
+    # Queries
+
+    def value_at_percentile(self, pct):
+        """Highest value equivalent to the sample at percentile `pct` (0-100)"""
+        if self.total_count == 0:
+            return 0
+        target = max(1, math.ceil(min(pct, 100.0) / 100.0 * self.total_count))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                running += count
+                if running >= target:
+                    return min(self._value_range_for(index)[1], self.max_value)
+        return self.max_value
+
+    def percentiles(self, pcts=(50, 95, 99)):
+        """Several percentiles in one pass over the counts"""
+        if self.total_count == 0:
+            return {pct: 0 for pct in pcts}
+        ordered = sorted(pcts)
+        targets = [max(1, math.ceil(min(pct, 100.0) / 100.0 * self.total_count)) for pct in ordered]
+        result = {}
+        running = 0
+        position = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            running += count
+            while position < len(ordered) and running >= targets[position]:
+                result[ordered[position]] = min(self._value_range_for(index)[1], self.max_value)
+                position += 1
+            if position == len(ordered):
+                break
+        for pct in ordered[position:]:
+            result[pct] = self.max_value
+        return result
+
+    def mean(self):
+        if self.total_count == 0:
+            return 0.0
+        total = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                low, high = self._value_range_for(index)
+                total += count * (low + high) / 2
+        return total / self.total_count
+
+    def iter_values(self):
+        """(representative value, count) for every non-empty bucket, ascending"""
+        for index, count in enumerate(self.counts):
+            if count:
+                low, high = self._value_range_for(index)
+                yield (low + high) // 2, count
+
+    # Serialization
+
+    def encode(self):
+        """Compact binary form: fixed header plus zlib-compressed counts"""
+        counts = self.counts
+        if sys.byteorder != "little":
+            counts = array("q", counts)
+            counts.byteswap()
+        header = _HEADER.pack(_MAGIC, self.significant_figures, 0, self.highest_value,
+                              self.total_count, self.min_value, self.max_value)
+        return header + struct.pack("<q", self.overflow_count) + zlib.compress(counts.tobytes(), 6)
+
+    @classmethod
+    def decode(cls, data):
+        magic, sig, _, highest, total, min_value, max_value = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not an encoded LatencyHistogram")
+        (overflow,) = struct.unpack_from("<q", data, _HEADER.size)
+        histogram = cls(highest, sig)
+        counts = array("q")
+        counts.frombytes(zlib.decompress(data[_HEADER.size + 8:]))
+        if sys.byteorder != "little":
+            counts.byteswap()
+        if len(counts) != histogram._counts_length:
+            raise ValueError("Encoded counts do not match the histogram layout")
+        histogram.counts = counts
+        histogram.total_count = total
+        histogram.min_value = min_value
+        histogram.max_value = max_value
+        histogram.overflow_count = overflow
+        return histogram
+
+
+def status_class(status):
+    """Bucket an HTTP status (None for transport errors) as 2xx/3xx/4xx/5xx/error"""
+    if status is None:
+        return "error"
+    return f"{status // 100}xx"
+
+
+class HistogramRecorder:
+    """Thread-safe set of histograms keyed by endpoint and status class"""
+
+    def __init__(self, highest_value=60_000_000, significant_figures=3):
+        self.highest_value = highest_value
+        self.significant_figures = significant_figures
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def _new_histogram(self):
+        return LatencyHistogram(self.highest_value, self.significant_figures)
+
+    def record(self, endpoint, status, seconds, klass=None):
+        """Record one request; `klass` overrides the status class (e.g. "exp" for an anticipated 4xx)"""
+        key = (endpoint, klass or status_class(status))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = self._new_histogram()
+            histogram.record_seconds(seconds)
+
+    def observe(self, method, url, status, elapsed, error):
+        """HTTPTransport observer"""
+        self.record(endpoint_key(method, url), status, elapsed)
+
+    def by_endpoint(self):
+        """Histograms merged across status classes, keyed by endpoint"""
+        merged = {}
+        with self._lock:
+            for (endpoint, _), histogram in self.histograms.items():
+                if endpoint not in merged:
+                    merged[endpoint] = self._new_histogram()
+                merged[endpoint].merge(histogram)
+        return merged
+
+    def class_counts(self, *klasses):
+        """Requests per endpoint recorded under any of the given status classes"""
+        counts = {}
+        with self._lock:
+            for (endpoint, klass), histogram in self.histograms.items():
+                if klass in klasses:
+                    counts[endpoint] = counts.get(endpoint, 0) + histogram.total_count
+        return counts
+
+    def error_counts(self):
+        """Requests per endpoint that ended in 4xx/5xx or a transport error"""
+        return self.class_counts("4xx", "5xx", "error")
+
+    def merge(self, other):
+        with other._lock:
+            items = [(key, histogram.copy()) for key, histogram in other.histograms.items()]
+        with self._lock:
+            for key, histogram in items:
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = histogram
+        return self
+
+    def encode(self):
+        """Length-prefixed (endpoint, status class, histogram) records"""
+        parts = []
+        with self._lock:
+            for (endpoint, klass), histogram in sorted(self.histograms.items()):
+                key = f"{endpoint}\t{klass}".encode()
+                body = histogram.encode()
+                parts.append(struct.pack("<II", len(key), len(body)) + key + body)
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data, highest_value=60_000_000, significant_figures=3):
+        recorder = cls(highest_value, significant_figures)
+        offset = 0
+        while offset < len(data):
+            key_length, body_length = struct.unpack_from("<II", data, offset)
+            offset += 8
+            endpoint, klass = data[offset:offset + key_length].decode().split("\t")
+            offset += key_length
+            recorder.histograms[(endpoint, klass)] = LatencyHistogram.decode(data[offset:offset + body_length])
+            offset += body_length
+        return recorder
+
+    def print_report(self, title="⏱️ Latency per endpoint"):
+        print(f"\n{title}")
+        print(f"  {'endpoint':<44} {'class':>5} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        with self._lock:
+            items = sorted(self.histograms.items())
+        for (endpoint, klass), histogram in items:
+            pcts = histogram.percentiles()
+            print(f"  {endpoint:<44} {klass:>5} {histogram.total_count:>7} "
+                  f"{pcts[50] / 1000:>8.1f} {pcts[95] / 1000:>8.1f} {pcts[99] / 1000:>8.1f} "
+                  f"{histogram.max_value / 1000:>8.1f}")
@@ -0,0 +1,201 @@
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from http_transport import HTTPTransport, endpoint_key
+from latency_histogram import HistogramRecorder
+
+EVENT_FILTERS = {
+    "city": ["Barcelona", "Madrid", "Valencia", "Sevilla"],
+    "skill_level": ["principiante", "medio", "avanzado"],
+    "event_type": ["casual", "torneo"],
+    "date_filter": ["hoy", "semana", "mes"],
+}
+# Status class for answers a scenario anticipates (a full event refusing a join), kept out of the error rate
+EXPECTED_CLASS = "exp"
+# Statuses the request in flight on this thread anticipates
+_expected = threading.local()
+
+
+class PhaseMetrics:
+    """Per-endpoint request counts, errors and latencies for one load phase"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.finished = None
+        self.recorder = HistogramRecorder()
+
+    def record(self, endpoint, status, elapsed, expected=False):
+        self.recorder.record(endpoint, status, elapsed, EXPECTED_CLASS if expected else None)
+
+    def report(self, out):
+        duration = (self.finished or time.perf_counter()) - self.started
+        print(f"\n📈 Phase '{self.name}' ({duration:.1f}s)", file=out)
+        print(f"  {'endpoint':<38} {'req/s':>8} {'err%':>6} {'exp%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}",
+              file=out)
+        errors = self.recorder.error_counts()
+        expected = self.recorder.class_counts(EXPECTED_CLASS)
+        for endpoint, histogram in sorted(self.recorder.by_endpoint().items()):
+            pcts = histogram.percentiles()
+            print(f"  {endpoint:<38} {histogram.total_count / max(duration, 1e-9):>8.1f} "
+                  f"{errors.get(endpoint, 0) / histogram.total_count * 100:>6.1f} "
+                  f"{expected.get(endpoint, 0) / histogram.total_count * 100:>6.1f} "
+                  f"{pcts[50] / 1000:>8.1f} {pcts[95] / 1000:>8.1f} {pcts[99] / 1000:>8.1f}", file=out)
+
+
+class VirtualUser(threading.Thread):
+    """One simulated player looping over the weighted scenario mix"""
+
+    def __init__(self, runner, index):
+        super().__init__(name=f"vu-{index}", daemon=True)
+        self.runner = runner
+        self.stop_event = threading.Event()
+        self.rng = random.Random(f"{runner.seed}-{index}")
+        self.tester = runner.tester_factory(runner.base_url, transport=runner.transport)
+        self.tester.user_tag = f"vu{index}_{uuid.uuid4().hex[:8]}"
+        # Events this user is already in (or was refused from), so joins don't repeat
+        self.joined = set()
+
+    def browse_events(self):
+        filter_name = self.rng.choice(list(EVENT_FILTERS))
+        params = {filter_name: self.rng.choice(EVENT_FILTERS[filter_name])}
+        self.runner.transport.get(f"{self.tester.api_url}/events", params=params)
+
+    def join_event(self):
+        """Open a random listed event this user has not joined yet and join it
+
+        A 400 (event full, or joined in an earlier run with a pooled user)
+        is an answer the scenario expects, so it is counted apart from errors.
+        """
+        api_url = self.tester.api_url
+        events = self.runner.transport.get(f"{api_url}/events").json()
+        candidates = [event["event_id"] for event in events if event["event_id"] not in self.joined]
+        if not candidates:
+            return
+        event_id = self.rng.choice(candidates)
+        self.runner.transport.get(f"{api_url}/events/{event_id}")
+        _expected.statuses = (400,)
+        try:
+            response = self.runner.transport.post(f"{api_url}/events/{event_id}/join",
+                                                  headers={"Authorization": f"Bearer {self.tester.session_token}"})
+        finally:
+            _expected.statuses = ()
+        if response.status_code in (200, 400):
+            self.joined.add(event_id)
+
+    def drain_results(self):
+        """Drop the tester's logged checks; the phase histograms already hold every request"""
+        self.tester.results.drain()
+        del self.tester.failed_tests[:]
+
+    def run(self):
+        if self.runner.token_pool:
+            self.tester.use_pooled_user(self.runner.token_pool.acquire())
+        else:
+            self.tester.test_user_registration()
+            self.tester.test_user_login()
+        scenarios = self.runner.scenarios(self)
+        names = list(scenarios)
+        weights = [scenarios[name][0] for name in names]
+        while not self.stop_event.is_set():
+            steps = scenarios[self.rng.choices(names, weights)[0]][1]
+            for step in steps:
+                if self.stop_event.is_set():
+                    break
+                try:
+                    step()
+                except Exception:
+                    # Failures are already counted per request by the transport observer
+                    pass
+                self.stop_event.wait(self.rng.uniform(*self.runner.think_time))
+            self.drain_results()
+
+
+class LoadRunner:
+    """Virtual-user load generation with ramp-up, steady and ramp-down phases"""
+
+    def __init__(self, base_url, tester_factory, users=50, ramp_up=30.0, steady=60.0, ramp_down=15.0,
+                 think_time=(0.5, 2.0), seed=0, token_pool=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.tester_factory = tester_factory
+        self.users = users
+        self.ramp_up = ramp_up
+        self.steady = steady
+        self.ramp_down = ramp_down
+        self.think_time = think_time
+        self.seed = seed
+        # Pre-provisioned users (TokenPool) replace per-VU registration and login
+        self.token_pool = token_pool
+        self.transport = HTTPTransport(pool_size=max(10, users))
+        self.transport.add_observer(self._observe)
+        self.phases = []
+        self.current_phase = None
+
+    def scenarios(self, vu):
+        """Weighted scenario mix: name -> (weight, steps), built from the tester's steps"""
+        tester = vu.tester
+        return {
+            "browse": (5, [vu.browse_events, tester.test_events_listing]),
+            "join": (3, [vu.join_event, tester.test_my_events]),
+            "organize": (1, [tester.test_create_event, tester.test_my_events]),
+            "relogin": (1, [tester.test_user_login]),
+        }
+
+    def _observe(self, method, url, status, elapsed, error):
+        phase = self.current_phase
+        if phase is not None:
+            phase.record(endpoint_key(method, url), status, elapsed,
+                         expected=status in getattr(_expected, "statuses", ()))
+
+    def _start_phase(self, name, out):
+        if self.current_phase is not None:
+            self.current_phase.finished = time.perf_counter()
+            self.current_phase.report(out)
+        self.current_phase = PhaseMetrics(name) if name else None
+        if name:
+            self.phases.append(self.current_phase)
+            print(f"\n▶️ Phase '{name}' started", file=out)
+
+    def _spread(self, count, duration, action):
+        """Apply action to `count` items evenly over `duration` seconds"""
+        interval = duration / count if count else 0
+        for i in range(count):
+            action(i)
+            if interval:
+                time.sleep(interval)
+
+    def run(self, out=None):
+        out = out or sys.stdout
+        print(f"🏋️ Load test: {self.users} virtual users against {self.base_url}", file=out)
+        print(f"Phases: ramp-up {self.ramp_up}s, steady {self.steady}s, ramp-down {self.ramp_down}s", file=out)
+        vus = []
+
+        def start_vu(i):
+            vu = VirtualUser(self, i)
+            vus.append(vu)
+            vu.start()
+
+        def stop_vu(i):
+            vus[i].stop_event.set()
+
+        # The per-step prints of the tester would drown the phase reports
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            self._start_phase("ramp-up", out)
+            self._spread(self.users, self.ramp_up, start_vu)
+            self._start_phase("steady", out)
+            time.sleep(self.steady)
+            self._start_phase("ramp-down", out)
+            self._spread(len(vus), self.ramp_down, stop_vu)
+            for vu in vus:
+                vu.join()
+            self._start_phase(None, out)
+
+        self.transport.print_stats()
+        self.transport.close()
+        return self.phases
@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from latency_histogram import LatencyHistogram
+
+# Requests/second and burst allowed per platform; the backend forwards each lookup upstream
+DEFAULT_RATES = {"chess_com": (5.0, 10), "lichess": (10.0, 20)}
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, at most `burst` banked"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LookupScheduler:
+    """Rate-limited, deduplicating front for GET /chess/lookup/{platform}/{username}
+
+    Identical lookups (platform plus case-folded username) share one
+    upstream call while it is in flight, and its result is cached for `ttl`
+    seconds (`negative_ttl` for 404s). Calls that do reach the backend first
+    take a token from the platform's bucket, and a 429 is retried after
+    Retry-After. Everything else is returned uncached.
+    """
+
+    def __init__(self, transport, api_url, rates=None, ttl=300.0, negative_ttl=60.0, max_retries=3):
+        self.transport = transport
+        self.api_url = api_url
+        self.buckets = {platform: TokenBucket(rate, burst)
+                        for platform, (rate, burst) in (rates or DEFAULT_RATES).items()}
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_retries = max_retries
+        self.cache = {}
+        self.in_flight = {}
+        self.counters = {"hits": 0, "coalesced": 0, "upstream": 0, "throttled": 0, "rate_limited": 0}
+        self.bucket_wait = 0.0
+        self.latency = {source: LatencyHistogram() for source in ("hit", "coalesced", "upstream")}
+        self._lock = threading.Lock()
+
+    def throttle(self, platform):
+        """Wait for the platform's rate limit before a call that looks up upstream (e.g. /chess/link)"""
+        bucket = self.buckets.get(platform)
+        waited = bucket.acquire() if bucket else 0.0
+        if waited:
+            with self._lock:
+                self.counters["throttled"] += 1
+                self.bucket_wait += waited
+
+    def _fetch(self, platform, username):
+        for attempt in range(self.max_retries + 1):
+            self.throttle(platform)
+            with self._lock:
+                self.counters["upstream"] += 1
+            response = self.transport.get(f"{self.api_url}/chess/lookup/{platform}/{username}")
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+            with self._lock:
+                self.counters["rate_limited"] += 1
+            time.sleep(float(response.headers.get("Retry-After") or 1.0))
+        try:
+            data = response.json()
+        except ValueError:
+            data = response.text
+        return response.status_code, data
+
+    def _record(self, source, start):
+        with self._lock:
+            self.latency[source].record_seconds(time.perf_counter() - start)
+
+    def lookup(self, platform, username):
+        """(status, data) for one username, from cache, a shared in-flight call or the backend"""
+        start = time.perf_counter()
+        key = (platform, username.lower())
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.counters["hits"] += 1
+                self.latency["hit"].record_seconds(time.perf_counter() - start)
+                return cached[1]
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = _Flight()
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            self._record("coalesced", start)
+            if flight.error:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._fetch(platform, username)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self.in_flight[key]
+                status = flight.result[0] if flight.result else None
+                ttl = self.ttl if status == 200 else self.negative_ttl if status == 404 else 0
+                if ttl:
+                    self.cache[key] = (time.monotonic() + ttl, flight.result)
+            flight.done.set()
+        self._record("upstream", start)
+        return flight.result
+
+    def lookup_batch(self, lookups, concurrency=32):
+        """Look up (platform, username) pairs concurrently; returns {status: count}"""
+        statuses = {}
+
+        def one(pair):
+            try:
+                status, _ = self.lookup(*pair)
+            except Exception:
+                status = None
+            with self._lock:
+                statuses[status] = statuses.get(status, 0) + 1
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, lookups))
+        return statuses
+
+    def report(self):
+        counters = self.counters
+        total = counters["hits"] + counters["coalesced"] + counters["upstream"] - counters["rate_limited"]
+        print(f"\n🧮 Lookup scheduler: {total} lookups -> {counters['upstream']} upstream calls "
+              f"({counters['hits']} cache hits, {counters['coalesced']} coalesced waits)")
+        print(f"🚦 {counters['throttled']} calls throttled ({self.bucket_wait:.1f}s of waiting summed over callers), "
+              f"{counters['rate_limited']} rate-limited (429) retries")
+        for source, histogram in self.latency.items():
+            if histogram.total_count:
+                pcts = histogram.percentiles()
+                print(f"  {source:<10} {histogram.total_count:>7} p50 {pcts[50] / 1000:>8.2f} ms "
+                      f"p95 {pcts[95] / 1000:>8.2f} ms p99 {pcts[99] / 1000:>8.2f} ms")
+
+
+def synthetic_usernames(count, distinct=None, seed=0):
+    """(platform, username) pairs with a skewed popularity, like real lookup traffic
+
+    A few names (the canned streamers among them) dominate; the long tail
+    is looked up once or twice.
+    """
+    rng = random.Random(seed)
+    distinct = distinct or max(1, count // 5)
+    names = [("chess_com", "gothamchess"), ("lichess", "DrNykterstein")]
+    names += [(rng.choice(("chess_com", "lichess")), f"player_{i}") for i in range(distinct - len(names))]
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    return rng.choices(names, weights=weights, k=count)
@@ -0,0 +1,220 @@
+import contextlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from latency_histogram import HistogramRecorder
+from load_runner import LoadRunner, PhaseMetrics
+from open_loop import ArrivalRunResult, ConstantArrivalRunner
+from token_pool import TokenPool
+
+
+def _split(total, parts, index):
+    """Share of `total` for worker `index` when split as evenly as possible"""
+    return total // parts + (1 if index < total % parts else 0)
+
+
+def _load_worker(worker_id, workers, options, tester_factory):
+    token_pool = None
+    if options.get("token_pool"):
+        offset = sum(_split(options["users"], workers, i) for i in range(worker_id))
+        token_pool = TokenPool(options["base_url"], options["token_pool"], size=options["token_pool_size"],
+                               offset=offset)
+        token_pool.load()
+    runner = LoadRunner(options["base_url"], tester_factory, users=_split(options["users"], workers, worker_id),
+                        ramp_up=options["ramp_up"], steady=options["steady"], ramp_down=options["ramp_down"],
+                        think_time=options["think_time"], seed=f"{options.get('seed', 0)}-{worker_id}",
+                        token_pool=token_pool)
+
+    def run(out=None):
+        try:
+            return runner.run(out=out)
+        finally:
+            if token_pool:
+                token_pool.close()
+
+    def snapshot():
+        phases = list(runner.phases)
+        return {phase.name: (phase.recorder.encode(),
+                             (phase.finished or time.perf_counter()) - phase.started) for phase in phases}
+
+    return run, snapshot
+
+
+def _arrival_worker(worker_id, workers, options, tester_factory):
+    runner = ConstantArrivalRunner(options["base_url"], max_workers=options.get("max_workers", 200))
+    runner.discover_targets()
+    rps = options["rps"] / workers
+
+    def run(out=None):
+        runner.run(rps, options["duration"])
+
+    def snapshot():
+        result = runner.current_result
+        if result is None:
+            return {}
+        return {"open-loop": (result.latencies.encode(), result.duration)}
+
+    return run, snapshot
+
+
+WORKER_MODES = {"load": _load_worker, "arrival": _arrival_worker}
+
+
+def _worker_main(mode, worker_id, workers, options, tester_factory, ready, start_event, start_at, results,
+                 report_interval):
+    """Entry point of one forked worker process"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            run, snapshot = WORKER_MODES[mode](worker_id, workers, options, tester_factory)
+        except Exception as e:
+            results.put(("failed", worker_id, repr(e)))
+            return
+
+        ready.put(worker_id)
+        start_event.wait()
+        delay = start_at.value - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        finished = threading.Event()
+
+        def stream_partials():
+            while not finished.wait(report_interval):
+                results.put(("partial", worker_id, snapshot()))
+
+        reporter = threading.Thread(target=stream_partials, daemon=True)
+        reporter.start()
+        try:
+            run(out=devnull)
+        except Exception as e:
+            results.put(("failed", worker_id, repr(e)))
+            return
+        finally:
+            finished.set()
+            reporter.join()
+        results.put(("done", worker_id, snapshot()))
+
+
+class MultiProcessCoordinator:
+    """Fork one worker per core, start them together and merge their histograms exactly
+
+    Workers stream cumulative histogram snapshots every `report_interval`
+    seconds; the coordinator keeps the latest one per worker, so the combined
+    report is a merge of raw counts rather than an average of percentiles.
+    """
+
+    def __init__(self, mode, options, tester_factory=None, processes=None, report_interval=5.0,
+                 start_delay=1.0):
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown mode {mode!r}")
+        self.mode = mode
+        self.options = options
+        self.tester_factory = tester_factory
+        self.processes = processes or os.cpu_count() or 1
+        self.report_interval = report_interval
+        self.start_delay = start_delay
+        self.snapshots = {}
+
+    def merged(self):
+        """Phase name -> (merged HistogramRecorder, longest worker duration)"""
+        phases = {}
+        for snapshot in self.snapshots.values():
+            for name, (encoded, duration) in snapshot.items():
+                recorder, longest = phases.get(name, (HistogramRecorder(), 0.0))
+                recorder.merge(HistogramRecorder.decode(encoded))
+                phases[name] = (recorder, max(longest, duration))
+        return phases
+
+    def _print_progress(self):
+        total = 0
+        for recorder, _ in self.merged().values():
+            total += sum(histogram.total_count for histogram in recorder.by_endpoint().values())
+        print(f"  … {len(self.snapshots)}/{self.processes} workers reporting, {total} requests so far")
+
+    def run(self):
+        context = multiprocessing.get_context("fork")
+        ready = context.Queue()
+        results = context.Queue()
+        start_event = context.Event()
+        start_at = context.Value("d", 0.0)
+
+        print(f"🧵 Starting {self.processes} worker processes ({self.mode} mode)")
+        workers = [
+            context.Process(target=_worker_main,
+                            args=(self.mode, i, self.processes, self.options, self.tester_factory, ready,
+                                  start_event, start_at, results, self.report_interval),
+                            daemon=True)
+            for i in range(self.processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        pending = set(range(self.processes))
+        failures = {}
+        ready_count = 0
+        while ready_count < len(pending):
+            try:
+                ready.get(timeout=0.5)
+                ready_count += 1
+            except queue.Empty:
+                pass
+            while True:
+                try:
+                    kind, worker_id, payload = results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "failed":
+                    failures[worker_id] = payload
+                    pending.discard(worker_id)
+            if not any(worker.is_alive() for worker in workers):
+                break
+
+        # Synchronized start: every worker sleeps until the same wall-clock instant
+        start_at.value = time.time() + self.start_delay
+        start_event.set()
+        print(f"🚦 {ready_count} workers ready, starting together")
+
+        while pending:
+            try:
+                kind, worker_id, payload = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            if kind == "failed":
+                failures[worker_id] = payload
+                pending.discard(worker_id)
+            else:
+                self.snapshots[worker_id] = payload
+                if kind == "done":
+                    pending.discard(worker_id)
+                else:
+                    self._print_progress()
+
+        for worker in workers:
+            worker.join(timeout=5)
+        for worker_id, error in sorted(failures.items()):
+            print(f"❌ Worker {worker_id} failed: {error}")
+        self.report()
+        return not failures
+
+    def report(self):
+        print(f"\n🧮 Combined report across {len(self.snapshots)} workers")
+        for name, (recorder, duration) in self.merged().items():
+            if self.mode == "arrival":
+                result = ArrivalRunResult(self.options["rps"], duration)
+                result.latencies = recorder
+                self._print_arrival(result)
+                continue
+            phase = PhaseMetrics(name)
+            phase.recorder = recorder
+            phase.started, phase.finished = 0.0, duration
+            phase.report(None)
+
+    def _print_arrival(self, result):
+        print(f"\n🎯 {result.target_rps:.1f} req/s for {result.duration:.0f}s: {result.sent} sent, "
+              f"{result.error_rate * 100:.2f}% errors, p99 {result.overall_percentile(99) * 1000:.1f} ms")
+        result.latencies.print_report("⏱️ Latency per endpoint (from intended send time)")
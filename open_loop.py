@@ -0,0 +1,160 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http_transport import HTTPTransport, endpoint_key
+from latency_histogram import LatencyHistogram, HistogramRecorder
+from load_runner import EVENT_FILTERS
+
+
+class ArrivalRunResult:
+    """Latencies of one constant-arrival-rate run, measured from the intended send time"""
+
+    def __init__(self, target_rps, duration):
+        self.target_rps = target_rps
+        self.duration = duration
+        self.latencies = HistogramRecorder()
+        self.service_times = HistogramRecorder()
+        self.max_dispatch_lag = 0.0
+
+    def record(self, endpoint, status, latency, service_time):
+        self.latencies.record(endpoint, status, latency)
+        self.service_times.record(endpoint, status, service_time)
+
+    @property
+    def sent(self):
+        return sum(histogram.total_count for histogram in self.latencies.by_endpoint().values())
+
+    @property
+    def error_rate(self):
+        return sum(self.latencies.error_counts().values()) / self.sent if self.sent else 0.0
+
+    def overall_percentile(self, pct):
+        """Latency percentile across all endpoints, in seconds"""
+        overall = LatencyHistogram()
+        for histogram in self.latencies.by_endpoint().values():
+            overall.merge(histogram)
+        return overall.value_at_percentile(pct) / 1_000_000
+
+    def report(self):
+        print(f"\n🎯 {self.target_rps:.1f} req/s for {self.duration:.0f}s: {self.sent} sent, "
+              f"{self.error_rate * 100:.2f}% errors, p99 {self.overall_percentile(99) * 1000:.1f} ms "
+              f"(max dispatch lag {self.max_dispatch_lag * 1000:.1f} ms)")
+        print(f"  {'endpoint':<30} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'svc p99':>8} {'err%':>6}")
+        errors = self.latencies.error_counts()
+        service_times = self.service_times.by_endpoint()
+        for endpoint, histogram in sorted(self.latencies.by_endpoint().items()):
+            pcts = histogram.percentiles()
+            print(f"  {endpoint:<30} {pcts[50] / 1000:>8.1f} {pcts[95] / 1000:>8.1f} {pcts[99] / 1000:>8.1f} "
+                  f"{service_times[endpoint].value_at_percentile(99) / 1000:>8.1f} "
+                  f"{errors.get(endpoint, 0) / histogram.total_count * 100:>6.1f}")
+
+
+class ConstantArrivalRunner:
+    """Open-loop generator for the public read endpoints
+
+    Requests are fired on a fixed schedule regardless of how fast earlier
+    ones complete, and latency is measured from each request's intended send
+    time. A slow server therefore shows up as queueing in the numbers instead
+    of silently lowering the offered load (coordinated omission).
+    """
+
+    def __init__(self, base_url, max_workers=200, transport=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.max_workers = max_workers
+        # No retries: a retried request would hide its first attempt's latency
+        self.transport = transport or HTTPTransport(pool_size=max_workers, retries=0)
+        self.targets = []
+        self.current_result = None
+
+    def discover_targets(self):
+        """Build the request mix from the listing endpoints; ids come from live data
+
+        Raises RuntimeError when the listings are empty (e.g. an unseeded
+        stand-in): the mix would silently shrink to the two listings.
+        """
+        targets = [f"{self.api_url}/events", f"{self.api_url}/clubs"]
+        for name, values in EVENT_FILTERS.items():
+            targets.extend(f"{self.api_url}/events?{name}={value}" for value in values)
+
+        events = self.transport.get(f"{self.api_url}/events").json()
+        clubs = self.transport.get(f"{self.api_url}/clubs").json()
+        targets.extend(f"{self.api_url}/events/{event['event_id']}" for event in events[:10])
+        targets.extend(f"{self.api_url}/clubs/{club['user_id']}" for club in clubs[:5])
+        user_ids = {event.get("organizer_id") for event in events[:10]} - {None}
+        targets.extend(f"{self.api_url}/users/{user_id}" for user_id in sorted(user_ids))
+        targets.extend(f"{self.api_url}/users/{club['user_id']}" for club in clubs[:5])
+        missing = [template for template in ("/api/events/{id}", "/api/clubs/{id}", "/api/users/{id}")
+                   if not any(endpoint_key("GET", url).endswith(template) for url in targets)]
+        if missing:
+            raise RuntimeError(f"No targets for {', '.join(missing)}: {self.api_url} lists "
+                               f"{len(events)} events and {len(clubs)} clubs (seed it first)")
+        self.targets = targets
+        return targets
+
+    def _fire(self, url, intended, result):
+        sent = time.perf_counter()
+        status = None
+        try:
+            response = self.transport.get(url)
+            response.content
+            status = response.status_code
+        except Exception:
+            pass
+        done = time.perf_counter()
+        result.record(endpoint_key("GET", url), status, done - intended, done - sent)
+
+    def run(self, rps, duration):
+        """Offer `rps` requests per second for `duration` seconds"""
+        if not self.targets:
+            self.discover_targets()
+        result = self.current_result = ArrivalRunResult(rps, duration)
+        total = max(1, int(rps * duration))
+        interval = 1.0 / rps
+        urls = itertools.cycle(self.targets)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            start = time.perf_counter()
+            for i in range(total):
+                intended = start + i * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    result.max_dispatch_lag = max(result.max_dispatch_lag, -delay)
+                executor.submit(self._fire, next(urls), intended, result)
+        return result
+
+    def find_max_rps(self, p99_target, start_rps=10.0, duration=20.0, max_error_rate=0.01,
+                     max_rps=5000.0, resolution=0.05):
+        """Search for the highest arrival rate whose p99 stays under `p99_target` seconds
+
+        Doubles the rate until the target is missed, then bisects between the
+        last passing and first failing rate down to `resolution` (relative).
+        """
+        def sustainable(rps):
+            result = self.run(rps, duration)
+            result.report()
+            ok = result.overall_percentile(99) <= p99_target and result.error_rate <= max_error_rate
+            print(f"  {'✅' if ok else '❌'} {rps:.1f} req/s {'sustainable' if ok else 'not sustainable'}")
+            return ok
+
+        low, high = 0.0, None
+        rps = start_rps
+        while rps <= max_rps:
+            if not sustainable(rps):
+                high = rps
+                break
+            low = rps
+            rps *= 2
+        if high is None:
+            return low
+
+        while high - low > resolution * high:
+            mid = (low + high) / 2
+            if sustainable(mid):
+                low = mid
+            else:
+                high = mid
+        print(f"\n🏁 Highest sustainable rate: {low:.1f} req/s (p99 target {p99_target * 1000:.0f} ms)")
+        return low
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+from token_pool import TokenPool
+
+
+class RefreshFanoutBenchmark:
+    """Nightly-style rating refresh: many linked users call /chess/refresh at bounded concurrency
+
+    Users from a TokenPool are linked to none, one or both platforms in
+    fixed proportions, so each refresh fans out to a known number of
+    upstream profile calls. Latency is kept per linked-platform count; a
+    200 whose `results` is shorter than the linked count is a partial
+    failure (an upstream call the backend dropped).
+    """
+
+    def __init__(self, base_url, users=200, concurrency=16, rounds=1, mix=(0.1, 0.3, 0.6), token_pool_path=None,
+                 transport=None):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.users = users
+        self.concurrency = concurrency
+        self.rounds = rounds
+        # Fractions of users with 0, 1 and 2 linked platforms
+        self.mix = mix
+        self.transport = transport or HTTPTransport(pool_size=concurrency, retries=0)
+        self.token_pool = TokenPool(base_url, token_pool_path, size=users, concurrency=concurrency,
+                                    transport=self.transport)
+        # Linked-platform count -> LatencyHistogram of refresh calls
+        self.latency = {}
+        self.result_sizes = {}
+        self.outcomes = {}
+        self._lock = threading.Lock()
+
+    def _platforms_for(self, index):
+        position = (index + 0.5) / self.users
+        if position < self.mix[0]:
+            return ()
+        if position < self.mix[0] + self.mix[1]:
+            return ("chess_com",) if index % 2 else ("lichess",)
+        return ("chess_com", "lichess")
+
+    def _link(self, assignment):
+        user, platforms = assignment
+        headers = {"Authorization": f"Bearer {user.token}"}
+        # Start from a known state: a cached pool user may still be linked from an earlier run
+        for platform in ("chess_com", "lichess"):
+            if platform not in platforms:
+                self.transport.delete(f"{self.api_url}/chess/unlink/{platform}", headers=headers)
+        for platform in platforms:
+            # Setup must not depend on upstream luck: retry profile API failures
+            for _ in range(5):
+                response = self.transport.post(f"{self.api_url}/chess/link", headers=headers,
+                                               json={"platform": platform, "username": f"fanout_{user.user_id}"})
+                if response.status_code != 502:
+                    break
+            if response.status_code != 200:
+                raise RuntimeError(f"Linking {platform} failed with status {response.status_code}")
+
+    def _count(self, table, key):
+        with self._lock:
+            table[key] = table.get(key, 0) + 1
+
+    def _refresh(self, assignment):
+        user, platforms = assignment
+        linked = len(platforms)
+        start = time.perf_counter()
+        try:
+            response = self.transport.post(f"{self.api_url}/chess/refresh",
+                                           headers={"Authorization": f"Bearer {user.token}"})
+            status = response.status_code
+            results = response.json().get("results", []) if status == 200 else None
+        except Exception:
+            status, results = None, None
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.latency.setdefault(linked, LatencyHistogram()).record_seconds(elapsed)
+        if results is not None:
+            self._count(self.result_sizes, len(results))
+        if linked == 0:
+            outcome = "ok" if status == 400 else "failed"
+        elif status != 200:
+            outcome = "failed"
+        else:
+            outcome = "ok" if len(results) == linked else "partial"
+        self._count(self.outcomes, (linked, outcome))
+
+    def run(self):
+        print(f"🔄 Refresh fan-out: {self.users} users, {self.rounds} round(s) at concurrency {self.concurrency} "
+              f"against {self.base_url}")
+        self.token_pool.provision()
+        assignments = [(self.token_pool.acquire(), self._platforms_for(i)) for i in range(self.users)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self._link, assignments))
+        print(f"🔗 Linked accounts in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(self._refresh, assignments * self.rounds))
+        elapsed = time.perf_counter() - start
+        self.token_pool.save()
+        return self.report(len(assignments) * self.rounds, elapsed)
+
+    def report(self, calls, elapsed):
+        print(f"\n📊 {calls} refresh calls in {elapsed:.1f}s ({calls / elapsed:.1f} calls/s)")
+        print(f"  {'linked':>6} {'calls':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'partial%':>9} {'fail%':>6}")
+        failed_calls = partial_calls = 0
+        for linked, histogram in sorted(self.latency.items()):
+            pcts = histogram.percentiles()
+            partial = self.outcomes.get((linked, "partial"), 0)
+            failed = self.outcomes.get((linked, "failed"), 0)
+            failed_calls += failed
+            partial_calls += partial
+            print(f"  {linked:>6} {histogram.total_count:>7} {pcts[50] / 1000:>8.1f} {pcts[95] / 1000:>8.1f} "
+                  f"{pcts[99] / 1000:>8.1f} {partial / histogram.total_count * 100:>8.1f}% "
+                  f"{failed / histogram.total_count * 100:>5.1f}%")
+        sizes = ", ".join(f"{size}: {count}" for size, count in sorted(self.result_sizes.items()))
+        print(f"📦 `results` sizes: {sizes or 'none'}")
+        rate = failed_calls / calls if calls else 0.0
+        print(f"{'✅' if not failed_calls else '⚠️'} Failure rate {rate * 100:.2f}%, "
+              f"{partial_calls / calls * 100 if calls else 0.0:.2f}% of refreshes partial")
+        return rate
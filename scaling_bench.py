@@ -0,0 +1,186 @@
+import itertools
+import json
+import math
+import os
+import time
+import uuid
+
+from datagen import BulkDataGenerator
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+
+# One representative value per filter; the matrix is every subset of these
+FILTER_VALUES = {
+    "city": "Madrid",
+    "skill_level": "medio",
+    "event_type": "casual",
+    "date_filter": "mes",
+}
+
+
+def filter_matrix():
+    """Every combination of the event filters, from no filter to all four"""
+    names = list(FILTER_VALUES)
+    for size in range(len(names) + 1):
+        for combo in itertools.combinations(names, size):
+            yield {name: FILTER_VALUES[name] for name in combo}
+
+
+def loglog_slope(xs, ys):
+    """Least-squares slope of log(y) against log(x): ~1 linear, >1 super-linear"""
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+class ScalingBenchmark:
+    """Sweep listing endpoints and filter combinations across growing dataset sizes
+
+    Sizes are reached by topping up one resumable BulkDataGenerator run, so
+    each step only inserts the difference between the target and what the
+    listings already hold. N is the size of the unfiltered listing read
+    before each measurement, not the target. Latency is fitted against N after
+    subtracting the fixed per-request cost, measured on the constant-size
+    event detail endpoint at the same size.
+    """
+
+    def __init__(self, base_url, sizes=(1000, 5000, 20000), repeats=15, me_fraction=0.01,
+                 superlinear_threshold=1.15, state_path="scaling_state.json", concurrency=16):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.sizes = sorted(sizes)
+        self.repeats = repeats
+        self.me_fraction = me_fraction
+        self.superlinear_threshold = superlinear_threshold
+        self.state_path = state_path
+        self.concurrency = concurrency
+        self.transport = HTTPTransport(pool_size=concurrency, retries=0)
+        self.results = {}
+        self.token = None
+        self.joined = set()
+
+    def _case_name(self, endpoint, params):
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        return f"{endpoint}?{query}" if query else endpoint
+
+    def cases(self):
+        for params in filter_matrix():
+            yield self._case_name("/events", params), "/events", params, False
+        yield "/clubs", "/clubs", {}, False
+        yield "/me/events", "/me/events", {}, True
+
+    def _login_bench_user(self):
+        email = f"scaling_{uuid.uuid4().hex[:10]}@example.com"
+        response = self.transport.post(f"{self.api_url}/auth/register", json={
+            "email": email, "password": "benchpass", "name": "Scaling Bench", "user_type": "user",
+            "skill_level": "medio", "city": "Madrid"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Registering the bench user failed: {response.status_code} {response.text[:200]}")
+        self.token = response.cookies.get("session_token")
+        self.joined = set()
+
+    def _listing(self, path):
+        response = self.transport.get(f"{self.api_url}{path}")
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} failed: {response.status_code}")
+        return response.json()
+
+    def _top_up(self, size, events, clubs):
+        """Generate whatever the listings lack to reach `size` events and size/50 clubs"""
+        generator = BulkDataGenerator(self.base_url, clubs=0, users=0, events=0, joins=0,
+                                      concurrency=self.concurrency, state_path=self.state_path,
+                                      transport=self.transport)
+        created = generator.state.created
+        generator.counts.update(clubs=created["clubs"] + max(0, max(10, size // 50) - clubs),
+                                users=max(created["users"], 50, size // 10),
+                                events=created["events"] + max(0, size - events))
+        generator.run()
+        if generator.failures:
+            print(f"⚠️ {generator.failures} items failed; N below is what the listings actually hold")
+
+    def _grow_me_events(self, event_ids, size):
+        """Join events until the bench user's /me/events grows in proportion to N"""
+        target = max(1, int(size * self.me_fraction))
+        headers = {"Authorization": f"Bearer {self.token}"}
+        for event_id in event_ids:
+            if len(self.joined) >= target:
+                break
+            if event_id in self.joined:
+                continue
+            response = self.transport.post(f"{self.api_url}/events/{event_id}/join", headers=headers)
+            if response.status_code == 200:
+                self.joined.add(event_id)
+
+    def _measure(self, path, params, authenticated):
+        headers = {"Authorization": f"Bearer {self.token}"} if authenticated else {}
+        histogram = LatencyHistogram()
+        payload = 0
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            response = self.transport.get(f"{self.api_url}{path}", params=params, headers=headers)
+            body = response.content
+            histogram.record_seconds(time.perf_counter() - start)
+            payload = len(body)
+        return histogram.value_at_percentile(50) / 1000, payload
+
+    def run(self):
+        print(f"📐 Scaling benchmark against {self.base_url}: sizes {self.sizes}, {self.repeats} repeats per case")
+        # Each benchmark grows its own dataset; tokens from an older run may no longer be valid
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self._login_bench_user()
+        for size in self.sizes:
+            self._top_up(size, len(self._listing("/events")), len(self._listing("/clubs")))
+            event_ids = [event["event_id"] for event in self._listing("/events")]
+            clubs = len(self._listing("/clubs"))
+            n = len(event_ids)
+            self._grow_me_events(event_ids, n)
+            overhead, _ = self._measure(f"/events/{event_ids[0]}", {}, False)
+            print(f"\n📏 N={n} events, {clubs} clubs (target {size}): fixed per-request cost {overhead:.2f} ms")
+            for name, path, params, authenticated in self.cases():
+                latency, payload = self._measure(path, params, authenticated)
+                self.results.setdefault(name, []).append(
+                    {"n": clubs if path == "/clubs" else n, "target": size, "p50_ms": latency, "bytes": payload,
+                     "overhead_ms": overhead})
+        return self.report()
+
+    def report(self):
+        print(f"\n📈 Growth against N (log-log slope; >{self.superlinear_threshold:.2f} flagged super-linear)")
+        print(f"  {'case':<72} {'p50 ms @N':>24} {'latency':>8} {'payload':>8}")
+        flagged = []
+        summary = {}
+        for name, points in self.results.items():
+            ns = [p["n"] for p in points]
+            work = [max(p["p50_ms"] - p["overhead_ms"], 1e-3) for p in points]
+            latency_slope = loglog_slope(ns, work)
+            payload_slope = loglog_slope(ns, [p["bytes"] for p in points])
+            verdict = ""
+            # Below ~1 ms of real work the difference from the fixed cost is noise, not growth
+            if work[-1] < max(1.0, 0.25 * points[-1]["overhead_ms"]):
+                latency_slope = None
+                verdict = "flat"
+            elif latency_slope is not None and latency_slope > self.superlinear_threshold:
+                verdict = "⚠️ super-linear"
+                flagged.append(name)
+            summary[name] = {"points": points, "latency_slope": latency_slope, "payload_slope": payload_slope}
+            curve = " ".join(f"{p['p50_ms']:.1f}" for p in points)
+            print(f"  {name:<72} {curve:>24} {self._fmt(latency_slope):>8} {self._fmt(payload_slope):>8} {verdict}")
+        if flagged:
+            print(f"\n⚠️ Super-linear growth (missing index or unbounded response?): {', '.join(flagged)}")
+        else:
+            print("\n✅ No endpoint grows faster than linearly")
+        return summary, flagged
+
+    @staticmethod
+    def _fmt(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    def write(self, path, summary):
+        with open(path, "w") as f:
+            json.dump({"base_url": self.base_url, "sizes": self.sizes, "cases": summary}, f, indent=2)
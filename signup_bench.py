@@ -0,0 +1,271 @@
+"""Launch-spike benchmark for the signup relay against a local stand-in Google Form
+
+    python signup_bench.py --signups 5000 --clients 64 --form-latency-ms 80 --form-failure-rate 0.05
+
+A burst of signups (some sent twice) hits the relay as fast as `clients`
+threads allow; the report shows accepted signups per second and, from the
+stand-in form's receipt times, how long each accepted signup took to
+reach the form.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+from signup_relay import FORM_ENTRIES, SignupRelayServer
+
+
+class StandInFormHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html", headers=()):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode())
+        outcome = self.server.respond()
+        if outcome == "throttled":
+            return self._send(429, "Too Many Requests", headers=[("Retry-After", "1")])
+        if outcome == "failed":
+            return self._send(500, "Internal Server Error")
+        email = form.get(FORM_ENTRIES["email"], [""])[-1]
+        if not email or not form.get(FORM_ENTRIES["name"], [""])[-1]:
+            return self._send(400, "Missing required answers")
+        self.server.record(email)
+        self._send(200, "<html><body>Your response has been recorded.</body></html>")
+
+    def do_GET(self):
+        with self.server.lock:
+            stats = {"responses": self.server.responses, "first_received": self.server.first_received,
+                     "duplicates": self.server.duplicates, "failed": self.server.failed,
+                     "throttled": self.server.throttled}
+        self._send(200, json.dumps(stats), "application/json")
+
+
+class StandInFormServer(ThreadingHTTPServer):
+    """Google Forms formResponse stand-in with latency, 5xx failures and 429 throttling"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.02, failure_rate=0.0, throttle_rate=0.0,
+                 seed=0):
+        super().__init__((host, port), StandInFormHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.throttle_rate = throttle_rate
+        self.responses = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.throttled = 0
+        # Email -> wall-clock time of its first recorded response
+        self.first_received = {}
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def respond(self):
+        with self.lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            roll = self._rng.random()
+        time.sleep(delay)
+        with self.lock:
+            if roll < self.throttle_rate:
+                self.throttled += 1
+                return "throttled"
+            if roll < self.throttle_rate + self.failure_rate:
+                self.failed += 1
+                return "failed"
+        return "ok"
+
+    def record(self, email):
+        with self.lock:
+            self.responses += 1
+            if email in self.first_received:
+                self.duplicates += 1
+            else:
+                self.first_received[email] = time.time()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def _serve_form(options, connection):
+    server = StandInFormServer(**options)
+    connection.send(server.base_url)
+    connection.close()
+    server.serve_forever()
+
+
+def _serve_relay(options, connection):
+    server = SignupRelayServer(**options)
+    connection.send(server.base_url)
+    connection.close()
+    server.serve()
+
+
+def _start(target, options):
+    """Run a server in its own process (own GIL, like the offline API stand-in); returns (process, base_url)"""
+    context = multiprocessing.get_context("fork")
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=target, args=(options, child), daemon=True)
+    process.start()
+    return process, parent.recv()
+
+
+class SignupBenchmark:
+    """Burst signups into a SignupRelayServer and time acceptance and delivery to the form"""
+
+    def __init__(self, signups=2000, clients=32, duplicate_fraction=0.1, batch_size=50, concurrency=8,
+                 form_latency=0.05, form_jitter=0.02, form_failure_rate=0.0, form_throttle_rate=0.0,
+                 drain_timeout=300.0, queue_dir=None, seed=0):
+        self.signups = signups
+        self.clients = clients
+        self.duplicate_fraction = duplicate_fraction
+        self.relay_options = {"batch_size": batch_size, "concurrency": concurrency}
+        self.form_options = {"latency": form_latency, "jitter": form_jitter, "failure_rate": form_failure_rate,
+                             "throttle_rate": form_throttle_rate, "seed": seed}
+        self.drain_timeout = drain_timeout
+        self.queue_dir = queue_dir
+        self.seed = seed
+        self.transport = HTTPTransport(pool_size=clients, retries=0)
+        self.accept_latency = LatencyHistogram()
+        self.lag = LatencyHistogram(highest_value=3_600_000_000)
+        self.statuses = {}
+        # Email -> wall-clock time the relay accepted it
+        self.accepted_at = {}
+        self._lock = threading.Lock()
+
+    def submissions(self):
+        """Signup bodies in send order; duplicates resend an earlier email in another case"""
+        rng = random.Random(self.seed)
+        unique = [{"name": f"Jugador {i}", "email": f"beta_{i}@example.com",
+                   "city": rng.choice(["Madrid", "Barcelona", ""])} for i in range(self.signups)]
+        resends = [dict(body, email=body["email"].upper())
+                   for body in rng.sample(unique, int(self.signups * self.duplicate_fraction))]
+        bodies = unique + resends
+        rng.shuffle(bodies)
+        return bodies
+
+    def _submit(self, relay_url, body):
+        start = time.perf_counter()
+        try:
+            response = self.transport.post(f"{relay_url}/signup", json=body)
+            status = response.status_code
+        except Exception:
+            status = None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.accept_latency.record_seconds(elapsed)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 202:
+                self.accepted_at[body["email"].lower()] = time.time()
+
+    def _drain(self, form_url):
+        """Poll the stand-in form until every accepted signup arrived; returns its final stats"""
+        deadline = time.monotonic() + self.drain_timeout
+        while True:
+            stats = self.transport.get(f"{form_url}/stats").json()
+            if len(stats["first_received"]) >= len(self.accepted_at) or time.monotonic() > deadline:
+                return stats
+            time.sleep(0.2)
+
+    def run(self):
+        queue_dir = self.queue_dir or tempfile.mkdtemp(prefix="signup_queue_")
+        form, form_url = _start(_serve_form, self.form_options)
+        relay, relay_url = _start(_serve_relay, {"queue_dir": queue_dir, "form_url": f"{form_url}/formResponse",
+                                                 **self.relay_options})
+        bodies = self.submissions()
+        print(f"📨 Signup relay benchmark: {len(bodies)} submissions ({self.signups} unique) from {self.clients} "
+              f"clients; form latency {self.form_options['latency'] * 1000:.0f} ms, "
+              f"{self.form_options['failure_rate']:.0%} failures, {self.form_options['throttle_rate']:.0%} throttled")
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.clients) as pool:
+                list(pool.map(lambda body: self._submit(relay_url, body), bodies))
+            accept_elapsed = time.perf_counter() - start
+            stats = self._drain(form_url)
+            drain_elapsed = time.perf_counter() - start
+            health = self.transport.get(f"{relay_url}/health").json()
+        finally:
+            for process in (relay, form):
+                process.terminate()
+                process.join()
+            self.transport.close()
+            if not self.queue_dir:
+                shutil.rmtree(queue_dir, ignore_errors=True)
+        for email, accepted in self.accepted_at.items():
+            received = stats["first_received"].get(email)
+            if received is not None:
+                self.lag.record_seconds(max(0.0, received - accepted))
+        return self.report(len(bodies), accept_elapsed, drain_elapsed, stats, health)
+
+    def report(self, submitted, accept_elapsed, drain_elapsed, stats, health):
+        accepted = len(self.accepted_at)
+        delivered = sum(1 for email in self.accepted_at if email in stats["first_received"])
+        accept = self.accept_latency.percentiles((50, 99))
+        lag = self.lag.percentiles((50, 95, 99))
+        print(f"\n✅ Accepted {accepted} signups in {accept_elapsed:.2f}s: "
+              f"{accepted / accept_elapsed if accept_elapsed else 0:.0f} accepted/s, "
+              f"{submitted / accept_elapsed if accept_elapsed else 0:.0f} submissions/s; "
+              f"accept p50 {accept[50] / 1000:.1f} ms, p99 {accept[99] / 1000:.1f} ms")
+        print("  responses: " + ", ".join(f"{status or 'error'}: {count}" for status, count in sorted(
+            self.statuses.items(), key=lambda item: (item[0] is None, item[0] or 0))))
+        print(f"  queue: {health['fsyncs']} fsyncs for {health['accepted'] + health['delivered']} durable records, "
+              f"{health['retries']} retries ({health['throttled']} throttled), {health['dead']} dead letters")
+        print(f"📬 Delivered {delivered}/{accepted} to the form in {drain_elapsed:.2f}s; "
+              f"lag p50 {lag[50] / 1000:.0f} ms, p95 {lag[95] / 1000:.0f} ms, p99 {lag[99] / 1000:.0f} ms, "
+              f"max {self.lag.max_value / 1000:.0f} ms")
+        print(f"  form saw {stats['responses']} responses, {stats['duplicates']} duplicates, "
+              f"{stats['failed']} injected failures, {stats['throttled']} throttled")
+        ok = delivered == accepted and not stats["duplicates"]
+        if not ok:
+            print(f"⚠️ {accepted - delivered} accepted signups not delivered, {stats['duplicates']} duplicated")
+        return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the signup relay against a stand-in Google Form")
+    parser.add_argument("--signups", type=int, default=2000, help="unique signups in the burst")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent submitting clients")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="fraction of signups submitted twice")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8, help="form submissions the relay keeps in flight")
+    parser.add_argument("--form-latency-ms", type=float, default=50.0)
+    parser.add_argument("--form-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--form-failure-rate", type=float, default=0.0, help="fraction answered with 500")
+    parser.add_argument("--form-throttle-rate", type=float, default=0.0, help="fraction answered with 429")
+    parser.add_argument("--drain-timeout", type=float, default=300.0)
+    parser.add_argument("--queue-dir", help="keep the queue here instead of a temporary directory")
+    args = parser.parse_args(argv)
+
+    bench = SignupBenchmark(args.signups, args.clients, args.duplicates, args.batch_size, args.concurrency,
+                            args.form_latency_ms / 1000, args.form_jitter_ms / 1000, args.form_failure_rate,
+                            args.form_throttle_rate, args.drain_timeout, args.queue_dir)
+    return 0 if bench.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""Durable relay between the landing page's beta form and Google Forms
+
+    python signup_relay.py --port 8002 --queue-dir signup_queue --allow-origin https://chessevents.com
+
+POST /signup (JSON or form-encoded name, email, city) answers 202 once the
+signup is fsynced to the write-ahead queue, or 200 "duplicate" for an
+email already accepted. A background worker drains the queue to the form
+endpoint; GET /health reports queue depth and delivery counters.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from http_transport import HTTPTransport
+from latency_histogram import LatencyHistogram
+
+# Same form as frontend/src/config.ts (googleFormUrl / googleFormEntries)
+FORM_URL = ("https://docs.google.com/forms/u/0/d/e/1FAIpQLSfkU9vmFi2rVsd-t2RIWJzqpFp5YE0_vFOfSZdKspZ09U0b-w"
+            "/formResponse")
+FORM_ENTRIES = {"name": "entry.2005620554", "email": "entry.1045781291", "city": "entry.1065046570"}
+# Statuses worth another attempt; any other 4xx means the submission itself is wrong
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+# A signup is three short fields; anything much larger is not from the landing page
+MAX_BODY_BYTES = 4096
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+class WriteAheadQueue:
+    """Signup queue backed by an append-only JSONL log that is replayed on start
+
+    enqueue() and ack() return once their records are fsynced; concurrent
+    callers share a single fsync (group commit), so a burst costs a handful
+    of disk flushes rather than one per signup. Once `compact_after`
+    records have been acked the log is rewritten with just the pending
+    signups and the emails already delivered, which dedup still needs.
+    """
+
+    def __init__(self, directory, compact_after=10_000):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "signups.wal")
+        self.dead_letter_path = os.path.join(directory, "dead_letters.jsonl")
+        self.compact_after = compact_after
+        # Durable, not yet delivered signups in arrival order
+        self.pending = OrderedDict()
+        # Every email ever accepted, delivered or not
+        self.seen = set()
+        self.counters = {"accepted": 0, "duplicates": 0, "delivered": 0, "dead": 0, "fsyncs": 0, "compactions": 0,
+                         "compaction_failures": 0}
+        # Why the writer thread stopped, if it did; every later enqueue() then fails fast
+        self.failure = None
+        self._acked = 0
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._synced = threading.Condition(self._lock)
+        self._buffer = []
+        self._queued_seq = 0
+        self._synced_seq = 0
+        # (after_seq, through_seq, error) of groups the writer could not get on disk
+        self._failed = []
+        self._closed = False
+        self._recover()
+        self._file = open(self.path, "a")
+        self._writer = threading.Thread(target=self._write_loop, name="wal-writer", daemon=True)
+        self._writer.start()
+
+    def _recover(self):
+        if not os.path.exists(self.path):
+            return
+        valid = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final write from a crash: everything before it is intact
+                    break
+                valid += len(line)
+                self._apply(record)
+        if valid != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid)
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "enqueue":
+            self.pending[record["id"]] = record
+            self.seen.add(record["email"])
+        elif op == "ack":
+            if self.pending.pop(record["id"], None) is not None:
+                self._acked += 1
+        elif op == "seen":
+            self.seen.add(record["email"])
+
+    def _append(self, records):
+        """Queue records for the writer and wait until they are on disk (lock held by caller)"""
+        self._buffer.extend(records)
+        self._queued_seq += len(records)
+        seq = self._queued_seq
+        self._has_work.notify()
+        while self._synced_seq < seq:
+            if self._closed:
+                raise RuntimeError("queue closed")
+            self._synced.wait()
+        for after, through, error in self._failed:
+            if after < seq <= through:
+                raise OSError(f"write-ahead log write failed: {error}")
+
+    def _write_loop(self):
+        try:
+            self._write_groups()
+        except Exception as e:
+            # Fail every waiting and later enqueue() rather than leave them waiting on a writer that is gone
+            print(f"❌ Signup queue writer stopped: {type(e).__name__}: {e}")
+            with self._lock:
+                self.failure = f"{type(e).__name__}: {e}"
+                self._closed = True
+                self._synced.notify_all()
+
+    def _write_groups(self):
+        with self._lock:
+            while True:
+                while not self._buffer and not self._closed:
+                    self._has_work.wait()
+                if not self._buffer:
+                    return
+                records, self._buffer = self._buffer, []
+                seq = self._queued_seq
+                offset = self._file.tell()
+                error = None
+                # Write and fsync outside the lock so new signups keep queueing for the next group
+                self._lock.release()
+                try:
+                    self._file.write("".join(json.dumps(record) + "\n" for record in records))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except OSError as e:
+                    error = e
+                    self._discard_from(offset)
+                finally:
+                    self._lock.acquire()
+                if error is None:
+                    self.counters["fsyncs"] += 1
+                    for record in records:
+                        self._apply(record)
+                else:
+                    # Waiters of this group raise instead of hanging; the log holds none of it
+                    self._failed = self._failed[-99:] + [(self._synced_seq, seq, error)]
+                self._synced_seq = seq
+                self._synced.notify_all()
+                if self._acked >= self.compact_after:
+                    self._compact()
+
+    def _discard_from(self, offset):
+        """Drop a partly written group so the next one starts on a clean line"""
+        try:
+            self._file.close()
+        except OSError:
+            # The unflushed tail is dropped along with the close
+            pass
+        try:
+            os.truncate(self.path, offset)
+        except OSError:
+            pass
+        self._file = open(self.path, "a")
+
+    def _compact(self):
+        """Rewrite the log from memory; on failure (e.g. a full disk) keep appending to the old one"""
+        pending_emails = {record["email"] for record in self.pending.values()}
+        tmp = f"{self.path}.tmp"
+        # Either way, wait another compact_after acks before trying again
+        self._acked = 0
+        try:
+            with open(tmp, "w") as f:
+                for email in sorted(self.seen - pending_emails):
+                    f.write(json.dumps({"op": "seen", "email": email}) + "\n")
+                for record in self.pending.values():
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.counters["compaction_failures"] += 1
+            print(f"⚠️ Signup queue compaction failed, keeping the current log: {type(e).__name__}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._file.close()
+        self._file = open(self.path, "a")
+        self.counters["compactions"] += 1
+
+    def enqueue(self, name, email, city=""):
+        """Durably accept a signup; returns False if the email was already accepted"""
+        email = normalize_email(email)
+        with self._lock:
+            # Claimed before the write, so two concurrent submits of one email cannot both get in
+            if email in self.seen:
+                self.counters["duplicates"] += 1
+                return False
+            self.seen.add(email)
+            record = {"op": "enqueue", "id": uuid.uuid4().hex, "name": name.strip(), "email": email,
+                      "city": city.strip(), "ts": time.time()}
+            try:
+                self._append([record])
+            except (OSError, RuntimeError):
+                # Not durable, so not accepted: a resubmit must not be answered "duplicate"
+                self.seen.discard(email)
+                raise
+            self.counters["accepted"] += 1
+            return True
+
+    def take(self, limit, skip):
+        """Up to `limit` pending signups, oldest first, leaving out ids for which skip(id) is true"""
+        with self._lock:
+            batch = []
+            for record_id, record in self.pending.items():
+                if len(batch) >= limit:
+                    break
+                if not skip(record_id):
+                    batch.append(record)
+            return batch
+
+    def ack(self, delivered, dead=()):
+        """Remove delivered signups and dead letters from the queue in one fsync"""
+        if dead:
+            with open(self.dead_letter_path, "a") as f:
+                for record, reason in dead:
+                    f.write(json.dumps({**record, "reason": reason}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        ids = [record["id"] for record in delivered] + [record["id"] for record, _ in dead]
+        if not ids:
+            return
+        with self._lock:
+            self._append([{"op": "ack", "id": record_id} for record_id in ids])
+            self.counters["delivered"] += len(delivered)
+            self.counters["dead"] += len(dead)
+
+    def depth(self):
+        with self._lock:
+            return len(self.pending)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._has_work.notify()
+        self._writer.join()
+        self._file.close()
+
+
+class FormRelay:
+    """Drain a WriteAheadQueue into the Google Form, at most `concurrency` submissions in flight
+
+    The form takes one response per POST, so batching happens around it:
+    the worker takes up to `batch_size` signups, submits them concurrently
+    and acks the whole batch with one fsync. Retryable failures back off
+    exponentially with full jitter (at least Retry-After); a 429 pauses
+    the whole relay so a throttled form is not hammered further.
+    """
+
+    def __init__(self, queue, form_url=FORM_URL, entries=FORM_ENTRIES, batch_size=50, concurrency=4,
+                 max_attempts=8, backoff_base=0.5, backoff_cap=60.0, transport=None):
+        self.queue = queue
+        self.form_url = form_url
+        self.entries = entries
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.transport = transport or HTTPTransport(pool_size=concurrency, retries=0)
+        # Enqueue-to-delivery time; up to an hour
+        self.lag = LatencyHistogram(highest_value=3_600_000_000)
+        self.counters = {"submissions": 0, "retries": 0, "throttled": 0, "ack_failures": 0}
+        self.attempts = {}
+        self.retry_at = {}
+        self.pause_until = 0.0
+        # (delivered, dead) of a batch the form has but the queue could not ack yet
+        self._unacked = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="form-relay")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _waiting(self, record_id):
+        return self.retry_at.get(record_id, 0.0) > time.monotonic()
+
+    def _backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def _submit(self, record):
+        """(record, outcome, Retry-After seconds or None, error); outcome is delivered, retry or dead"""
+        data = {self.entries["name"]: record["name"], self.entries["email"]: record["email"]}
+        if record["city"]:
+            data[self.entries["city"]] = record["city"]
+        try:
+            response = self.transport.post(self.form_url, data=data, allow_redirects=False)
+        except Exception as e:
+            return record, "retry", None, f"{type(e).__name__}: {e}"
+        response.close()
+        # Google Forms answers a recorded response with 200; a redirect is its sign-in or error page
+        if response.status_code == 200:
+            return record, "delivered", None, None
+        retry_after = response.headers.get("Retry-After", "")
+        retry_after = float(retry_after) if retry_after.replace(".", "", 1).isdigit() else None
+        if response.status_code in RETRYABLE_STATUSES:
+            return record, "retry", retry_after, f"status {response.status_code}"
+        if 300 <= response.status_code < 400:
+            return record, "retry", retry_after, (f"status {response.status_code} to "
+                                                  f"{response.headers.get('Location') or 'no location'}")
+        return record, "dead", None, f"status {response.status_code}"
+
+    def _ack(self, delivered, dead):
+        """Ack a finished batch; if the queue cannot write it, hold it so the next cycle retries the ack"""
+        try:
+            self.queue.ack(delivered, dead)
+        except (OSError, RuntimeError) as e:
+            if self._unacked is None:
+                print(f"⚠️ Could not ack {len(delivered) + len(dead)} signups, retrying: {type(e).__name__}: {e}")
+            self._unacked = (delivered, dead)
+            self.counters["ack_failures"] += 1
+            return False
+        self._unacked = None
+        return True
+
+    def drain_once(self):
+        """Submit one batch; returns how many signups it contained"""
+        # Resubmitting an unacked batch would post it to the form twice: ack it first
+        if self._unacked is not None and not self._ack(*self._unacked):
+            return 0
+        wait = self.pause_until - time.monotonic()
+        if wait > 0:
+            self._stop.wait(wait)
+        batch = self.queue.take(self.batch_size, self._waiting)
+        if not batch:
+            return 0
+        delivered, dead = [], []
+        for record, outcome, retry_after, error in self._executor.map(self._submit, batch):
+            self.counters["submissions"] += 1
+            if outcome == "delivered":
+                delivered.append(record)
+                with self._lock:
+                    self.lag.record_seconds(time.time() - record["ts"])
+                self.attempts.pop(record["id"], None)
+                self.retry_at.pop(record["id"], None)
+                continue
+            attempt = self.attempts.get(record["id"], 0) + 1
+            if outcome == "dead" or attempt >= self.max_attempts:
+                dead.append((record, error))
+                self.attempts.pop(record["id"], None)
+                self.retry_at.pop(record["id"], None)
+                continue
+            self.attempts[record["id"]] = attempt
+            delay = self._backoff(attempt, retry_after)
+            self.retry_at[record["id"]] = time.monotonic() + delay
+            self.counters["retries"] += 1
+            if error == "status 429":
+                self.counters["throttled"] += 1
+                self.pause_until = max(self.pause_until, time.monotonic() + (retry_after or delay))
+        self._ack(delivered, dead)
+        return len(batch)
+
+    def _run(self, poll_interval):
+        while not self._stop.is_set():
+            if not self.drain_once():
+                self._stop.wait(poll_interval)
+
+    def start(self, poll_interval=0.05):
+        self._thread = threading.Thread(target=self._run, args=(poll_interval,), name="form-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        self.transport.close()
+
+    def health(self):
+        with self._lock:
+            pcts = self.lag.percentiles((50, 95, 99))
+        unacked = self._unacked
+        return {"pending": self.queue.depth(), "writer_failure": self.queue.failure,
+                "unacked": len(unacked[0]) + len(unacked[1]) if unacked else 0, **self.queue.counters, **self.counters,
+                "lag_p50_ms": pcts[50] / 1000, "lag_p95_ms": pcts[95] / 1000, "lag_p99_ms": pcts[99] / 1000}
+
+
+class PayloadTooLarge(ValueError):
+    """Request body over MAX_BODY_BYTES, answered with 413 without reading it"""
+
+
+class SignupHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _cors_headers(self):
+        if self.server.allow_origin:
+            self.send_header("Access-Control-Allow-Origin", self.server.allow_origin)
+            self.send_header("Vary", "Origin")
+
+    def _read_form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise PayloadTooLarge(length)
+        body = self.rfile.read(length)
+        if (self.headers.get("Content-Type") or "").startswith("application/json"):
+            data = json.loads(body or b"{}")
+            return {key: str(data.get(key) or "") for key in ("name", "email", "city")}
+        fields = parse_qs(body.decode())
+        return {key: fields.get(key, [""])[-1] for key in ("name", "email", "city")}
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/signup":
+            return self._send_json(404, {"detail": "Not Found"})
+        try:
+            form = self._read_form()
+        except PayloadTooLarge:
+            # The body is left unread, so the connection cannot carry another request
+            self.close_connection = True
+            return self._send_json(413, {"detail": f"Signup body over {MAX_BODY_BYTES} bytes"})
+        except (ValueError, UnicodeDecodeError):
+            return self._send_json(400, {"detail": "Malformed body"})
+        if not form["name"].strip():
+            return self._send_json(422, {"detail": "name is required"})
+        if not _EMAIL.match(form["email"].strip()):
+            return self._send_json(422, {"detail": "a valid email is required"})
+        if self.server.queue.depth() >= self.server.max_pending:
+            # Shed load before the disk fills up; the page can show a retry message
+            return self._send_json(503, {"detail": "Signup queue is full, try again shortly"})
+        try:
+            accepted = self.server.queue.enqueue(form["name"], form["email"], form["city"])
+        except (OSError, RuntimeError):
+            return self._send_json(503, {"detail": "Signup could not be saved, try again shortly"})
+        if accepted:
+            return self._send_json(202, {"status": "queued"})
+        return self._send_json(200, {"status": "duplicate"})
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/health":
+            return self._send_json(404, {"detail": "Not Found"})
+        health = self.server.relay.health()
+        # A stopped writer or a stuck ack needs attention even though the process still answers
+        return self._send_json(503 if health["writer_failure"] or health["unacked"] else 200, health)
+
+
+class SignupRelayServer(ThreadingHTTPServer):
+    """HTTP front of the relay: accepts signups into the queue while a FormRelay drains it"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0, queue_dir="signup_queue", form_url=FORM_URL, batch_size=50,
+                 concurrency=4, max_pending=100_000, allow_origin=None, verbose=False):
+        super().__init__((host, port), SignupHandler)
+        self.queue = WriteAheadQueue(queue_dir)
+        self.relay = FormRelay(self.queue, form_url, batch_size=batch_size, concurrency=concurrency)
+        self.max_pending = max_pending
+        self.allow_origin = allow_origin
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve(self):
+        self.relay.start()
+        try:
+            self.serve_forever()
+        finally:
+            self.relay.stop()
+            self.queue.close()
+            self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durable relay from the beta signup form to Google Forms")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--queue-dir", default="signup_queue", help="where the write-ahead queue lives")
+    parser.add_argument("--form-url", default=FORM_URL)
+    parser.add_argument("--batch-size", type=int, default=50, help="signups taken from the queue per ack")
+    parser.add_argument("--concurrency", type=int, default=4, help="form submissions in flight")
+    parser.add_argument("--max-pending", type=int, default=100_000, help="answer 503 above this queue depth")
+    parser.add_argument("--allow-origin", help="CORS origin of the landing page")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = SignupRelayServer(args.host, args.port, args.queue_dir, args.form_url, args.batch_size,
+                               args.concurrency, args.max_pending, args.allow_origin, args.verbose)
+    print(f"📨 Signup relay listening on {server.base_url}, {server.queue.depth()} signups pending "
+          f"in {args.queue_dir}")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import base64
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+from http_transport import HTTPTransport, endpoint_key
+from json_stream import peak_rss_mb
+from latency_histogram import HistogramRecorder
+from load_runner import LoadRunner
+
+
+def current_rss_mb():
+    """Resident set size right now (Linux /proc), else the high-water mark"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def open_descriptors():
+    """(open fds, open sockets) of this process, or (None, None) where /proc is unavailable"""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None, None
+    sockets = 0
+    for fd in fds:
+        with contextlib.suppress(OSError):
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                sockets += 1
+    return len(fds), sockets
+
+
+# Fewer buckets than this cannot show a trend with any confidence
+MIN_BUCKETS = 8
+
+
+def mann_kendall(values):
+    """(Kendall tau, one-sided p-value of a rising trend) by the Mann-Kendall test
+
+    tau is +1 for a steadily rising series, -1 falling, ~0 no trend. The
+    p-value comes from the normal approximation of the S statistic with
+    tie correction and continuity correction.
+    """
+    n = len(values)
+    if n < 3:
+        return 0.0, 1.0
+    s = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            s += (values[j] > values[i]) - (values[j] < values[i])
+    ties = {}
+    for value in values:
+        ties[value] = ties.get(value, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    z = (s - 1 if s > 0 else s + 1 if s < 0 else 0) / math.sqrt(variance) if variance > 0 else 0.0
+    return s / (n * (n - 1) / 2), 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def linear_fit(xs, ys):
+    """(slope, intercept) of the least-squares line through the points"""
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return slope, mean_y - slope * mean_x
+
+
+class SoakRecorder:
+    """Cut request latencies into fixed time buckets and append each bucket to a JSONL time series
+
+    Each line carries the bucket's encoded HistogramRecorder (so any
+    percentile can be recomputed later), per-endpoint summaries, and the
+    client's RSS and open socket count at the end of the bucket.
+    """
+
+    def __init__(self, path, bucket_seconds=60.0):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.recorder = HistogramRecorder()
+        self.bucket_start = time.time()
+        self.counters = {"iterations": 0, "test_failures": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+
+    def observe(self, method, url, status, elapsed, error):
+        with self._lock:
+            self.recorder.record(endpoint_key(method, url), status, elapsed)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def flush(self):
+        with self._lock:
+            recorder, self.recorder = self.recorder, HistogramRecorder()
+            counters, self.counters = self.counters, dict.fromkeys(self.counters, 0)
+            start, self.bucket_start = self.bucket_start, time.time()
+        errors = recorder.error_counts()
+        endpoints = {}
+        for endpoint, histogram in recorder.by_endpoint().items():
+            pcts = histogram.percentiles()
+            endpoints[endpoint] = {"count": histogram.total_count, "errors": errors.get(endpoint, 0),
+                                   "p50_ms": pcts[50] / 1000, "p95_ms": pcts[95] / 1000, "p99_ms": pcts[99] / 1000}
+        fds, sockets = open_descriptors()
+        line = {"start": start, "end": self.bucket_start, "rss_mb": round(current_rss_mb(), 2),
+                "open_fds": fds, "open_sockets": sockets, **counters, "endpoints": endpoints,
+                "histograms": base64.b64encode(recorder.encode()).decode()}
+        self._file.write(json.dumps(line) + "\n")
+        self._file.flush()
+        return line
+
+    def _run(self):
+        while not self._stop.wait(self.bucket_seconds - (time.time() - self.bucket_start)):
+            self.flush()
+
+    def start(self):
+        self._file = open(self.path, "w")
+        self.bucket_start = time.time()
+        self._thread = threading.Thread(target=self._run, name="soak-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+
+
+class SoakRunner:
+    """Repeat the functional suite (or a virtual-user load mix) for a fixed duration"""
+
+    def __init__(self, base_url, tester_factory, duration, bucket_seconds=60.0, output="soak_timeseries.jsonl",
+                 mode="functional", load_options=None):
+        self.base_url = base_url
+        self.tester_factory = tester_factory
+        self.duration = duration
+        self.mode = mode
+        self.load_options = load_options or {}
+        self.output = output
+        self.soak = SoakRecorder(output, bucket_seconds)
+
+    def _functional(self, deadline):
+        transport = HTTPTransport()
+        transport.add_observer(self.soak.observe)
+        try:
+            while time.time() < deadline:
+                tester = self.tester_factory(self.base_url, transport=transport)
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    tester.run_all_tests()
+                self.soak.count("iterations")
+                self.soak.count("test_failures", len(tester.failed_tests))
+        finally:
+            transport.close()
+
+    def _load(self):
+        runner = LoadRunner(self.base_url, self.tester_factory, ramp_up=min(30.0, self.duration / 10),
+                            steady=self.duration, ramp_down=min(15.0, self.duration / 20), **self.load_options)
+        runner.transport.add_observer(self.soak.observe)
+        with open(os.devnull, "w") as devnull:
+            runner.run(out=devnull)
+
+    def run(self):
+        print(f"🕰️ Soak ({self.mode}) against {self.base_url} for {self.duration:.0f}s, "
+              f"{self.soak.bucket_seconds:.0f}s buckets -> {self.output}")
+        self.soak.start()
+        try:
+            if self.mode == "load":
+                self._load()
+            else:
+                self._functional(time.time() + self.duration)
+        finally:
+            self.soak.stop()
+
+
+def load_series(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def complete_buckets(buckets, tolerance=0.9):
+    """The series without a final partial bucket (the flush at stop), which would skew the last point"""
+    if len(buckets) < 2:
+        return list(buckets)
+    durations = sorted(b["end"] - b["start"] for b in buckets[:-1])
+    nominal = durations[len(durations) // 2]
+    last = buckets[-1]
+    return list(buckets) if last["end"] - last["start"] >= tolerance * nominal else list(buckets[:-1])
+
+
+def detect_drift(buckets, latency_threshold=0.25, error_threshold=0.01, min_tau=0.5, alpha=0.05, min_count=5,
+                 min_buckets=MIN_BUCKETS):
+    """Endpoints and client resources whose trend over the run exceeds the thresholds
+
+    Latency drifts when p50 or p95 rises steadily (Kendall tau >= min_tau
+    and a Mann-Kendall p-value below `alpha`, over at least `min_buckets`
+    complete buckets) and the fitted line climbs by more than
+    `latency_threshold` relative to its start; error rate drifts when it
+    rises just as significantly and its fitted line climbs by more than
+    `error_threshold` absolute. RSS and open sockets are checked the same
+    way as latency, as a leak signal.
+    """
+    findings = []
+    buckets = complete_buckets(buckets)
+    if len(buckets) < min_buckets:
+        return findings
+    t0 = buckets[0]["start"]
+
+    def relative_rise(points):
+        xs = [(b_end - t0) / 3600 for b_end, _ in points]
+        ys = [value for _, value in points]
+        slope, intercept = linear_fit(xs, ys)
+        first, last = intercept + slope * xs[0], intercept + slope * xs[-1]
+        return (last - first) / first if first > 0 else 0.0, *mann_kendall(ys), slope
+
+    def trending(tau, p_value):
+        return tau >= min_tau and p_value < alpha
+
+    endpoints = sorted({endpoint for bucket in buckets for endpoint in bucket["endpoints"]})
+    for endpoint in endpoints:
+        rows = [(b["end"], b["endpoints"][endpoint]) for b in buckets
+                if b["endpoints"].get(endpoint, {}).get("count", 0) >= min_count]
+        if len(rows) < min_buckets:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            rise, tau, p_value, slope = relative_rise([(t, row[metric]) for t, row in rows])
+            if rise > latency_threshold and trending(tau, p_value):
+                findings.append({"subject": endpoint, "metric": metric, "change": rise, "tau": tau,
+                                 "p_value": p_value, "slope_per_hour": slope})
+        error_points = [(t, row["errors"] / row["count"]) for t, row in rows]
+        slope, intercept = linear_fit([(t - t0) / 3600 for t, _ in error_points], [e for _, e in error_points])
+        change = slope * (rows[-1][0] - rows[0][0]) / 3600
+        tau, p_value = mann_kendall([e for _, e in error_points])
+        if change > error_threshold and trending(tau, p_value):
+            findings.append({"subject": endpoint, "metric": "error_rate", "change": change, "tau": tau,
+                             "p_value": p_value, "slope_per_hour": slope})
+
+    for metric in ("rss_mb", "open_sockets"):
+        points = [(b["end"], b[metric]) for b in buckets if b.get(metric) is not None]
+        if len(points) < min_buckets:
+            continue
+        rise, tau, p_value, slope = relative_rise(points)
+        if rise > latency_threshold and trending(tau, p_value):
+            findings.append({"subject": "client", "metric": metric, "change": rise, "tau": tau,
+                             "p_value": p_value, "slope_per_hour": slope})
+    return findings
+
+
+def print_drift_report(buckets, findings):
+    if not buckets:
+        print("⚠️ Empty soak time series")
+        return
+    span = buckets[-1]["end"] - buckets[0]["start"]
+    requests = sum(sum(e["count"] for e in b["endpoints"].values()) for b in buckets)
+    print(f"\n🧭 Drift analysis over {len(buckets)} buckets ({span / 60:.1f} min, {requests} requests); "
+          f"RSS {buckets[0]['rss_mb']:.1f} -> {buckets[-1]['rss_mb']:.1f} MB, "
+          f"sockets {buckets[0]['open_sockets']} -> {buckets[-1]['open_sockets']}")
+    complete = len(complete_buckets(buckets))
+    if complete < MIN_BUCKETS:
+        print(f"⚠️ Only {complete} complete buckets; drift needs at least {MIN_BUCKETS} "
+              f"(soak longer or use a shorter --soak-bucket)")
+        return
+    if not findings:
+        print("✅ No endpoint drifted in latency or error rate, no client resource growth")
+        return
+    for finding in findings:
+        change = (f"+{finding['change'] * 100:.2f} pts" if finding["metric"] == "error_rate"
+                  else f"+{finding['change'] * 100:.0f}%")
+        print(f"⚠️ {finding['subject']} {finding['metric']}: {change} over the run "
+              f"(tau {finding['tau']:.2f}, p {finding['p_value']:.3g}, {finding['slope_per_hour']:+.3g}/h)")
@@ -0,0 +1,664 @@
+import argparse
+import bisect
+import gzip
+import hashlib
+import json
+import multiprocessing
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SESSION_TTL = timedelta(days=7)
+
+# Ratings served by the chess lookup routes; any other username gets stable synthetic ratings
+CANNED_RATINGS = {
+    ("chess_com", "gothamchess"): {"bullet": 2950, "blitz": 3008, "rapid": 2870},
+    ("lichess", "drnykterstein"): {"bullet": 3233, "blitz": 3131, "rapid": 2930},
+}
+CHESS_PLATFORMS = ("chess_com", "lichess")
+
+# Content-Encoding -> compressor; br and zstd only when their packages are installed
+CONTENT_ENCODERS = {"gzip": lambda payload: gzip.compress(payload, compresslevel=6)}
+if brotli is not None:
+    CONTENT_ENCODERS["br"] = lambda payload: brotli.compress(payload, quality=5)
+if zstandard is not None:
+    CONTENT_ENCODERS["zstd"] = lambda payload: zstandard.ZstdCompressor(level=3).compress(payload)
+# Smaller bodies go out uncompressed, as most servers do
+MIN_COMPRESS_BYTES = 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def skill_from_rating(rating):
+    if rating < 1200:
+        return "principiante"
+    if rating <= 1800:
+        return "medio"
+    return "avanzado"
+
+
+def _hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class EventIndex:
+    """Events with secondary indexes on city, skill level, type and date"""
+
+    def __init__(self):
+        self.events = {}
+        self.by_field = {"city": {}, "skill_level": {}, "event_type": {}}
+        self.by_date = []
+
+    def add(self, event):
+        self.events[event["event_id"]] = event
+        for field, index in self.by_field.items():
+            index.setdefault(event[field], set()).add(event["event_id"])
+        bisect.insort(self.by_date, (event["date"], event["event_id"]))
+
+    def query(self, city=None, skill_level=None, event_type=None, date_from=None, date_to=None):
+        """Event ids matching every given filter, ordered by date"""
+        candidates = None
+        for field, value in (("city", city), ("skill_level", skill_level), ("event_type", event_type)):
+            if value is None:
+                continue
+            ids = self.by_field[field].get(value, set())
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        low = bisect.bisect_left(self.by_date, (date_from,)) if date_from else 0
+        high = bisect.bisect_left(self.by_date, (date_to,)) if date_to else len(self.by_date)
+        ordered = (event_id for _, event_id in self.by_date[low:high])
+        if candidates is None:
+            return list(ordered)
+        return [event_id for event_id in ordered if event_id in candidates]
+
+
+class StandInState:
+    """In-memory data behind the stand-in API"""
+
+    def __init__(self, seed=0, upstream_delay=0.0, upstream_jitter=0.0, upstream_failure_rate=0.0):
+        self.lock = threading.RLock()
+        self.rng = random.Random(seed)
+        self.users = {}
+        self.users_by_email = {}
+        self.passwords = {}
+        self.sessions = {}
+        self.events = EventIndex()
+        self.joined_by_user = {}
+        self.organized_by_user = {}
+        self.clubs = []
+        self.seeded = False
+        self.upstream_delay = self.upstream_jitter = self.upstream_failure_rate = 0.0
+        self._create_existing_chess_user()
+        # Simulated Chess.com/Lichess profile APIs behind lookup, link and refresh
+        self.upstream_delay = upstream_delay
+        self.upstream_jitter = upstream_jitter
+        self.upstream_failure_rate = upstream_failure_rate
+        self._upstream_rng = random.Random(f"{seed}:upstream")
+
+    def _create_existing_chess_user(self):
+        user = self.create_user({
+            "email": "testchess@example.com",
+            "password": "test123",
+            "name": "Test Chess",
+            "user_type": "user",
+            "skill_level": "avanzado",
+            "city": "Madrid",
+        })
+        user["chess_com_username"] = "gothamchess"
+        user["chess_ratings"] = {"chess_com": self.lookup_rating("chess_com", "gothamchess")}
+
+    # Users and sessions
+
+    def create_user(self, payload):
+        email = (payload.get("email") or "").strip().lower()
+        if not email or not payload.get("password") or not payload.get("name"):
+            raise ApiError(422, "email, password and name are required")
+        with self.lock:
+            if email in self.users_by_email:
+                raise ApiError(400, "Email already registered")
+            user = {
+                "user_id": f"user_{uuid.uuid4().hex[:12]}",
+                "email": email,
+                "name": payload["name"],
+                "user_type": payload.get("user_type", "user"),
+                "skill_level": payload.get("skill_level", "principiante"),
+                "city": payload.get("city", ""),
+                "bio": payload.get("bio", ""),
+                "picture": None,
+                "chess_com_username": None,
+                "lichess_username": None,
+                "chess_ratings": {},
+                "created_at": _now(),
+            }
+            self.users[user["user_id"]] = user
+            self.users_by_email[email] = user["user_id"]
+            self.passwords[user["user_id"]] = _hash_password(payload["password"])
+            if user["user_type"] == "club":
+                self.clubs.append(user["user_id"])
+            return user
+
+    def login(self, email, password):
+        with self.lock:
+            user_id = self.users_by_email.get((email or "").strip().lower())
+            if user_id is None or self.passwords[user_id] != _hash_password(password or ""):
+                raise ApiError(401, "Invalid credentials")
+            return self.users[user_id]
+
+    def new_session(self, user_id):
+        token = f"session_{uuid.uuid4().hex}"
+        with self.lock:
+            self.sessions[token] = (user_id, datetime.now(timezone.utc) + SESSION_TTL)
+        return token
+
+    def user_for_token(self, token):
+        with self.lock:
+            session = self.sessions.get(token)
+            if session is None:
+                return None
+            user_id, expires = session
+            if expires < datetime.now(timezone.utc):
+                del self.sessions[token]
+                return None
+            return self.users.get(user_id)
+
+    # Events
+
+    def create_event(self, organizer, payload):
+        required = ("title", "city", "date", "time", "event_type", "skill_level")
+        missing = [field for field in required if not payload.get(field)]
+        if missing:
+            raise ApiError(422, f"Missing fields: {', '.join(missing)}")
+        event = {
+            "event_id": f"event_{uuid.uuid4().hex[:12]}",
+            "title": payload["title"],
+            "description": payload.get("description", ""),
+            "city": payload["city"],
+            "address": payload.get("address", ""),
+            "date": payload["date"],
+            "time": payload["time"],
+            "event_type": payload["event_type"],
+            "skill_level": payload["skill_level"],
+            "max_seats": int(payload.get("max_seats", 10)),
+            "organizer_id": organizer["user_id"],
+            "organizer_name": organizer["name"],
+            "attendees": [],
+            "created_at": _now(),
+        }
+        with self.lock:
+            self.events.add(event)
+            self.organized_by_user.setdefault(organizer["user_id"], []).append(event["event_id"])
+        return event
+
+    def event_view(self, event):
+        view = dict(event)
+        view["attendees"] = list(event["attendees"])
+        view["attendee_count"] = len(event["attendees"])
+        view["seats_left"] = max(0, event["max_seats"] - len(event["attendees"]))
+        return view
+
+    def get_event(self, event_id):
+        event = self.events.events.get(event_id)
+        if event is None:
+            raise ApiError(404, "Event not found")
+        return event
+
+    def list_events(self, query):
+        date_from = date_to = None
+        date_filter = query.get("date_filter")
+        if date_filter:
+            today = date.today()
+            spans = {"hoy": 1, "semana": 7, "mes": 30}
+            if date_filter not in spans:
+                raise ApiError(422, f"Unknown date_filter {date_filter}")
+            date_from = today.isoformat()
+            date_to = (today + timedelta(days=spans[date_filter])).isoformat()
+        with self.lock:
+            ids = self.events.query(query.get("city"), query.get("skill_level"), query.get("event_type"),
+                                    date_from, date_to)
+            return [self.event_view(self.events.events[event_id]) for event_id in ids]
+
+    def join_event(self, user, event_id):
+        with self.lock:
+            event = self.get_event(event_id)
+            if user["user_id"] in event["attendees"]:
+                raise ApiError(400, "Already joined")
+            if len(event["attendees"]) >= event["max_seats"]:
+                raise ApiError(400, "Event is full")
+            event["attendees"].append(user["user_id"])
+            self.joined_by_user.setdefault(user["user_id"], []).append(event_id)
+            return {"message": "Joined event", "event_id": event_id, "seats_left":
+                    event["max_seats"] - len(event["attendees"])}
+
+    def my_events(self, user):
+        with self.lock:
+            return {
+                "joined": [self.event_view(self.events.events[i]) for i in self.joined_by_user.get(user["user_id"], [])],
+                "organized": [self.event_view(self.events.events[i])
+                              for i in self.organized_by_user.get(user["user_id"], [])],
+            }
+
+    # Seed data
+
+    def seed(self):
+        with self.lock:
+            if not self.seeded:
+                cities = ["Barcelona", "Madrid", "Valencia", "Sevilla"]
+                clubs = []
+                for i, city in enumerate(cities):
+                    clubs.append(self.create_user({
+                        "email": f"club{i}@sce.example.com",
+                        "password": "clubpass",
+                        "name": f"Club de Ajedrez {city}",
+                        "user_type": "club",
+                        "skill_level": "avanzado",
+                        "city": city,
+                    }))
+                today = date.today()
+                types = ["casual", "torneo", "casual"]
+                levels = ["principiante", "medio", "avanzado"]
+                for i in range(12):
+                    club = clubs[i % len(clubs)]
+                    self.create_event(club, {
+                        "title": f"{'Torneo' if types[i % 3] == 'torneo' else 'Partidas'} en {club['city']} #{i + 1}",
+                        "description": "Evento de ajedrez presencial",
+                        "city": club["city"],
+                        "address": f"Calle Mayor {i + 1}",
+                        "date": (today + timedelta(days=i * 3)).isoformat(),
+                        "time": "18:00",
+                        "event_type": types[i % 3],
+                        "skill_level": levels[i % 3],
+                        "max_seats": 8 + i,
+                    })
+                self.seeded = True
+            return {"message": "Seed data ready", "event_count": len(self.events.events),
+                    "club_count": len(self.clubs)}
+
+    # Chess accounts
+
+    def lookup_rating(self, platform, username):
+        if platform not in CHESS_PLATFORMS:
+            raise ApiError(400, "Unknown platform")
+        if not re.fullmatch(r"[A-Za-z0-9_-]{2,30}", username) or username.lower().startswith("missing"):
+            raise ApiError(404, f"User {username} not found on {platform}")
+        self._call_upstream(platform)
+        ratings = CANNED_RATINGS.get((platform, username.lower()))
+        if ratings is None:
+            rng = random.Random(f"{platform}:{username.lower()}")
+            base = rng.randint(800, 2400)
+            ratings = {mode: base + rng.randint(-150, 150) for mode in ("bullet", "blitz", "rapid")}
+        best = max(ratings.values())
+        return {"platform": platform, "username": username, "ratings": dict(ratings), "best_rating": best,
+                "skill_level": skill_from_rating(best), "fetched_at": _now()}
+
+    def _call_upstream(self, platform):
+        """Delay (and occasionally fail) like a third-party profile API would"""
+        if self.upstream_delay or self.upstream_jitter:
+            delay = self.upstream_delay + self._upstream_rng.uniform(-self.upstream_jitter, self.upstream_jitter)
+            if delay > 0:
+                time.sleep(delay)
+        if self.upstream_failure_rate and self._upstream_rng.random() < self.upstream_failure_rate:
+            raise ApiError(502, f"{platform} profile API unavailable")
+
+    def link_account(self, user, platform, username):
+        rating = self.lookup_rating(platform, username)
+        with self.lock:
+            user[f"{platform}_username"] = username
+            user["chess_ratings"][platform] = rating
+            user["skill_level"] = skill_from_rating(max(r["best_rating"] for r in user["chess_ratings"].values()))
+        return {"message": f"Linked {platform} account", "rating_data": rating}
+
+    def refresh_ratings(self, user):
+        linked = [(p, user[f"{p}_username"]) for p in CHESS_PLATFORMS if user.get(f"{p}_username")]
+        if not linked:
+            raise ApiError(400, "No chess accounts linked")
+        results = []
+        for platform, username in linked:
+            # A platform whose profile API fails is left out; the others still refresh
+            try:
+                results.append(self.lookup_rating(platform, username))
+            except ApiError as e:
+                if e.status != 502:
+                    raise
+        with self.lock:
+            for rating in results:
+                user["chess_ratings"][rating["platform"]] = rating
+        return {"message": "Ratings refreshed", "results": results}
+
+    def unlink_account(self, user, platform):
+        if platform not in CHESS_PLATFORMS:
+            raise ApiError(400, "Unknown platform")
+        with self.lock:
+            user[f"{platform}_username"] = None
+            user["chess_ratings"].pop(platform, None)
+        return {"message": f"Unlinked {platform} account"}
+
+
+def public_user(user):
+    view = dict(user)
+    view["chess_ratings"] = dict(user["chess_ratings"])
+    return view
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes of the Social Chess API, served from StandInState"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    # Buffer headers and body into one write; flushed after each request
+    wbufsize = -1
+    server_version = "SocialChessStandIn/1.0"
+
+    ROUTES = [
+        ("POST", r"/api/seed", "seed"),
+        ("GET", r"/api/events", "list_events"),
+        ("POST", r"/api/events", "create_event"),
+        ("GET", r"/api/events/(?P<event_id>[^/]+)", "get_event"),
+        ("POST", r"/api/events/(?P<event_id>[^/]+)/join", "join_event"),
+        ("POST", r"/api/auth/register", "register"),
+        ("POST", r"/api/auth/login", "login"),
+        ("GET", r"/api/auth/me", "auth_me"),
+        ("GET", r"/api/me/events", "my_events"),
+        ("GET", r"/api/clubs", "list_clubs"),
+        ("GET", r"/api/clubs/(?P<club_id>[^/]+)", "get_club"),
+        ("PUT", r"/api/users/me", "update_me"),
+        ("GET", r"/api/users/(?P<user_id>[^/]+)", "get_user"),
+        ("GET", r"/api/chess/lookup/(?P<platform>[^/]+)/(?P<username>[^/]+)", "chess_lookup"),
+        ("POST", r"/api/chess/link", "chess_link"),
+        ("POST", r"/api/chess/refresh", "chess_refresh"),
+        ("DELETE", r"/api/chess/unlink/(?P<platform>[^/]+)", "chess_unlink"),
+    ]
+    COMPILED_ROUTES = [(method, re.compile(pattern + "$"), name) for method, pattern, name in ROUTES]
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _dispatch(self, method):
+        self._set_cookies = []
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            self.server.inject_latency()
+            for route_method, pattern, name in self.COMPILED_ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    status, body = 200, getattr(self, f"route_{name}")(**match.groupdict())
+                    break
+            else:
+                raise ApiError(404, "Not Found")
+        except ApiError as e:
+            status, body = e.status, {"detail": e.detail}
+        except (ValueError, KeyError) as e:
+            status, body = 422, {"detail": str(e)}
+        self._send_json(status, body, validate=method == "GET" and status == 200)
+
+    def _content_encoding(self, payload):
+        """First encoding in the request's Accept-Encoding that the stand-in can produce, if worth it"""
+        if len(payload) < MIN_COMPRESS_BYTES:
+            return None
+        for token in (self.headers.get("Accept-Encoding") or "").split(","):
+            coding, _, params = token.strip().partition(";")
+            if coding.strip().lower() in CONTENT_ENCODERS and params.replace(" ", "") != "q=0":
+                return coding.strip().lower()
+        return None
+
+    def _send_json(self, status, body, validate=False):
+        payload = json.dumps(body).encode()
+        etag = None
+        if validate:
+            # Weak validator over the body, so conditional GETs can be answered with 304
+            etag = f'W/"{hashlib.sha1(payload).hexdigest()[:16]}"'
+            if etag in (self.headers.get("If-None-Match") or "").split(", "):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        encoding = self._content_encoding(payload)
+        if encoding:
+            payload = CONTENT_ENCODERS[encoding](payload)
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(payload)))
+        for cookie in self._set_cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # Request helpers
+
+    def json_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def current_user(self, required=True):
+        token = None
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            token = auth[len("Bearer "):]
+        elif self.headers.get("Cookie"):
+            cookie = SimpleCookie(self.headers["Cookie"]).get("session_token")
+            token = cookie.value if cookie else None
+        user = self.state.user_for_token(token) if token else None
+        if user is None and required:
+            raise ApiError(401, "Not authenticated")
+        return user
+
+    def start_session(self, user):
+        token = self.state.new_session(user["user_id"])
+        max_age = int(SESSION_TTL.total_seconds())
+        self._set_cookies.append(f"session_token={token}; Path=/; Max-Age={max_age}; HttpOnly; SameSite=Lax")
+        return token
+
+    # Routes
+
+    def route_seed(self):
+        return self.state.seed()
+
+    def route_list_events(self):
+        return self.state.list_events(self.query)
+
+    def route_create_event(self):
+        event = self.state.create_event(self.current_user(), self.json_body())
+        return self.state.event_view(event)
+
+    def route_get_event(self, event_id):
+        with self.state.lock:
+            return self.state.event_view(self.state.get_event(event_id))
+
+    def route_join_event(self, event_id):
+        return self.state.join_event(self.current_user(), event_id)
+
+    def route_register(self):
+        user = self.state.create_user(self.json_body())
+        self.start_session(user)
+        return public_user(user)
+
+    def route_login(self):
+        payload = self.json_body()
+        user = self.state.login(payload.get("email"), payload.get("password"))
+        self.start_session(user)
+        return public_user(user)
+
+    def route_auth_me(self):
+        return public_user(self.current_user())
+
+    def route_my_events(self):
+        return self.state.my_events(self.current_user())
+
+    def route_list_clubs(self):
+        with self.state.lock:
+            return [public_user(self.state.users[club_id]) for club_id in self.state.clubs]
+
+    def route_get_club(self, club_id):
+        with self.state.lock:
+            club = self.state.users.get(club_id)
+            if club is None or club["user_type"] != "club":
+                raise ApiError(404, "Club not found")
+            view = public_user(club)
+            view["events"] = [self.state.event_view(self.state.events.events[i])
+                              for i in self.state.organized_by_user.get(club_id, [])]
+            return view
+
+    def route_update_me(self):
+        user = self.current_user()
+        payload = self.json_body()
+        with self.state.lock:
+            for field in ("name", "bio", "city", "skill_level", "picture"):
+                if field in payload:
+                    user[field] = payload[field]
+        return public_user(user)
+
+    def route_get_user(self, user_id):
+        user = self.state.users.get(user_id)
+        if user is None:
+            raise ApiError(404, "User not found")
+        return public_user(user)
+
+    def route_chess_lookup(self, platform, username):
+        return self.state.lookup_rating(platform, username)
+
+    def route_chess_link(self):
+        payload = self.json_body()
+        return self.state.link_account(self.current_user(), payload.get("platform"), payload.get("username", ""))
+
+    def route_chess_refresh(self):
+        return self.state.refresh_ratings(self.current_user())
+
+    def route_chess_unlink(self, platform):
+        return self.state.unlink_account(self.current_user(), platform)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in for the Social Chess API with optional latency/jitter injection"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, seed=0, verbose=False,
+                 upstream_delay=0.0, upstream_jitter=0.0, upstream_failure_rate=0.0):
+        super().__init__((host, port), StandInHandler)
+        self.state = StandInState(seed, upstream_delay, upstream_jitter, upstream_failure_rate)
+        self.latency = latency
+        self.jitter = jitter
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_latency(self):
+        if self.latency or self.jitter:
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+    def start(self):
+        """Serve from a background thread; returns the base URL"""
+        self._thread = threading.Thread(target=self.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve_in_child(options, connection):
+    server = StandInServer(**options)
+    connection.send(server.base_url)
+    connection.close()
+    server.serve_forever()
+
+
+def start_in_process(**options):
+    """Run a StandInServer in its own process so it does not share the tester's GIL
+
+    Returns (process, base_url); terminate the process when done.
+    """
+    context = multiprocessing.get_context("fork")
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_serve_in_child, args=(options, child), daemon=True)
+    process.start()
+    base_url = parent.recv()
+    return process, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Social Chess Events API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter around the delay")
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0,
+                        help="delay of each simulated Chess.com/Lichess profile call")
+    parser.add_argument("--upstream-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--upstream-failure-rate", type=float, default=0.0,
+                        help="fraction of profile calls that fail with 502")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.host, args.port, args.latency_ms / 1000, args.jitter_ms / 1000, args.seed,
+                           args.verbose, args.upstream_delay_ms / 1000, args.upstream_jitter_ms / 1000,
+                           args.upstream_failure_rate)
+    print(f"♟️ Social Chess stand-in listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
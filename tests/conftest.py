@@ -0,0 +1,204 @@
+"""pytest fixtures and duration-balanced sharding for the SocialChessAPITester scenarios
+
+Without --base-url each test process starts its own offline stand-in, so
+shards and xdist workers never share server state. Split the suite over
+processes with --num-shards/--shard-id (or `python -m tests.shards -n N`);
+shards are balanced on the per-test durations recorded by
+--store-durations.
+"""
+import json
+import os
+import uuid
+
+import pytest
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from backend_test import SocialChessAPITester
+from http_transport import HTTPTransport
+from stand_in_server import start_in_process
+
+DEFAULT_DURATIONS = ".test_durations.json"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("social chess API")
+    group.addoption("--base-url", default=os.environ.get("CHESS_API_URL"),
+                    help="API under test (default: start an offline stand-in per process)")
+    group.addoption("--num-shards", type=int, default=1, help="split the suite into this many shards")
+    group.addoption("--shard-id", type=int, default=0, help="0-based shard this process runs")
+    group.addoption("--durations-path", default=DEFAULT_DURATIONS,
+                    help="per-test durations used to balance shards (relative to the rootdir)")
+    group.addoption("--store-durations", action="store_true",
+                    help="merge this run's per-test durations into --durations-path")
+
+
+def _durations_path(config):
+    return os.path.join(str(config.rootpath), config.getoption("durations_path"))
+
+
+def load_durations(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def assign_shards(nodeids, durations, num_shards):
+    """nodeid -> shard, greedily placing the longest tests on the least loaded shard
+
+    Tests without a recorded duration count as the mean of the known ones
+    (1s when nothing is known yet), so a fresh suite splits by count.
+    """
+    known = [durations[nodeid] for nodeid in nodeids if nodeid in durations]
+    fallback = sum(known) / len(known) if known else 1.0
+    loads = [0.0] * num_shards
+    assignment = {}
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-durations.get(nodeid, fallback), nodeid)):
+        shard = min(range(num_shards), key=lambda index: (loads[index], index))
+        assignment[nodeid] = shard
+        loads[shard] += durations.get(nodeid, fallback)
+    return assignment
+
+
+class DurationRecorder:
+    """Collects setup+call+teardown time per test and merges it into the durations file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        # Setup counts too: the first test to touch a session fixture pays for registering the user
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if not self.durations:
+            return
+        # Shards finish in any order: merge into what the others wrote, one shard at a time
+        with open(f"{self.path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            durations = load_durations(self.path)
+            durations.update({nodeid: round(seconds, 4) for nodeid, seconds in self.durations.items()})
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(dict(sorted(durations.items())), f, indent=1)
+            os.replace(tmp, self.path)
+
+
+def pytest_configure(config):
+    num_shards, shard_id = config.getoption("num_shards"), config.getoption("shard_id")
+    if num_shards < 1 or not 0 <= shard_id < num_shards:
+        raise pytest.UsageError(f"--shard-id must be in [0, {num_shards}), got {shard_id}")
+    # Under xdist only the controller sees every worker's reports
+    if config.getoption("store_durations") and not os.environ.get("PYTEST_XDIST_WORKER"):
+        config.pluginmanager.register(DurationRecorder(_durations_path(config)), "chess-durations")
+
+
+def pytest_collection_modifyitems(config, items):
+    num_shards = config.getoption("num_shards")
+    if num_shards == 1:
+        return
+    shard_id = config.getoption("shard_id")
+    assignment = assign_shards([item.nodeid for item in items], load_durations(_durations_path(config)),
+                               num_shards)
+    selected = [item for item in items if assignment[item.nodeid] == shard_id]
+    deselected = [item for item in items if assignment[item.nodeid] != shard_id]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def worker_tag():
+    """Unique per process and call, so parallel workers never register the same email"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER") or f"s{os.environ.get('CHESS_SHARD_ID', 0)}"
+    return f"{worker}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def user_tag():
+    return worker_tag()
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    url = request.config.getoption("base_url")
+    if url:
+        yield url.rstrip("/")
+        return
+    server, url = start_in_process()
+    try:
+        yield url
+    finally:
+        server.terminate()
+        server.join()
+
+
+@pytest.fixture(scope="session")
+def transport():
+    transport = HTTPTransport()
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def tester(base_url, transport):
+    """A fresh tester per test, so one failure's bookkeeping never leaks into the next"""
+    return SocialChessAPITester(base_url, transport=transport)
+
+
+@pytest.fixture
+def check(tester):
+    """Run a tester scenario and fail with the details it logged"""
+    def run(scenario):
+        passed = scenario()
+        failures = "; ".join(f"{failure['test']}: {failure['error']}" for failure in tester.failed_tests)
+        assert passed and not tester.failed_tests, failures or f"{scenario.__name__} returned {passed!r}"
+    return run
+
+
+@pytest.fixture(scope="session")
+def seeded(base_url, transport):
+    seeder = SocialChessAPITester(base_url, transport=transport)
+    assert seeder.test_seed_data(), "Seeding the API failed"
+
+
+def _register(base_url, transport):
+    user = SocialChessAPITester(base_url, transport=transport)
+    user.user_tag = worker_tag()
+    assert user.test_user_registration(), f"Registering a user failed: {user.failed_tests}"
+    assert user.test_user_login(), f"Logging in failed: {user.failed_tests}"
+    return user
+
+
+@pytest.fixture(scope="session")
+def session_user(base_url, transport):
+    """One registered and logged-in user shared by every test in this process"""
+    return _register(base_url, transport)
+
+
+@pytest.fixture(scope="session")
+def auth_token(session_user):
+    return session_user.session_token
+
+
+@pytest.fixture
+def user_tester(tester, session_user, auth_token):
+    """A tester acting as the session user"""
+    tester.user_data = session_user.user_data
+    tester.session_token = auth_token
+    return tester
+
+
+@pytest.fixture
+def fresh_user_tester(tester, base_url, transport):
+    """A tester acting as a user of its own, for scenarios that change account state"""
+    user = _register(base_url, transport)
+    tester.user_data = user.user_data
+    tester.session_token = user.session_token
+    return tester
@@ -0,0 +1,47 @@
+"""Run the pytest suite as N duration-balanced shards in parallel processes
+
+    python -m tests.shards -n 4 [-- extra pytest args]
+
+Each shard is its own pytest process (with its own offline stand-in unless
+--base-url is passed through) and records its durations, so the next run
+balances on them.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API test suite in parallel shards")
+    parser.add_argument("-n", "--num-shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER, help="arguments passed on to pytest (after --)")
+    args = parser.parse_args(argv)
+    extra = args.pytest_args[1:] if args.pytest_args[:1] == ["--"] else args.pytest_args
+
+    start = time.perf_counter()
+    shards = []
+    for shard_id in range(args.num_shards):
+        command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", f"--num-shards={args.num_shards}",
+                   f"--shard-id={shard_id}", "--store-durations", *extra]
+        env = {**os.environ, "CHESS_SHARD_ID": str(shard_id)}
+        shards.append((shard_id, time.perf_counter(), subprocess.Popen(
+            command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)))
+
+    failed = 0
+    for shard_id, started, process in shards:
+        output, _ = process.communicate()
+        elapsed = time.perf_counter() - started
+        summary = output.strip().splitlines()[-1] if output.strip() else "no output"
+        print(f"{'✅' if process.returncode in (0, 5) else '❌'} shard {shard_id}: {summary} ({elapsed:.1f}s)")
+        # 5: nothing collected, which a small suite split over many shards can hit
+        if process.returncode not in (0, 5):
+            failed += 1
+            print(output)
+    print(f"⏱️ {args.num_shards} shards in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
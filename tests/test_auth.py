@@ -0,0 +1,19 @@
+def test_user_registration(tester, check, user_tag):
+    tester.user_tag = user_tag
+    check(tester.test_user_registration)
+
+
+def test_user_login(user_tester, check):
+    check(user_tester.test_user_login)
+
+
+def test_auth_me(user_tester, check):
+    check(user_tester.test_auth_me)
+
+
+def test_user_profile(user_tester, check):
+    check(user_tester.test_user_profile)
+
+
+def test_existing_chess_user(tester, check):
+    check(tester.test_existing_chess_user)
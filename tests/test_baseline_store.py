@@ -0,0 +1,60 @@
+import os
+import random
+
+from baseline_store import BaselineStore, bootstrap_ratios, compare
+from latency_histogram import HistogramRecorder
+
+ENDPOINT = "GET /api/events"
+
+
+def _recorder(scale, count, seed):
+    rng = random.Random(seed)
+    recorder = HistogramRecorder()
+    for _ in range(count):
+        recorder.record(ENDPOINT, 200, rng.lognormvariate(0, 0.3) * scale)
+    return recorder
+
+
+def test_same_distribution_is_not_a_regression():
+    rows = compare(_recorder(0.010, 500, 1), _recorder(0.010, 500, 2))
+    assert [row["verdict"] for row in rows] == ["ok"]
+    low, high = rows[0]["p50_ci"]
+    assert low < 1.0 < high
+
+
+def test_slower_distribution_regresses():
+    rows = compare(_recorder(0.010, 500, 1), _recorder(0.015, 500, 2), threshold=0.2)
+    assert rows[0]["regressed"] and rows[0]["verdict"] == "REGRESSED"
+    assert rows[0]["p50_ci"][0] > 1.2
+
+
+def test_bootstrap_interval_brackets_the_true_ratio():
+    base = _recorder(0.010, 1000, 3).by_endpoint()[ENDPOINT]
+    current = _recorder(0.020, 1000, 4).by_endpoint()[ENDPOINT]
+    intervals = bootstrap_ratios(base, current, (50, 95))
+    for low, high in intervals.values():
+        assert 1.8 < low < 2.0 < high < 2.2
+
+
+def test_too_few_samples_are_insufficient_not_ok():
+    rows = compare(_recorder(0.010, 10, 1), _recorder(0.050, 10, 2), min_count=20)
+    assert rows[0]["insufficient"] and not rows[0]["regressed"]
+    assert compare(_recorder(0.010, 10, 1), _recorder(0.010, 10, 2), min_count=5)[0]["verdict"] == "ok"
+
+
+def test_new_endpoint_has_no_verdict_against_baseline():
+    current = _recorder(0.010, 50, 1)
+    current.record("GET /api/clubs", 200, 0.01)
+    verdicts = {row["endpoint"]: row["verdict"] for row in compare(_recorder(0.010, 50, 2), current)}
+    assert verdicts["GET /api/clubs"] == "new"
+
+
+def test_store_round_trip_and_index_rebuild(tmp_path):
+    store = BaselineStore(str(tmp_path))
+    store.append(_recorder(0.010, 50, 1), run_id="first", metadata={"mode": "load"})
+    store.append(_recorder(0.020, 50, 2), run_id="second")
+    assert store.entry("first")["mode"] == "load"
+    assert store.load().by_endpoint()[ENDPOINT].total_count == 50
+    os.remove(store.index_path)
+    assert [entry["run_id"] for entry in store.rebuild_index()] == ["first", "second"]
+    assert store.load("first").encode() == _recorder(0.010, 50, 1).encode()
@@ -0,0 +1,68 @@
+import json
+from types import SimpleNamespace
+
+import requests
+from requests.adapters import BaseAdapter
+from urllib3 import HTTPHeaderDict
+
+from cassette import (REDACTED, Cassette, RecordingAdapter, ReplayAdapter, build_response, fingerprint, redact_body,
+                      redact_set_cookie)
+
+
+class LoginAdapter(BaseAdapter):
+    """Answers every request like POST /api/auth/login, with a session cookie and token"""
+
+    def send(self, request, **kwargs):
+        body = json.dumps({"user_id": "u1", "session_token": "secret-token"}).encode()
+        headers = [("Content-Type", "application/json"),
+                   ("Set-Cookie", "session_token=secret-token; Path=/; HttpOnly")]
+        response = build_response(self, request, 200, "OK", headers, body, 0.001)
+        # RecordingAdapter stores the headers as they came off the wire
+        response.raw = SimpleNamespace(headers=HTTPHeaderDict(headers))
+        return response
+
+    def close(self):
+        pass
+
+
+def _session(adapter):
+    session = requests.Session()
+    session.mount("http://", adapter)
+    return session
+
+
+def test_fingerprint_ignores_host_query_order_and_json_layout():
+    first = fingerprint("get", "http://a:8001/api/events?city=Madrid&skill_level=medio", None)
+    assert first == fingerprint("GET", "http://b/api/events?skill_level=medio&city=Madrid", b"")
+    assert fingerprint("POST", "/api/auth/login", b'{"email": "a@b.co", "password": "x"}') == \
+        fingerprint("POST", "/api/auth/login", '{"password":"x","email":"a@b.co"}')
+    assert first != fingerprint("GET", "/api/events?city=Barcelona&skill_level=medio", None)
+
+
+def test_redaction_blanks_secrets_at_any_depth():
+    body = json.dumps({"email": "a@b.co", "password": "hunter2",
+                       "user": {"session_token": "abc", "name": "Ana"}, "items": [{"token": "t"}]}).encode()
+    redacted = json.loads(redact_body(body))
+    assert redacted == {"email": "a@b.co", "password": REDACTED,
+                        "user": {"session_token": REDACTED, "name": "Ana"}, "items": [{"token": REDACTED}]}
+    assert redact_body(b"not json") == b"not json"
+    assert redact_body(b'{"name": "Ana"}') == b'{"name": "Ana"}'
+    assert redact_set_cookie("session_token=abc; Path=/; HttpOnly") == f"session_token={REDACTED}; Path=/; HttpOnly"
+
+
+def test_recorded_cassette_holds_no_secrets_and_replays(tmp_path):
+    path = str(tmp_path / "login")
+    login = {"email": "a@b.co", "password": "hunter2"}
+    recorder = RecordingAdapter(LoginAdapter(), Cassette(path).open_for_recording())
+    _session(recorder).post("http://api/api/auth/login", json=login, headers={"Authorization": "Bearer t"})
+    recorder.close()
+
+    stored = open(f"{path}.bodies", "rb").read() + open(f"{path}.index.json", "rb").read()
+    assert b"hunter2" not in stored and b"secret-token" not in stored and b"Bearer t" not in stored
+
+    replay = ReplayAdapter(Cassette(path).open_for_replay())
+    response = _session(replay).post("http://other-host/api/auth/login", json=login)
+    assert response.status_code == 200 and replay.misses == 0
+    assert response.json()["session_token"] == REDACTED
+    assert response.cookies.get("session_token") == REDACTED
+    assert _session(replay).get("http://other-host/api/clubs").status_code == 599
@@ -0,0 +1,27 @@
+import pytest
+
+
+def test_chess_com_lookup(tester, check):
+    check(tester.test_chess_com_lookup)
+
+
+def test_lichess_lookup(tester, check):
+    check(tester.test_lichess_lookup)
+
+
+def test_chess_account_linking(fresh_user_tester, check):
+    check(fresh_user_tester.test_chess_account_linking)
+
+
+@pytest.fixture
+def linked_tester(fresh_user_tester):
+    assert fresh_user_tester.test_chess_account_linking(), fresh_user_tester.failed_tests
+    return fresh_user_tester
+
+
+def test_chess_refresh_ratings(linked_tester, check):
+    check(linked_tester.test_chess_refresh_ratings)
+
+
+def test_chess_unlink_accounts(linked_tester, check):
+    check(linked_tester.test_chess_unlink_accounts)
@@ -0,0 +1,11 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures("seeded")
+
+
+def test_clubs_listing(tester, check):
+    check(tester.test_clubs_listing)
+
+
+def test_club_detail(tester, check):
+    check(tester.test_club_detail)
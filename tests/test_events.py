@@ -0,0 +1,27 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures("seeded")
+
+
+def test_seed_data(tester, check):
+    check(tester.test_seed_data)
+
+
+def test_events_listing(tester, check):
+    check(tester.test_events_listing)
+
+
+def test_event_filters(tester, check):
+    check(tester.test_event_filters)
+
+
+def test_event_detail_and_join(user_tester, check):
+    check(user_tester.test_event_detail_and_join)
+
+
+def test_my_events(user_tester, check):
+    check(user_tester.test_my_events)
+
+
+def test_create_event(user_tester, check):
+    check(user_tester.test_create_event)
@@ -0,0 +1,89 @@
+from requests.adapters import BaseAdapter
+
+from cassette import build_response
+from http_cache import CachingAdapter, HTTPCache
+from http_transport import HTTPTransport
+
+
+class ETagOrigin(BaseAdapter):
+    """Serves one JSON body with a fixed ETag and answers a matching If-None-Match with 304"""
+
+    def __init__(self, cache_control=None, body=b'[{"event_id": "e1"}]', etag='W/"v1"'):
+        super().__init__()
+        self.cache_control = cache_control
+        self.body = body
+        self.etag = etag
+        self.seen = []
+
+    def send(self, request, **kwargs):
+        self.seen.append(request.headers.get("If-None-Match"))
+        headers = [("ETag", self.etag), ("Content-Type", "application/json")]
+        if self.cache_control:
+            headers.append(("Cache-Control", self.cache_control))
+        if request.headers.get("If-None-Match") == self.etag:
+            return build_response(self, request, 304, "Not Modified", headers, b"", 0.001)
+        return build_response(self, request, 200, "OK", headers, self.body, 0.001)
+
+    def close(self):
+        pass
+
+
+def _transport(origin, **cache_options):
+    transport = HTTPTransport(retries=0)
+    cache = HTTPCache(**cache_options)
+    transport.mount_adapter(CachingAdapter(origin, cache))
+    observed = []
+    transport.add_observer(lambda method, url, status, elapsed, error: observed.append(status))
+    return transport, cache, observed
+
+
+def test_unchanged_response_is_revalidated_with_304():
+    origin = ETagOrigin()
+    transport, cache, observed = _transport(origin)
+    first = transport.get("http://api/api/events")
+    second = transport.get("http://api/api/events")
+    assert origin.seen == [None, 'W/"v1"']
+    assert first.status_code == second.status_code == 200
+    assert second.content == origin.body
+    audit = cache.audit["GET /api/events"]
+    assert (audit.requests, audit.revalidations, audit.not_modified, audit.hits) == (2, 1, 1, 0)
+    assert observed == [200, 200]
+
+
+def test_changed_response_replaces_the_entry():
+    origin = ETagOrigin()
+    transport, _, _ = _transport(origin)
+    transport.get("http://api/api/events")
+    origin.body, origin.etag = b'[{"event_id": "e2"}]', 'W/"v2"'
+    assert transport.get("http://api/api/events").content == origin.body
+    assert transport.get("http://api/api/events").content == origin.body
+    assert origin.seen == [None, 'W/"v1"', 'W/"v2"']
+
+
+def test_no_max_age_is_never_served_without_revalidation():
+    origin = ETagOrigin()
+    transport, _, _ = _transport(origin)
+    for _ in range(3):
+        transport.get("http://api/api/events")
+    assert len(origin.seen) == 3
+
+
+def test_fresh_hits_skip_the_origin_and_the_latency_observers():
+    origin = ETagOrigin(cache_control="max-age=60")
+    transport, cache, observed = _transport(origin)
+    transport.get("http://api/api/events")
+    hit = transport.get("http://api/api/events")
+    assert hit.status_code == 200 and hit.content == origin.body
+    assert len(origin.seen) == 1 and observed == [200]
+    assert cache.audit["GET /api/events"].hits == 1
+
+
+def test_no_store_is_never_kept_and_users_are_kept_apart():
+    origin = ETagOrigin(cache_control="no-store")
+    transport, cache, _ = _transport(origin)
+    transport.get("http://api/api/events")
+    assert not cache.entries
+    origin.cache_control = "max-age=60"
+    transport.get("http://api/api/me/events", headers={"Authorization": "Bearer a"})
+    transport.get("http://api/api/me/events", headers={"Authorization": "Bearer b"})
+    assert origin.seen[-2:] == [None, None]
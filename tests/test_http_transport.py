@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+from urllib3 import HTTPHeaderDict
+from urllib3.util.retry import RequestHistory
+
+from deadlines import DeadlineExceeded, budget, request_timeout
+from http_transport import DeadlineRetry, endpoint_key
+
+
+def _after_errors(errors, backoff_factor=10.0):
+    history = tuple(RequestHistory("GET", "/api/events", None, 503, None) for _ in range(errors))
+    return DeadlineRetry(total=10, backoff_factor=backoff_factor, history=history)
+
+
+def _retry_after(seconds):
+    return SimpleNamespace(headers=HTTPHeaderDict({"Retry-After": str(seconds)}))
+
+
+def test_backoff_is_uncapped_without_a_deadline():
+    assert _after_errors(3).get_backoff_time() == pytest.approx(40.0)
+    assert _after_errors(3).get_retry_after(_retry_after(120)) == 120
+
+
+def test_backoff_and_retry_after_never_outlast_the_deadline():
+    with budget(0.5, "test"):
+        assert 0.4 < _after_errors(3).get_backoff_time() <= 0.5
+        assert 0.4 < _after_errors(3).get_retry_after(_retry_after(120)) <= 0.5
+        # Short waits stay as they are
+        assert _after_errors(2, backoff_factor=0.1).get_backoff_time() == pytest.approx(0.2)
+
+
+def test_innermost_budget_caps_request_timeouts():
+    with budget(10.0, "run"):
+        with budget(0.3, "test"):
+            connect, read = request_timeout((5.0, 30.0))
+            assert connect <= 0.3 and read <= 0.3
+        connect, read = request_timeout((5.0, 30.0))
+        assert connect == 5.0 and 9.0 < read <= 10.0
+    assert request_timeout((5.0, 30.0)) == (5.0, 30.0)
+
+
+def test_exhausted_budget_refuses_to_start_a_request():
+    with budget(0.0, "test"):
+        with pytest.raises(DeadlineExceeded, match="test budget exhausted"):
+            request_timeout((5.0, 30.0))
+
+
+@pytest.mark.parametrize("method, url, key", [
+    ("get", "http://h/api/events/abc123", "GET /api/events/{id}"),
+    ("post", "http://h/api/events/abc123/join", "POST /api/events/{id}/join"),
+    ("GET", "http://h/api/users/me", "GET /api/users/me"),
+    ("GET", "http://h/api/events?skill_level=medio&city=Madrid", "GET /api/events?city&skill_level"),
+    ("GET", "http://h/api/chess/lookup/lichess/Magnus", "GET /api/chess/lookup/lichess/{username}"),
+])
+def test_endpoint_key_groups_concrete_urls(method, url, key):
+    assert endpoint_key(method, url) == key
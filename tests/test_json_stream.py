@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from json_stream import IncompleteJSON, JSONItemStream
+
+EVENTS = [{"event_id": f"e{i}", "title": f"Partidas en Málaga #{i}", "max_seats": 12.5 * i, "tags": ["a", "ñ"]}
+          for i in range(20)]
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_array_items_survive_any_chunk_boundary(size):
+    data = json.dumps(EVENTS, ensure_ascii=False).encode()
+    stream = JSONItemStream(_chunks(data, size))
+    assert [item for _, item in stream] == EVENTS
+    assert stream.bytes_read == len(data)
+
+
+def test_number_cut_at_a_chunk_boundary_is_not_truncated():
+    assert [item for _, item in JSONItemStream([b"[12", b".5, 3", b"00]"])] == [12.5, 300]
+
+
+def test_object_of_arrays_yields_keyed_items():
+    body = json.dumps({"joined": EVENTS[:2], "organized": [], "total": 2}).encode()
+    assert list(JSONItemStream(_chunks(body, 5))) == [("joined", EVENTS[0]), ("joined", EVENTS[1]), ("total", 2)]
+
+
+def test_empty_array_yields_nothing():
+    assert list(JSONItemStream([b" [", b" ] "])) == []
+
+
+def test_truncated_body_raises():
+    data = json.dumps(EVENTS).encode()
+    with pytest.raises((IncompleteJSON, ValueError)):
+        list(JSONItemStream(_chunks(data[:-20], 16)))
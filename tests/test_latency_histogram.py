@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from latency_histogram import HistogramRecorder, LatencyHistogram
+
+
+def _filled(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_encode_decode_round_trip():
+    histogram = _filled(random.Random(1).randint(1, 5_000_000) for _ in range(5000))
+    histogram.record(120_000_000)
+    decoded = LatencyHistogram.decode(histogram.encode())
+    assert decoded.counts == histogram.counts
+    assert (decoded.total_count, decoded.min_value, decoded.max_value, decoded.overflow_count) == \
+        (histogram.total_count, histogram.min_value, histogram.max_value, 1)
+    assert decoded.percentiles((50, 99, 99.9)) == histogram.percentiles((50, 99, 99.9))
+
+
+def test_decode_rejects_foreign_bytes():
+    with pytest.raises(ValueError):
+        LatencyHistogram.decode(b"\0" * 64)
+
+
+def test_merge_equals_recording_everything_in_one():
+    rng = random.Random(2)
+    parts = [[rng.randint(1, 2_000_000) for _ in range(1000)] for _ in range(4)]
+    merged = LatencyHistogram()
+    for part in parts:
+        merged.merge(_filled(part))
+    whole = _filled(value for part in parts for value in part)
+    assert merged.counts == whole.counts
+    assert (merged.total_count, merged.min_value, merged.max_value) == \
+        (whole.total_count, whole.min_value, whole.max_value)
+    assert merged.percentiles() == whole.percentiles()
+
+
+def test_merge_rejects_other_layouts():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(significant_figures=2))
+
+
+def test_percentiles_stay_within_precision():
+    values = list(range(1, 100_001))
+    histogram = _filled(values)
+    for pct in (50, 90, 99):
+        exact = values[int(pct / 100 * len(values)) - 1]
+        assert abs(histogram.value_at_percentile(pct) - exact) <= exact / 1000
+
+
+def test_recorder_round_trip_and_merge():
+    first, second = HistogramRecorder(), HistogramRecorder()
+    first.record("GET /api/events", 200, 0.010)
+    first.record("GET /api/events", 500, 0.020)
+    second.record("GET /api/events", 200, 0.030)
+    second.record("POST /api/events/{id}/join", 400, 0.005, klass="exp")
+    merged = HistogramRecorder.decode(first.encode()).merge(HistogramRecorder.decode(second.encode()))
+    endpoints = merged.by_endpoint()
+    assert endpoints["GET /api/events"].total_count == 3
+    assert endpoints["POST /api/events/{id}/join"].total_count == 1
+    assert merged.error_counts()["GET /api/events"] == 1
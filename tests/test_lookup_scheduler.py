@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lookup_scheduler import LookupScheduler, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, status, body, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.text = str(body)
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class SlowUpstream:
+    """Transport stand-in answering lookups after `delay`, with scripted statuses per username"""
+
+    def __init__(self, delay=0.05, statuses=None):
+        self.delay = delay
+        self.statuses = statuses or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        username = url.rsplit("/", 1)[1]
+        with self._lock:
+            self.calls.append(username)
+            status = self.statuses.get(username.lower(), [200])
+            status = status.pop(0) if len(status) > 1 else status[0]
+        time.sleep(self.delay)
+        return FakeResponse(status, {"username": username}, {"Retry-After": "0"} if status == 429 else None)
+
+
+def _scheduler(upstream, **kwargs):
+    return LookupScheduler(upstream, "http://api/api", rates={"lichess": (1000.0, 1000)}, **kwargs)
+
+
+def test_concurrent_identical_lookups_share_one_upstream_call():
+    upstream = SlowUpstream(delay=0.1)
+    scheduler = _scheduler(upstream)
+    names = ["Magnus", "magnus", "MAGNUS"] * 10
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        results = list(pool.map(lambda name: scheduler.lookup("lichess", name), names))
+    assert len(upstream.calls) == 1
+    assert {status for status, _ in results} == {200}
+    assert scheduler.counters["coalesced"] + scheduler.counters["hits"] == len(names) - 1
+
+
+def test_results_are_cached_and_failures_are_not():
+    upstream = SlowUpstream(delay=0, statuses={"ghost": [404], "flaky": [500, 200]})
+    scheduler = _scheduler(upstream)
+    for _ in range(3):
+        scheduler.lookup("lichess", "magnus")
+        scheduler.lookup("lichess", "ghost")
+    assert scheduler.lookup("lichess", "flaky")[0] == 500
+    assert scheduler.lookup("lichess", "flaky")[0] == 200
+    assert upstream.calls == ["magnus", "ghost", "flaky", "flaky"]
+
+
+def test_expired_entries_are_fetched_again():
+    upstream = SlowUpstream(delay=0)
+    scheduler = _scheduler(upstream, ttl=0.01)
+    scheduler.lookup("lichess", "magnus")
+    time.sleep(0.02)
+    scheduler.lookup("lichess", "magnus")
+    assert len(upstream.calls) == 2
+
+
+def test_rate_limited_calls_are_retried():
+    upstream = SlowUpstream(delay=0, statuses={"busy": [429, 429, 200]})
+    scheduler = _scheduler(upstream)
+    assert scheduler.lookup("lichess", "busy")[0] == 200
+    assert scheduler.counters["rate_limited"] == 2
+
+
+def test_token_bucket_spaces_calls_after_the_burst():
+    bucket = TokenBucket(rate=100.0, burst=2)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert all(wait > 0 for wait in waits[2:])
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+import signup_relay
+from signup_relay import FormRelay, WriteAheadQueue
+
+
+def test_recovery_drops_a_torn_last_line(tmp_path):
+    queue = WriteAheadQueue(str(tmp_path))
+    for i in range(3):
+        assert queue.enqueue("Ana", f"ana{i}@example.com")
+    queue.ack(queue.take(1, lambda record_id: False))
+    queue.close()
+    intact = os.path.getsize(queue.path)
+    with open(queue.path, "a") as f:
+        f.write('{"op": "enqueue", "id": "torn", "email": "half')
+
+    recovered = WriteAheadQueue(str(tmp_path))
+    assert os.path.getsize(recovered.path) == intact
+    assert [record["email"] for record in recovered.pending.values()] == ["ana1@example.com", "ana2@example.com"]
+    # Delivered emails still count for dedup, and the log takes new records on a clean line
+    assert not recovered.enqueue("Ana", "ANA0@example.com")
+    assert recovered.enqueue("Bea", "bea@example.com")
+    recovered.close()
+    assert WriteAheadQueue(str(tmp_path)).depth() == 3
+
+
+def test_compaction_keeps_pending_and_dedup(tmp_path):
+    queue = WriteAheadQueue(str(tmp_path), compact_after=2)
+    for i in range(4):
+        queue.enqueue("Ana", f"ana{i}@example.com")
+    queue.ack(queue.take(2, lambda record_id: False))
+    queue.enqueue("Bea", "bea@example.com")
+    queue.close()
+    assert queue.counters["compactions"] == 1
+    reopened = WriteAheadQueue(str(tmp_path))
+    assert reopened.depth() == 3
+    assert not reopened.enqueue("Ana", "ana0@example.com")
+    reopened.close()
+
+
+def test_failed_write_releases_the_email(tmp_path, monkeypatch):
+    queue = WriteAheadQueue(str(tmp_path))
+
+    def full_disk(fd):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(signup_relay.os, "fsync", full_disk)
+    with pytest.raises(OSError):
+        queue.enqueue("Ana", "ana@example.com")
+    monkeypatch.undo()
+    assert queue.enqueue("Ana", "ana@example.com")
+    queue.close()
+    assert os.path.getsize(queue.path) > 0 and WriteAheadQueue(str(tmp_path)).depth() == 1
+
+
+class ScriptedForm:
+    """Transport stand-in answering form posts with the next scripted (status, headers)"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+
+    def post(self, url, **kwargs):
+        status, headers = self.answers.pop(0)
+        return type("Answer", (), {"status_code": status, "headers": headers, "close": lambda self: None})()
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("status, headers, outcome", [
+    (200, {}, "delivered"),
+    (302, {"Location": "https://accounts.google.com/"}, "retry"),
+    (429, {"Retry-After": "2"}, "retry"),
+    (400, {}, "dead"),
+])
+def test_only_200_counts_as_delivered(tmp_path, status, headers, outcome):
+    queue = WriteAheadQueue(str(tmp_path))
+    queue.enqueue("Ana", "ana@example.com")
+    relay = FormRelay(queue, "http://form/formResponse", transport=ScriptedForm((status, headers)))
+    record, result, retry_after, error = relay._submit(queue.take(1, lambda record_id: False)[0])
+    assert result == outcome
+    if status == 302:
+        assert "accounts.google.com" in error
+    if status == 429:
+        assert retry_after == 2.0
+    relay.stop()
+    queue.close()
@@ -0,0 +1,56 @@
+import random
+
+from soak import MIN_BUCKETS, complete_buckets, detect_drift, mann_kendall
+
+ENDPOINT = "GET /api/events"
+
+
+def _series(p95s, seconds=60.0, rss=None):
+    buckets = []
+    for index, p95 in enumerate(p95s):
+        buckets.append({"start": index * seconds, "end": (index + 1) * seconds, "rss_mb": rss[index] if rss else None,
+                        "open_sockets": None,
+                        "endpoints": {ENDPOINT: {"count": 100, "errors": 0, "p50_ms": p95 / 2, "p95_ms": p95}}})
+    return buckets
+
+
+def test_mann_kendall_on_monotonic_and_flat_series():
+    tau, p_value = mann_kendall(list(range(12)))
+    assert tau == 1.0 and p_value < 0.001
+    tau, p_value = mann_kendall(list(range(12, 0, -1)))
+    assert tau == -1.0 and p_value > 0.999
+    assert mann_kendall([5.0] * 12) == (0.0, 0.5)
+
+
+def test_mann_kendall_noise_is_not_significant():
+    values = [random.Random(7).gauss(10, 1) for _ in range(30)]
+    assert mann_kendall(values)[1] > 0.05
+
+
+def test_rising_latency_is_flagged():
+    rng = random.Random(1)
+    findings = detect_drift(_series([20 + 2 * i + rng.uniform(-1, 1) for i in range(12)]))
+    metrics = {(f["subject"], f["metric"]) for f in findings}
+    assert (ENDPOINT, "p95_ms") in metrics and (ENDPOINT, "p50_ms") in metrics
+    assert all(f["p_value"] < 0.05 for f in findings)
+
+
+def test_flat_noisy_latency_is_not_flagged():
+    rng = random.Random(2)
+    assert detect_drift(_series([20 + rng.uniform(-3, 3) for _ in range(12)])) == []
+
+
+def test_too_few_buckets_are_never_flagged():
+    assert detect_drift(_series([10 * (i + 1) for i in range(MIN_BUCKETS - 1)])) == []
+
+
+def test_rss_growth_is_a_client_finding():
+    findings = detect_drift(_series([20] * 10, rss=[100 + 10 * i for i in range(10)]))
+    assert [(f["subject"], f["metric"]) for f in findings] == [("client", "rss_mb")]
+
+
+def test_short_final_bucket_is_dropped():
+    buckets = _series([20] * 9)
+    buckets[-1]["end"] = buckets[-1]["start"] + 5
+    assert len(complete_buckets(buckets)) == 8
+    assert len(complete_buckets(_series([20] * 9))) == 9
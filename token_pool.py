@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from http_transport import HTTPTransport
+
+SESSION_COOKIE = "session_token"
+# Matches the password test_user_login uses, so pooled users can exercise relogin
+POOL_PASSWORD = "testpass123"
+
+
+def session_from_response(response):
+    """(token, expires_at) of the session cookie set by `response`, or (None, None)
+
+    Parsed through the response's cookie jar, so several Set-Cookie headers
+    and attribute order do not matter; expires_at is a Unix timestamp
+    derived from Max-Age/Expires, or None for a browser-session cookie.
+    """
+    for cookie in response.cookies:
+        if cookie.name == SESSION_COOKIE:
+            return cookie.value, cookie.expires
+    return None, None
+
+
+class PooledUser:
+    def __init__(self, email, user_id=None, name=None, token=None, expires_at=None, password=POOL_PASSWORD):
+        self.email = email
+        self.password = password
+        self.user_id = user_id
+        self.name = name
+        self.token = token
+        self.expires_at = expires_at
+        # Tokens loaded from disk are checked against /auth/me on first use in this process
+        self.validated = False
+        self.lock = threading.Lock()
+
+    def expired(self, margin=60.0):
+        return self.token is None or (self.expires_at is not None and self.expires_at - margin < time.time())
+
+    def to_json(self):
+        return {"email": self.email, "password": self.password, "user_id": self.user_id, "name": self.name,
+                "token": self.token, "expires_at": self.expires_at}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(**data)
+
+
+class TokenPool:
+    """Pre-provisioned users with session tokens cached on disk between runs
+
+    `provision()` registers only the users the cache is missing and logs in
+    again only where the stored cookie expiry has passed. `acquire()` hands
+    users out round-robin and validates a cached token via /auth/me the
+    first time it is used, refreshing it if the server no longer accepts it.
+    With path=None nothing is cached and every user is registered.
+    """
+
+    def __init__(self, base_url, path="token_pool.json", size=100, concurrency=16, transport=None, offset=0):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.path = path
+        self.size = size
+        self.concurrency = concurrency
+        self.transport = transport or HTTPTransport(pool_size=concurrency)
+        self.pool_tag = uuid.uuid4().hex[:10]
+        self.users = []
+        self.counters = {"registered": 0, "refreshed": 0, "validated": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+        # Worker processes sharing one cache start at different users
+        self._next = offset
+        self._dirty = False
+
+    # Cache file
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        # Tokens belong to one server; a cache for another base URL starts over
+        if data.get("base_url") != self.base_url:
+            return
+        self.pool_tag = data["pool_tag"]
+        self.users = [PooledUser.from_json(user) for user in data["users"]]
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": 1, "base_url": self.base_url, "pool_tag": self.pool_tag,
+                    "users": [user.to_json() for user in self.users]}
+            self._dirty = False
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    # Server calls
+
+    def _store_session(self, user, response):
+        token, expires_at = session_from_response(response)
+        if token is None:
+            raise RuntimeError(f"No {SESSION_COOKIE} cookie in response from {response.url}")
+        payload = response.json()
+        user.user_id = payload.get("user_id", user.user_id)
+        user.name = payload.get("name", user.name)
+        user.token, user.expires_at = token, expires_at
+        user.validated = True
+        with self._lock:
+            self._dirty = True
+
+    def _register(self, user):
+        response = self.transport.post(f"{self.api_url}/auth/register", json={
+            "email": user.email, "password": user.password, "name": f"Pool User {user.email.split('@')[0]}",
+            "user_type": "user", "skill_level": "medio", "city": "Barcelona"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Registration of {user.email} failed with status {response.status_code}")
+        self._store_session(user, response)
+        self._count("registered")
+
+    def _refresh(self, user):
+        response = self.transport.post(f"{self.api_url}/auth/login",
+                                       json={"email": user.email, "password": user.password})
+        if response.status_code == 401:
+            # The account is gone (e.g. a fresh stand-in server): create it again
+            self._register(user)
+            return
+        if response.status_code != 200:
+            raise RuntimeError(f"Login of {user.email} failed with status {response.status_code}")
+        self._store_session(user, response)
+        self._count("refreshed")
+
+    def _validate(self, user):
+        response = self.transport.get(f"{self.api_url}/auth/me", headers={"Authorization": f"Bearer {user.token}"})
+        if response.status_code == 200:
+            user.validated = True
+            self._count("validated")
+            return
+        self._count("invalidated")
+        self._refresh(user)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    # Public API
+
+    def provision(self):
+        """Load the cache, then register missing users and refresh expired ones in parallel"""
+        start = time.perf_counter()
+        self.load()
+        cached = len(self.users)
+        for index in range(len(self.users), self.size):
+            self.users.append(PooledUser(f"pool_{self.pool_tag}_{index}@example.com"))
+        pending = [user for user in self.users[:self.size] if user.expired()]
+
+        def prepare(user):
+            with user.lock:
+                if user.token is None:
+                    self._register(user)
+                else:
+                    self._refresh(user)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(prepare, pending))
+        if pending or self._dirty:
+            self.save()
+        print(f"🔑 Token pool: {self.size} users ready in {time.perf_counter() - start:.1f}s "
+              f"({min(cached, self.size)} cached, {self.counters['registered']} registered, "
+              f"{self.counters['refreshed']} refreshed)")
+        return self
+
+    def acquire(self):
+        """Next user round-robin, with a token the server currently accepts"""
+        with self._lock:
+            user = self.users[self._next % min(self.size, len(self.users))]
+            self._next += 1
+        with user.lock:
+            if user.expired():
+                self._refresh(user)
+            elif not user.validated:
+                self._validate(user)
+        return user
+
+    def close(self):
+        if self._dirty:
+            self.save()
+        self.transport.close()
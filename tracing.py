@@ -0,0 +1,145 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+from http_transport import origin_thread
+
+
+class ChromeTraceRecorder:
+    """Collect tests and HTTP calls as Chrome trace-event spans (chrome://tracing, Perfetto)
+
+    Tests are complete ("X") events on the thread that ran them and HTTP
+    calls nest inside as further spans with their connect/TTFB breakdown
+    in `args`; gaps between HTTP spans are client-side time (JSON
+    decoding, bookkeeping). Timestamps are wall-clock microseconds so spans
+    from concurrent runner threads line up.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.pid = os.getpid()
+        self._threads = {}
+        self._open_tests = {}
+        self._lock = threading.Lock()
+
+    def attach(self, tester):
+        tester.add_hook("after_response", self.on_response)
+        tester.add_hook("test_start", self.on_test_start)
+        tester.add_hook("test_end", self.on_test_end)
+        return self
+
+    def _tid(self):
+        # Hedged attempts belong on the track of the test that made them, not the hedge pool's
+        ident, name = origin_thread()
+        with self._lock:
+            if ident not in self._threads:
+                self._threads[ident] = len(self._threads) + 1
+                self.events.append({"ph": "M", "name": "thread_name", "pid": self.pid,
+                                    "tid": self._threads[ident], "args": {"name": name}})
+            return self._threads[ident]
+
+    def _span(self, name, category, start_us, duration_us, args, tid=None):
+        event = {"ph": "X", "name": name, "cat": category, "pid": self.pid, "tid": tid or self._tid(),
+                 "ts": round(start_us, 1), "dur": round(max(duration_us, 0.0), 1), "args": args}
+        with self._lock:
+            self.events.append(event)
+
+    def on_test_start(self, name):
+        with self._lock:
+            self._open_tests[(threading.get_ident(), name)] = time.time()
+
+    def on_test_end(self, name, success, elapsed):
+        with self._lock:
+            started = self._open_tests.pop((threading.get_ident(), name), None)
+        if started is not None:
+            self._span(name, "test", started * 1e6, elapsed * 1e6, {"success": success})
+
+    def on_response(self, record):
+        start_us = record["started_at"] * 1e6
+        tid = self._tid()
+        self._span(record["endpoint"], "http", start_us, record["total_ms"] * 1000,
+                   {key: record[key] for key in ("url", "status", "reused_connection", "dns_ms", "connect_ms",
+                                                 "tls_ms", "ttfb_ms", "response_bytes", "error")}, tid)
+        # Connection setup phases run back to back at the start of the call
+        offset = start_us
+        for phase in ("dns", "connect", "tls"):
+            phase_us = record[f"{phase}_ms"] * 1000
+            if phase_us:
+                self._span(phase, "http.phase", offset, phase_us, {}, tid)
+                offset += phase_us
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+class TestProfiler:
+    """Per-test cProfile or tracemalloc, switched on through the tester's test hooks
+
+    cProfile needs tests run one at a time: Python 3.12+ allows a single
+    active profiler per process, so overlapping tests cannot each have one
+    (backend_test refuses --profile cprofile with --concurrent).
+    tracemalloc is process-wide: with concurrent tests each report also
+    includes allocations of the tests running alongside it.
+    """
+
+    MODES = ("cprofile", "tracemalloc")
+
+    def __init__(self, mode, output_dir="profiles", top=15):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiler {mode!r}, expected one of {', '.join(self.MODES)}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top = top
+        self.written = []
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def attach(self, tester):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+        tester.add_hook("test_start", self.on_test_start)
+        tester.add_hook("test_end", self.on_test_end)
+        return self
+
+    def on_test_start(self, name):
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            state = profile
+        else:
+            state = tracemalloc.take_snapshot()
+        with self._lock:
+            self._active[(threading.get_ident(), name)] = state
+
+    def on_test_end(self, name, success, elapsed):
+        with self._lock:
+            state = self._active.pop((threading.get_ident(), name), None)
+        if state is None:
+            return
+        if self.mode == "cprofile":
+            state.disable()
+            path = os.path.join(self.output_dir, f"{name}.prof")
+            state.dump_stats(path)
+            with open(os.path.join(self.output_dir, f"{name}.txt"), "w") as f:
+                pstats.Stats(state, stream=f).sort_stats("cumulative").print_stats(self.top)
+        else:
+            diff = tracemalloc.take_snapshot().compare_to(state, "lineno")
+            path = os.path.join(self.output_dir, f"{name}.tracemalloc.txt")
+            current, peak = tracemalloc.get_traced_memory()
+            with open(path, "w") as f:
+                f.write(f"{name}: {elapsed * 1000:.1f} ms, traced now {current / 1024:.1f} KiB, "
+                        f"peak {peak / 1024:.1f} KiB\n")
+                for stat in diff[:self.top]:
+                    f.write(f"{stat}\n")
+        with self._lock:
+            self.written.append(path)